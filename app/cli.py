@@ -0,0 +1,63 @@
+import argparse
+from typing import Optional, Sequence
+
+from app.core.config import get_settings
+from app.db.migrations import LATEST_VERSION, ensure_schema, run_migrations
+from app.db.session import SessionLocal, engine
+from app.services.item_usage import backfill_item_usage
+from app.services.precompute import precompute_tomorrow
+
+# Ensure models are imported so metadata is ready for table creation
+from app import models  # noqa: E402,F401
+
+
+def _prepare_schema() -> None:
+    ensure_schema(engine)
+
+
+def _migrate(args: argparse.Namespace) -> None:
+    previous = run_migrations(engine)
+    if previous == LATEST_VERSION:
+        print(f"Schema already at version {LATEST_VERSION}.")
+    else:
+        print(f"Migrated schema from version {previous} to {LATEST_VERSION}.")
+
+
+def _backfill_item_usage(args: argparse.Namespace) -> None:
+    _prepare_schema()
+    with SessionLocal() as db:
+        written = backfill_item_usage(db, args.user_id)
+    print(f"Rebuilt {written} item usage rows.")
+
+
+def _precompute_tomorrow(args: argparse.Namespace) -> None:
+    _prepare_schema()
+    counts = precompute_tomorrow(SessionLocal, args.batch_size, args.concurrency)
+    print(f"Planned {counts['planned']}, skipped {counts['skipped']}, failed {counts['failed']} users.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="OutfitGuru maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Apply pending schema migrations.")
+    migrate.set_defaults(handler=_migrate)
+
+    backfill = commands.add_parser("backfill-item-usage", help="Rebuild the item_usage index from outfit history.")
+    backfill.add_argument("--user-id", type=int, default=None, help="Only rebuild rows for this user.")
+    backfill.set_defaults(handler=_backfill_item_usage)
+
+    settings = get_settings()
+    precompute = commands.add_parser(
+        "precompute-tomorrow", help="Plan tomorrow's outfit for every plan-ahead user now."
+    )
+    precompute.add_argument("--batch-size", type=int, default=settings.precompute_batch_size)
+    precompute.add_argument("--concurrency", type=int, default=settings.precompute_concurrency)
+    precompute.set_defaults(handler=_precompute_tomorrow)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from functools import lru_cache
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,7 +10,40 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 60 * 24  # 1 day
     algorithm: str = "HS256"
     database_url: str = "sqlite:///./outfitguru.db"
+    async_database_url: Optional[str] = None  # derived from database_url (aiosqlite / psycopg) when unset
+    replica_database_url: Optional[str] = None  # read-only endpoints use it when set
+    # Reads stay on the primary this long after a user's write. Write times are kept per worker
+    # process, so with several workers a read served by another worker can still hit a lagging replica.
+    replica_sticky_seconds: float = 5.0
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds a request waits for a free connection
+    db_pool_recycle: int = 1800  # seconds; -1 keeps connections forever
+    db_pool_pre_ping: bool = False
+    # SQLite connection profile, applied to every new connection
+    sqlite_journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes; 0 disables memory-mapped reads
+    sqlite_cache_size: int = -64 * 1024  # negative = KiB, positive = pages
+    sqlite_busy_timeout_ms: int = 5000
+    # Off by default, as SQLite itself ships: existing databases may hold rows that break a foreign key.
+    # Run PRAGMA foreign_key_check against the file before turning it on.
+    sqlite_foreign_keys: bool = False
     cors_origins: list[str] = ["http://localhost:5173"]
+    auto_migrate: bool = True  # apply pending schema migrations at startup
+    wardrobe_cache_size: int = 1024  # users; 0 disables the snapshot cache
+    catalog_cache_size: int = 256  # users; 0 disables the compiled catalog cache
+    fast_json_responses: bool = False  # list endpoints serialize rows with orjson, skipping response models
+    # Response compression (gzip, or brotli when the brotli package is installed)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # bytes; smaller bodies are sent as is
+    compression_gzip_level: int = 6  # 1-9
+    compression_brotli_quality: int = 4  # 0-11
+    precompute_enabled: bool = False
+    precompute_hour_utc: int = 3  # off-peak hour for planning tomorrow's outfits
+    precompute_batch_size: int = 100
+    precompute_concurrency: int = 4
 
     model_config = SettingsConfigDict(
         env_file=".env",
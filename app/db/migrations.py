@@ -1,77 +1,289 @@
 import logging
-from typing import Iterable
+from typing import Callable, NamedTuple, Optional
 
 from sqlalchemy import inspect, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
 
 logger = logging.getLogger(__name__)
 
+VERSION_TABLE = "schema_version"
 
-def _table_exists(engine: Engine, table: str) -> bool:
-    inspector = inspect(engine)
-    try:
-        return table in inspector.get_table_names()
-    except Exception:  # noqa: BLE001
-        return False
 
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
 
-def _column_exists(engine: Engine, table: str, column: str) -> bool:
-    inspector = inspect(engine)
-    try:
-        columns = inspector.get_columns(table)
-    except Exception:  # noqa: BLE001
-        return False
-    return any(col.get("name") == column for col in columns)
 
+def _is_postgres(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
 
-def _add_column(engine: Engine, table: str, ddl: str) -> None:
-    with engine.begin() as conn:
-        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
 
+def _columns(conn: Connection, table: str) -> Optional[set[str]]:
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
 
-def _ensure_defaults(engine: Engine, table: str, assignments: Iterable[tuple[str, str]]) -> None:
-    with engine.begin() as conn:
-        for column, default in assignments:
-            conn.execute(text(f"UPDATE {table} SET {column} = :default WHERE {column} IS NULL"), {"default": default})
+
+def _add_missing_columns(conn: Connection, table: str, columns: list[tuple[str, str, str]]) -> None:
+    # columns: (name, SQLite DDL, Postgres DDL)
+    existing = _columns(conn, table)
+    if existing is None:
+        return
+    for name, sqlite_ddl, postgres_ddl in columns:
+        if name not in existing:
+            logger.info("Adding missing column %s.%s", table, name)
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {postgres_ddl if _is_postgres(conn) else sqlite_ddl}"))
 
 
-def run_migrations(engine: Engine) -> None:
-    if engine.dialect.name != "sqlite":
-        logger.info("Automatic migrations are only handled for SQLite. Current dialect: %s", engine.dialect.name)
+def _clothing_metadata(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "clothing_items",
+        [
+            ("subtype", "subtype VARCHAR NOT NULL DEFAULT 'General'", "subtype VARCHAR NOT NULL DEFAULT 'General'"),
+            (
+                "color_family",
+                "color_family VARCHAR NOT NULL DEFAULT 'Other'",
+                "color_family VARCHAR NOT NULL DEFAULT 'Other'",
+            ),
+            ("season", "season VARCHAR NOT NULL DEFAULT 'All-season'", "season VARCHAR NOT NULL DEFAULT 'All-season'"),
+            ("name", "name VARCHAR(80) NOT NULL DEFAULT 'Untitled'", "name VARCHAR(80) NOT NULL DEFAULT 'Untitled'"),
+            ("updated_at", "updated_at DATETIME", "updated_at TIMESTAMP WITH TIME ZONE"),
+        ],
+    )
+    if _columns(conn, "clothing_items") is None:
         return
+    for column, default in (
+        ("subtype", "General"),
+        ("color_family", "Other"),
+        ("season", "All-season"),
+        ("name", "Untitled"),
+    ):
+        conn.execute(text(f"UPDATE clothing_items SET {column} = :default WHERE {column} IS NULL"), {"default": default})
+    if _is_postgres(conn):
+        conn.execute(text("UPDATE clothing_items SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL"))
+    else:
+        conn.execute(
+            text(
+                """
+                UPDATE clothing_items
+                SET updated_at = CURRENT_TIMESTAMP
+                WHERE updated_at IS NULL OR updated_at = 'CURRENT_TIMESTAMP'
+                """
+            )
+        )
+
+
+def _item_usage_feedback_counters(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "item_usage",
+        [
+            (column, f"{column} INTEGER NOT NULL DEFAULT 0", f"{column} INTEGER NOT NULL DEFAULT 0")
+            for column in ("likes", "dislikes", "skips", "rejections")
+        ],
+    )
 
-    clothing_table = "clothing_items"
-    migrations: list[tuple[str, str, str]] = [
-        (clothing_table, "subtype", "subtype VARCHAR NOT NULL DEFAULT 'General'"),
-        (clothing_table, "color_family", "color_family VARCHAR NOT NULL DEFAULT 'Other'"),
-        (clothing_table, "season", "season VARCHAR NOT NULL DEFAULT 'All-season'"),
-        (clothing_table, "name", "name VARCHAR(80) NOT NULL DEFAULT 'Untitled'"),
-        (clothing_table, "updated_at", "updated_at DATETIME"),
-    ]
-
-    if _table_exists(engine, clothing_table):
-        for table, column, ddl in migrations:
-            if not _column_exists(engine, table, column):
-                logger.info("Adding missing column %s.%s", table, column)
-                _add_column(engine, table, ddl)
-
-        _ensure_defaults(
-            engine,
-            clothing_table,
-            [
-                ("subtype", "General"),
-                ("color_family", "Other"),
-                ("season", "All-season"),
-                ("name", "Untitled"),
-            ],
+
+def _outfit_items_backfill(conn: Connection) -> None:
+    if _columns(conn, "outfits") is None:
+        return
+    logger.info("Filling outfit_items from outfits.item_ids")
+    if _is_postgres(conn):
+        elements = """
+            SELECT outfits.id, elements.ordinality - 1, CAST(elements.value AS INTEGER)
+            FROM outfits
+            CROSS JOIN LATERAL json_array_elements_text(outfits.item_ids) WITH ORDINALITY AS elements(value, ordinality)
+        """
+    else:
+        elements = """
+            SELECT outfits.id, CAST(elements.key AS INTEGER), CAST(elements.value AS INTEGER)
+            FROM outfits, json_each(outfits.item_ids) AS elements
+        """
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO outfit_items (outfit_id, position, item_id)
+            {elements}
+            WHERE NOT EXISTS (SELECT 1 FROM outfit_items WHERE outfit_items.outfit_id = outfits.id)
+            """
         )
-        with engine.begin() as conn:
+    )
+
+
+def _composite_indexes(conn: Connection) -> None:
+    # Create any index declared on the models that an existing table is missing.
+    from app.db.base import Base
+
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if not {column.name for column in index.columns} <= columns:
+                logger.warning("Skipping index %s: %s is missing indexed columns", index.name, table.name)
+                continue
+            logger.info("Creating missing index %s on %s", index.name, table.name)
+            index.create(conn)
+
+
+def _wardrobe_search_index(conn: Connection) -> None:
+    from app.db.search import SEARCH_COLUMNS, create_search_index
+
+    columns = _columns(conn, "clothing_items")
+    if columns is None:
+        return
+    missing = set(SEARCH_COLUMNS) - columns
+    if missing:
+        logger.warning("Skipping wardrobe search index: clothing_items is missing %s", ", ".join(sorted(missing)))
+        return
+    logger.info("Building wardrobe search index")
+    create_search_index(conn)
+
+
+def _user_data_revision(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "users",
+        [
+            (
+                "data_revision",
+                "data_revision INTEGER NOT NULL DEFAULT 0",
+                "data_revision INTEGER NOT NULL DEFAULT 0",
+            )
+        ],
+    )
+
+
+def _user_catalog_revision(conn: Connection) -> None:
+    # The custom_subtypes table itself comes from create_all like any new table.
+    _add_missing_columns(
+        conn,
+        "users",
+        [
+            (
+                "catalog_revision",
+                "catalog_revision INTEGER NOT NULL DEFAULT 0",
+                "catalog_revision INTEGER NOT NULL DEFAULT 0",
+            )
+        ],
+    )
+
+
+def _user_wardrobe_revision(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "users",
+        [
+            (
+                "wardrobe_revision",
+                "wardrobe_revision INTEGER NOT NULL DEFAULT 0",
+                "wardrobe_revision INTEGER NOT NULL DEFAULT 0",
+            )
+        ],
+    )
+
+
+def _item_usage_backfill(conn: Connection) -> None:
+    # Existing databases start with empty item_usage/item_pair_feedback tables; rebuild them from history
+    # so recency and feedback penalties work without a manual `backfill-item-usage` run.
+    from sqlalchemy.orm import Session
+
+    from app.services.item_usage import backfill_item_usage
+
+    required = {
+        "outfits": {"user_id", "item_ids", "created_at", "feedback"},
+        "outfit_occurrences": {"user_id", "outfit_id", "date", "status", "negative_reason"},
+    }
+    for table, needed in required.items():
+        columns = _columns(conn, table) or set()
+        if not needed <= columns:
+            logger.warning("Skipping item usage backfill: %s is missing %s", table, ", ".join(sorted(needed - columns)))
+            return
+    logger.info("Rebuilding item_usage and item_pair_feedback from outfit history")
+    with Session(bind=conn) as db:
+        backfill_item_usage(db, commit=False)
+
+
+# Append new steps at the end with the next version number; never renumber or edit applied ones.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "clothing item metadata columns", _clothing_metadata),
+    Migration(2, "item usage feedback counters", _item_usage_feedback_counters),
+    Migration(3, "outfit_items backfill", _outfit_items_backfill),
+    Migration(4, "composite indexes", _composite_indexes),
+    Migration(5, "wardrobe full-text search index", _wardrobe_search_index),
+    Migration(6, "user data revision counter", _user_data_revision),
+    Migration(7, "user catalog revision counter", _user_catalog_revision),
+    Migration(8, "user wardrobe revision counter", _user_wardrobe_revision),
+    Migration(9, "item usage backfill", _item_usage_backfill),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine: Engine) -> Optional[int]:
+    # The one query startup needs; None when the database has never been versioned.
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT version FROM {VERSION_TABLE}")).scalar()
+    except DBAPIError:
+        return None
+
+
+def _set_version(conn: Connection, version: int) -> None:
+    conn.execute(text(f"UPDATE {VERSION_TABLE} SET version = :version"), {"version": version})
+
+
+def run_migrations(engine: Engine) -> int:
+    # Bring any database to LATEST_VERSION and return the version it was at before.
+    from app.db.base import Base
+    from app import models  # noqa: F401
+
+    version = current_version(engine)
+    if version is not None and version >= LATEST_VERSION:
+        return version
+
+    with engine.begin() as conn:
+        if version is None:
+            fresh = not any(inspect(conn).has_table(table.name) for table in Base.metadata.sorted_tables)
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (version INTEGER NOT NULL)"))
+            conn.execute(text(f"DELETE FROM {VERSION_TABLE}"))
             conn.execute(
-                text(
-                    """
-                    UPDATE clothing_items
-                    SET updated_at = CURRENT_TIMESTAMP
-                    WHERE updated_at IS NULL OR updated_at = 'CURRENT_TIMESTAMP'
-                    """
-                )
+                text(f"INSERT INTO {VERSION_TABLE} (version) VALUES (:version)"),
+                {"version": LATEST_VERSION if fresh else 0},
             )
+        else:
+            fresh = False
+        # New tables are created straight from the models; steps only alter what already existed.
+        Base.metadata.create_all(bind=conn)
+    if fresh:
+        logger.info("Created schema at version %s", LATEST_VERSION)
+        return 0
+    start = version or 0
+
+    for migration in MIGRATIONS:
+        if migration.version <= start:
+            continue
+        logger.info("Applying migration %s: %s", migration.version, migration.description)
+        with engine.begin() as conn:
+            migration.apply(conn)
+            _set_version(conn, migration.version)
+    return start
+
+
+def ensure_schema(engine: Engine, auto_migrate: bool = True) -> None:
+    version = current_version(engine)
+    if version is not None and version >= LATEST_VERSION:
+        return
+    if not auto_migrate:
+        raise RuntimeError(
+            f"Database schema is at version {version or 0}, expected {LATEST_VERSION}. "
+            "Run `python -m app.cli migrate` first."
+        )
+    run_migrations(engine)
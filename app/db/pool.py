@@ -0,0 +1,99 @@
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    # Checkout waits are timed by InstrumentedQueuePool; the in-use gauge and connect count
+    # come from pool events, so they work for any pool class.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_use = 0
+            self.max_in_use = 0
+            self.connects = 0
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+
+    def record_wait(self, waited_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total_ms += waited_ms
+            self.wait_max_ms = max(self.wait_max_ms, waited_ms)
+
+    def _on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, *args) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def _on_checkin(self, *args) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def attach(self, engine: Engine) -> None:
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.metrics = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def stats(self, engine: Engine) -> dict:
+        pool = engine.pool
+        with self._lock:
+            stats = {
+                "pool": type(pool).__name__,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), overflow=pool.overflow(), idle=pool.checkedin())
+        return stats
+
+
+class InstrumentedQueuePool(QueuePool):
+    metrics: Optional[PoolMetrics] = None
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # engine.dispose() swaps in a recreated pool; keep reporting to the same metrics.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    # Same instrumentation for the asyncio engine's pool.
+    pass
@@ -0,0 +1,57 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class SessionRouter:
+    # Read-only dependencies use the replica, except for a user who wrote within the last
+    # sticky_seconds: their reads stay on the primary so they see their own changes despite
+    # replication lag. Write handlers call record_write after committing. Write times are kept
+    # per process: another worker does not know about them.
+    def __init__(
+        self,
+        primary: Callable[[], Session],
+        replica: Optional[Callable[[], Session]] = None,
+        async_primary: Optional[Callable[[], AsyncSession]] = None,
+        async_replica: Optional[Callable[[], AsyncSession]] = None,
+        sticky_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.replica = replica or primary
+        self.async_primary = async_primary
+        self.async_replica = async_replica or async_primary
+        self.sticky_seconds = sticky_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._last_write: dict[int, float] = {}
+
+    @property
+    def has_replica(self) -> bool:
+        return self.replica is not self.primary
+
+    def record_write(self, user_id: int) -> None:
+        if not self.has_replica:
+            return
+        now = self.clock()
+        with self._lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > 10_000:
+                cutoff = now - self.sticky_seconds
+                self._last_write = {uid: at for uid, at in self._last_write.items() if at > cutoff}
+
+    def reads_from_primary(self, user_id: int) -> bool:
+        if not self.has_replica:
+            return True
+        with self._lock:
+            last_write = self._last_write.get(user_id)
+        return last_write is not None and self.clock() - last_write < self.sticky_seconds
+
+    def read_session(self, user_id: int) -> Session:
+        return (self.primary if self.reads_from_primary(user_id) else self.replica)()
+
+    def async_read_session(self, user_id: int) -> AsyncSession:
+        return (self.async_primary if self.reads_from_primary(user_id) else self.async_replica)()
@@ -0,0 +1,105 @@
+import logging
+import re
+
+from sqlalchemy import Select, column, false, func, literal_column, or_, table
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "clothing_items_fts"
+SEARCH_COLUMNS = ("name", "subtype", "color", "notes", "category")
+
+_columns = ", ".join(SEARCH_COLUMNS)
+_new = ", ".join(f"new.{name}" for name in SEARCH_COLUMNS)
+_old = ", ".join(f"old.{name}" for name in SEARCH_COLUMNS)
+
+# External-content FTS5 table: the index lives in clothing_items_fts, the text stays in clothing_items.
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE}
+    USING fts5({_columns}, content='clothing_items', content_rowid='id', prefix='2 3')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON clothing_items BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, {_columns}) VALUES (new.id, {_new});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON clothing_items BEGIN
+        INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF {_columns} ON clothing_items BEGIN
+        INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+        INSERT INTO {SEARCH_TABLE} (rowid, {_columns}) VALUES (new.id, {_new});
+    END
+    """,
+    f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+_POSTGRES_VECTOR = (
+    "to_tsvector('simple', concat_ws(' ', {row}name, {row}subtype, {row}color, {row}notes, "
+    "replace({row}category::text, '_', ' ')))"
+)
+_POSTGRES_DDL = [
+    "ALTER TABLE clothing_items ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION clothing_items_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {_POSTGRES_VECTOR.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS clothing_items_search_vector ON clothing_items",
+    f"""
+    CREATE TRIGGER clothing_items_search_vector
+    BEFORE INSERT OR UPDATE OF {_columns} ON clothing_items
+    FOR EACH ROW EXECUTE FUNCTION clothing_items_search_vector()
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_clothing_items_search_vector ON clothing_items USING GIN (search_vector)",
+    f"UPDATE clothing_items SET search_vector = {_POSTGRES_VECTOR.format(row='')} WHERE search_vector IS NULL",
+]
+
+
+def create_search_index(conn: Connection) -> None:
+    # Idempotent: creates whatever is missing and (re)fills the index from clothing_items.
+    if conn.dialect.name == "sqlite":
+        statements = _SQLITE_DDL
+    elif conn.dialect.name == "postgresql":
+        statements = _POSTGRES_DDL
+    else:
+        return
+    for statement in statements:
+        conn.exec_driver_sql(statement)
+
+
+def drop_search_index(conn: Connection) -> None:
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def _terms(q: str) -> list[str]:
+    return re.findall(r"[^\W_]+", q.lower())
+
+
+def search_items(query: Select, model, dialect: str, q: str) -> Select:
+    # Every word has to match, each as a prefix ("swea" finds "sweater"); best matches first.
+    terms = _terms(q)
+    if not terms:
+        return query.where(false())
+    if dialect == "sqlite":
+        fts = table(SEARCH_TABLE, column("rowid"), column("rank"))
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            query.join(fts, fts.c.rowid == model.id)
+            .where(literal_column(SEARCH_TABLE).op("MATCH")(match))
+            .order_by(fts.c.rank)
+        )
+    if dialect == "postgresql":
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        return query.where(vector.op("@@")(tsquery)).order_by(func.ts_rank(vector, tsquery).desc())
+    like_terms = [f"%{term}%" for term in terms]
+    return query.where(*(or_(model.name.ilike(term), model.subtype.ilike(term)) for term in like_terms))
@@ -1,14 +1,115 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import Pool
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMetrics
+from app.db.routing import SessionRouter
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
-    future=True,
-)
+
+def async_database_url(database_url: str, override: Optional[str] = None) -> URL:
+    # Same database through an asyncio driver: aiosqlite for SQLite, psycopg 3 for Postgres.
+    if override:
+        return make_url(override)
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+psycopg")
+    return url
+
+
+def engine_options(
+    settings: Settings, poolclass: type[Pool] = InstrumentedQueuePool, database_url: Optional[str] = None
+) -> dict:
+    url = make_url(database_url or settings.database_url)
+    options: dict = {"future": True}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def configure_sqlite(engine: Engine, settings: Settings) -> None:
+    # Settings are validated (Literal/int/bool), so they can be formatted into the PRAGMAs.
+    pragmas = [
+        f"PRAGMA journal_mode = {settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA foreign_keys = {'ON' if settings.sqlite_foreign_keys else 'OFF'}",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+engine = create_engine(settings.database_url, **engine_options(settings))
+if engine.dialect.name == "sqlite":
+    configure_sqlite(engine, settings)
+pool_metrics = PoolMetrics()
+pool_metrics.attach(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
+
+# Used by the async routes. Both engines point at the same database; each keeps its own pool.
+async_engine = create_async_engine(
+    async_database_url(settings.database_url, settings.async_database_url),
+    **engine_options(settings, poolclass=InstrumentedAsyncQueuePool),
+)
+if async_engine.dialect.name == "sqlite":
+    configure_sqlite(async_engine.sync_engine, settings)
+async_pool_metrics = PoolMetrics()
+async_pool_metrics.attach(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica for the read-only dependencies; without one, reads use the primary.
+ReadSessionLocal = SessionLocal
+AsyncReadSessionLocal = AsyncSessionLocal
+if settings.replica_database_url:
+    replica_engine = create_engine(
+        settings.replica_database_url, **engine_options(settings, database_url=settings.replica_database_url)
+    )
+    async_replica_engine = create_async_engine(
+        async_database_url(settings.replica_database_url),
+        **engine_options(settings, poolclass=InstrumentedAsyncQueuePool, database_url=settings.replica_database_url),
+    )
+    if replica_engine.dialect.name == "sqlite":
+        configure_sqlite(replica_engine, settings)
+        configure_sqlite(async_replica_engine.sync_engine, settings)
+    ReadSessionLocal = sessionmaker(
+        bind=replica_engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True
+    )
+    AsyncReadSessionLocal = async_sessionmaker(bind=async_replica_engine, autoflush=False, expire_on_commit=False)
+
+session_router = SessionRouter(
+    SessionLocal,
+    ReadSessionLocal,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    sticky_seconds=settings.replica_sticky_seconds,
+)
@@ -1,25 +1,40 @@
 import logging
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import get_settings
-from app.db.base import Base
-from app.db.migrations import run_migrations
-from app.db.session import engine
+from app.db.migrations import ensure_schema
+from app.db.session import SessionLocal, async_engine, async_pool_metrics, engine, pool_metrics
 from app.routes import auth, calendar, outfits, users, wardrobe
+from app.services.precompute import PrecomputeScheduler
+from app.services.wardrobe_cache import wardrobe_cache
+from app.services.wardrobe_catalog import catalog_cache
+from app.utils.compression import CompressionMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 settings = get_settings()
 
 # Ensure models are imported so metadata is ready for table creation
 from app import models  # noqa: E402,F401
 
-run_migrations(engine)
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title=settings.app_name)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ensure_schema(engine, auto_migrate=settings.auto_migrate)
+    scheduler = PrecomputeScheduler(SessionLocal) if settings.precompute_enabled else None
+    if scheduler:
+        scheduler.start()
+    yield
+    if scheduler:
+        scheduler.stop()
+    await async_engine.dispose()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 logger = logging.getLogger("outfitguru")
 if not logger.handlers:
@@ -31,7 +46,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
+# Registered before log_requests so it sits inside it: BaseHTTPMiddleware re-streams every response,
+# which would make each one look like a streaming response here.
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -61,3 +86,13 @@ def read_root():
 @app.get("/health", tags=["health"])
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"])
+def read_metrics():
+    return {
+        "wardrobe_cache": wardrobe_cache.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "db_pool": pool_metrics.stats(engine),
+        "async_db_pool": async_pool_metrics.stats(async_engine.sync_engine),
+    }
@@ -1,6 +1,19 @@
 from app.models.clothing_item import ClothingItem
+from app.models.custom_subtype import CustomSubtype
+from app.models.item_pair_feedback import ItemPairFeedback
+from app.models.item_usage import ItemUsage
 from app.models.outfit import Outfit
+from app.models.outfit_item import OutfitItem
 from app.models.outfit_occurrence import OutfitOccurrence
 from app.models.user import User
 
-__all__ = ["User", "ClothingItem", "Outfit", "OutfitOccurrence"]
+__all__ = [
+    "User",
+    "ClothingItem",
+    "CustomSubtype",
+    "ItemUsage",
+    "ItemPairFeedback",
+    "Outfit",
+    "OutfitItem",
+    "OutfitOccurrence",
+]
@@ -1,15 +1,20 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.search import create_search_index, drop_search_index
 from app.models.enums import ClothingCategory, ColorFamily, Season
 
 
 class ClothingItem(Base):
     __tablename__ = "clothing_items"
+    __table_args__ = (
+        Index("ix_clothing_items_user_id_category_created_at", "user_id", "category", "created_at"),
+        Index("ix_clothing_items_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -39,3 +44,8 @@ class ClothingItem(Base):
     )
 
     user: Mapped["User"] = relationship(back_populates="clothing_items")
+
+
+# The full-text index is not a mapped table; it is created and dropped with clothing_items.
+event.listen(ClothingItem.__table__, "after_create", lambda target, conn, **kw: create_search_index(conn))
+event.listen(ClothingItem.__table__, "before_drop", lambda target, conn, **kw: drop_search_index(conn))
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.enums import ClothingCategory
+
+
+class CustomSubtype(Base):
+    __tablename__ = "custom_subtypes"
+    __table_args__ = (UniqueConstraint("user_id", "category", "name", name="uq_custom_subtype_user_category_name"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    category: Mapped[ClothingCategory] = mapped_column(
+        SAEnum(ClothingCategory, name="clothing_category"), nullable=False
+    )
+    name: Mapped[str] = mapped_column(String(40), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
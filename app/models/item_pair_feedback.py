@@ -0,0 +1,17 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ItemPairFeedback(Base):
+    __tablename__ = "item_pair_feedback"
+
+    # Unordered pair stored with item_a < item_b.
+    item_a: Mapped[int] = mapped_column(ForeignKey("clothing_items.id"), primary_key=True)
+    item_b: Mapped[int] = mapped_column(ForeignKey("clothing_items.id"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    likes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    dislikes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    skips: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rejections: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
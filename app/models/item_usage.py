@@ -0,0 +1,22 @@
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ItemUsage(Base):
+    __tablename__ = "item_usage"
+
+    item_id: Mapped[int] = mapped_column(ForeignKey("clothing_items.id"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    last_used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    use_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_worn_at: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # Feedback counters, kept in step with outfit feedback and "didn't like it" confirmations.
+    likes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    dislikes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    skips: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rejections: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from typing import List
 
-from sqlalchemy import Date, DateTime, Enum as SAEnum, ForeignKey, Integer, JSON, func
+from sqlalchemy import Date, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, JSON, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,6 +10,10 @@ from app.models.enums import OutfitFeedback
 
 class Outfit(Base):
     __tablename__ = "outfits"
+    __table_args__ = (
+        Index("ix_outfits_user_id_created_at", "user_id", "created_at"),
+        Index("ix_outfits_user_id_date", "user_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -21,3 +25,6 @@ class Outfit(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user: Mapped["User"] = relationship(back_populates="outfits")
+    items: Mapped[List["OutfitItem"]] = relationship(
+        order_by="OutfitItem.position", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class OutfitItem(Base):
+    # Normalised copy of Outfit.item_ids so "outfits containing item X" is an index lookup.
+    __tablename__ = "outfit_items"
+    __table_args__ = (Index("ix_outfit_items_item_id_outfit_id", "item_id", "outfit_id"),)
+
+    outfit_id: Mapped[int] = mapped_column(ForeignKey("outfits.id", ondelete="CASCADE"), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    item_id: Mapped[int] = mapped_column(ForeignKey("clothing_items.id"), nullable=False)
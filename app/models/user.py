@@ -15,6 +15,12 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String, nullable=False)
     preferences: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Bumped with every change to the user's wardrobe, outfits or calendar; read ETags derive from it.
+    data_revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped when the user's clothing items change; cached wardrobe snapshots are keyed on it.
+    wardrobe_revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped when the user's custom subtypes change; cached catalogs are keyed on it.
+    catalog_revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     clothing_items: Mapped[List["ClothingItem"]] = relationship(back_populates="user")
     outfits: Mapped[List["Outfit"]] = relationship(back_populates="user")
@@ -5,13 +5,18 @@ from app.core.security import create_access_token, get_password_hash, verify_pas
 from app.models.user import User
 from app.schemas.auth import AuthRequest, AuthResponse, Token
 from app.schemas.user import UserResponse
-from app.utils.deps import get_db
+from app.db.routing import SessionRouter
+from app.utils.deps import get_db, get_session_router
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-def register(auth_request: AuthRequest, db: Session = Depends(get_db)):
+def register(
+    auth_request: AuthRequest,
+    db: Session = Depends(get_db),
+    session_router: SessionRouter = Depends(get_session_router),
+):
     existing_user = db.query(User).filter(User.email == auth_request.email).first()
     if existing_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered.")
@@ -20,6 +25,7 @@ def register(auth_request: AuthRequest, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    session_router.record_write(user.id)
 
     token = Token(access_token=create_access_token(user.id))
     return AuthResponse(user=UserResponse.model_validate(user), token=token)
@@ -1,40 +1,136 @@
 from datetime import date
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.routing import SessionRouter
+from app.models.outfit import Outfit
+from app.models.outfit_occurrence import OutfitOccurrence
 from app.models.user import User
-from app.schemas.calendar import ConfirmWornRequest, DayCalendarResponse, MonthCalendarResponse, OutfitOccurrenceResponse
-from app.services.calendar import confirm_worn, get_day_occurrence, get_month_occurrences, plan_tomorrow
-from app.utils.deps import get_current_user, get_db
+from app.routes.outfits import need_more_items_response
+from app.schemas.calendar import (
+    ConfirmWornRequest,
+    DayCalendarResponse,
+    MonthCalendarResponse,
+    OutfitOccurrenceResponse,
+    PlanRangeRequest,
+    PlanRangeResult,
+)
+from app.schemas.outfit import OutfitResponse
+from app.services.calendar import (
+    confirm_worn,
+    get_day_occurrence,
+    get_month_occurrences,
+    month_bounds,
+    plan_outfits_for_range,
+    plan_tomorrow,
+)
+from app.services.expansion import EXPAND_ITEMS, embed_items
+from app.services.recommender import RecommendationError
+from app.utils.conditional import check_etag
+from app.utils.deps import (
+    get_async_read_db,
+    get_current_read_user,
+    get_current_read_user_async,
+    get_current_user,
+    get_db,
+    get_read_db,
+    get_session_router,
+)
+from app.utils.fast_json import (
+    fast_json_enabled,
+    fast_json_response,
+    nested_row_dicts,
+    response_columns,
+    response_fields,
+)
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
 
+async def _fast_month(
+    db: AsyncSession, user_id: int, year: int, month: int, expand_items: bool, response: Response
+) -> Response:
+    start, end = month_bounds(year, month)
+    query = (
+        select(
+            *response_columns(OutfitOccurrenceResponse, OutfitOccurrence, exclude=("outfit",)),
+            *response_columns(OutfitResponse, Outfit),
+        )
+        .outerjoin(Outfit, OutfitOccurrence.outfit_id == Outfit.id)
+        .where(OutfitOccurrence.user_id == user_id, OutfitOccurrence.date >= start, OutfitOccurrence.date <= end)
+        .order_by(OutfitOccurrence.date.asc())
+    )
+    rows = await db.execute(query)
+    occurrences = nested_row_dicts(
+        response_fields(OutfitOccurrenceResponse, exclude=("outfit",)), "outfit", response_fields(OutfitResponse), rows
+    )
+    if expand_items:
+        await db.run_sync(embed_items, user_id, [entry["outfit"] for entry in occurrences if entry["outfit"]])
+    return fast_json_response({"occurrences": occurrences}, response)
+
+
 @router.get("/month", response_model=MonthCalendarResponse)
-def get_calendar_month(
+async def get_calendar_month(
+    request: Request,
+    response: Response,
     year: int,
     month: int = Query(..., ge=1, le=12),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    expand: Optional[Literal["items"]] = Query(default=None, description="items: embed each outfit's items."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_read_user_async),
 ):
-    occurrences = get_month_occurrences(db, current_user.id, year, month)
+    check_etag(request, response, current_user.id, current_user.data_revision)
+    expand_items = expand == EXPAND_ITEMS
+    if fast_json_enabled():
+        return await _fast_month(db, current_user.id, year, month, expand_items, response)
+    occurrences = await db.run_sync(get_month_occurrences, current_user.id, year, month, expand_items)
+    if expand_items:
+        # Outfits with items don't fit the response model, which would drop them.
+        return fast_json_response({"occurrences": occurrences}, response)
     return {"occurrences": occurrences}
 
 
 @router.get("/day", response_model=DayCalendarResponse)
 def get_calendar_day(
+    request: Request,
+    response: Response,
     target_date: date = Query(..., alias="date"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_read_user),
 ):
+    check_etag(request, response, current_user.id, current_user.data_revision)
     occurrence = get_day_occurrence(db, current_user.id, target_date)
     return {"occurrence": occurrence}
 
 
 @router.post("/plan-tomorrow", response_model=OutfitOccurrenceResponse, status_code=status.HTTP_200_OK)
-def plan_for_tomorrow(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return plan_tomorrow(db, current_user.id)
+def plan_for_tomorrow(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    occurrence = plan_tomorrow(db, current_user.id)
+    session_router.record_write(current_user.id)
+    return occurrence
+
+
+@router.post("/plan-range", response_model=PlanRangeResult, status_code=status.HTTP_200_OK)
+def plan_date_range(
+    payload: PlanRangeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    try:
+        occurrences = plan_outfits_for_range(db, current_user.id, payload.start_date, payload.end_date)
+    except RecommendationError as err:
+        return need_more_items_response(err)
+    session_router.record_write(current_user.id)
+    return {"occurrences": occurrences}
 
 
 @router.post("/confirm-worn", response_model=OutfitOccurrenceResponse)
@@ -42,6 +138,8 @@ def confirm_outfit_worn(
     payload: ConfirmWornRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
 ):
     occurrence = confirm_worn(db, current_user.id, payload.date, payload.worn, payload.negative_reason)
+    session_router.record_write(current_user.id)
     return occurrence
@@ -1,54 +1,176 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.routing import SessionRouter
+from app.models.clothing_item import ClothingItem
 from app.models.outfit import Outfit
+from app.models.outfit_item import OutfitItem
 from app.models.user import User
-from app.schemas.outfit import NeedMoreItemsResponse, OutfitFeedbackUpdate, RecommendationResponse, OutfitResponse
-from app.services.recommender import RecommendationError, generate_outfit_recommendation
-from app.utils.deps import get_current_user, get_db
+from app.schemas.outfit import (
+    NeedMoreItemsResponse,
+    OutfitCreate,
+    OutfitFeedbackUpdate,
+    OutfitResponse,
+    RankedRecommendationsResponse,
+    RecommendationResponse,
+)
+from app.services.expansion import EXPAND_ITEMS, outfit_columns, outfit_payloads, parse_fieldset
+from app.services.item_usage import record_feedback_change
+from app.services.recommender import (
+    RecommendationError,
+    generate_outfit_recommendation,
+    rank_outfit_recommendations,
+    save_outfit,
+)
+from app.services.revisions import bump_revision
+from app.utils.conditional import check_etag
+from app.utils.deps import (
+    get_async_read_db,
+    get_current_read_user_async,
+    get_current_user,
+    get_db,
+    get_session_router,
+)
+from app.utils.fast_json import fast_json_enabled, fast_json_response
+from app.utils.pagination import keyset_page, keyset_query, keyset_rows
 
 router = APIRouter(prefix="/outfits", tags=["outfits"])
 
+HISTORY_PAGE_SIZE = 50
+
+
+def need_more_items_response(err: RecommendationError) -> JSONResponse:
+    payload = NeedMoreItemsResponse(
+        missing_categories=err.missing_categories,
+        message="Add at least one item in these categories to get a recommendation.",
+    )
+    return JSONResponse(status_code=status.HTTP_200_OK, content=payload.model_dump())
+
+
+@router.post("", response_model=OutfitResponse, status_code=status.HTTP_201_CREATED)
+def create_outfit(
+    outfit_in: OutfitCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    item_ids = list(dict.fromkeys(outfit_in.item_ids))
+    # Checked against the database: another worker's cached snapshot may still list a deleted item.
+    owned = set(
+        db.scalars(
+            select(ClothingItem.id).where(ClothingItem.user_id == current_user.id, ClothingItem.id.in_(item_ids))
+        )
+    )
+    if not owned.issuperset(item_ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Outfits can only contain items from your wardrobe.",
+        )
+    outfit = save_outfit(db, current_user.id, item_ids)
+    session_router.record_write(current_user.id)
+    return outfit
+
 
 @router.post("/recommendation", response_model=RecommendationResponse, status_code=status.HTTP_201_CREATED)
-def create_recommendation(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_recommendation(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    # Sync on purpose: scoring is CPU-bound and grows with the wardrobe, so it runs in the
+    # threadpool rather than stalling the event loop.
     try:
         outfit = generate_outfit_recommendation(db, current_user.id)
     except RecommendationError as err:
-        payload = NeedMoreItemsResponse(
-            missing_categories=err.missing_categories,
-            message="Add at least one item in these categories to get a recommendation.",
-        )
-        return JSONResponse(status_code=status.HTTP_200_OK, content=payload.model_dump())
+        return need_more_items_response(err)
+    session_router.record_write(current_user.id)
     return outfit
 
 
+@router.post("/recommendations", response_model=RankedRecommendationsResponse)
+def list_recommendations(
+    k: int = Query(default=3, ge=1, le=10),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        ranked = rank_outfit_recommendations(db, current_user.id, k)
+    except RecommendationError as err:
+        return need_more_items_response(err)
+    return {
+        "recommendations": [
+            {"rank": rank, "item_ids": outfit.item_ids, "score": outfit.score, "reason": outfit.reason}
+            for rank, outfit in enumerate(ranked, start=1)
+        ]
+    }
+
+
 @router.post("/{outfit_id}/feedback", response_model=OutfitResponse)
 def set_outfit_feedback(
     outfit_id: int,
     feedback_update: OutfitFeedbackUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
 ):
     outfit = db.query(Outfit).filter(Outfit.id == outfit_id, Outfit.user_id == current_user.id).first()
     if not outfit:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outfit not found.")
 
+    if outfit.feedback != feedback_update.feedback:
+        record_feedback_change(db, current_user.id, outfit.item_ids, outfit.feedback, feedback_update.feedback)
+        bump_revision(db, current_user.id)
     outfit.feedback = feedback_update.feedback
     db.commit()
     db.refresh(outfit)
+    session_router.record_write(current_user.id)
     return outfit
 
 
 @router.get("/history", response_model=List[OutfitResponse])
-def list_outfit_history(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    outfits = (
-        db.query(Outfit)
-        .filter(Outfit.user_id == current_user.id)
-        .order_by(Outfit.created_at.desc())
-        .all()
-    )
-    return outfits
+async def list_outfit_history(
+    request: Request,
+    response: Response,
+    item_id: Optional[int] = Query(default=None, description="Only outfits containing this wardrobe item."),
+    limit: int = Query(default=HISTORY_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page."),
+    all_pages: bool = Query(default=False, alias="all", description="Return the whole history unpaginated."),
+    expand: Optional[Literal["items"]] = Query(default=None, description="items: embed each outfit's items."),
+    fields: Optional[str] = Query(
+        default=None, description="Comma-separated fields to return, e.g. id,date,items.name (with expand=items)."
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_read_user_async),
+):
+    check_etag(request, response, current_user.id, current_user.data_revision)
+    expand_items = expand == EXPAND_ITEMS
+    fieldset = parse_fieldset(fields, expand_items)
+    # Sparse and expanded payloads are built from plain columns, like the fast path.
+    rows_path = fast_json_enabled() or expand_items or bool(fields)
+    if rows_path:
+        names, columns = outfit_columns(fieldset)
+        query = select(*columns)
+    else:
+        query = select(Outfit)
+    query = query.where(Outfit.user_id == current_user.id)
+    if item_id is not None:
+        query = query.where(exists().where(OutfitItem.outfit_id == Outfit.id, OutfitItem.item_id == item_id))
+    if all_pages:
+        query = query.order_by(Outfit.created_at.desc(), Outfit.id.desc())
+        if rows_path:
+            rows = (await db.execute(query)).all()
+            payload = await outfit_payloads(db, current_user.id, names, rows, fieldset, expand_items)
+            return fast_json_response(payload, response)
+        outfits = await db.scalars(query)
+        return outfits.all()
+    rows = await db.execute(keyset_query(db, query, Outfit, cursor, limit))
+    if rows_path:
+        page = keyset_rows(rows.all(), limit, response)
+        payload = await outfit_payloads(db, current_user.id, names, page, fieldset, expand_items)
+        return fast_json_response(payload, response)
+    return keyset_page(rows.all(), limit, response)
@@ -3,27 +3,35 @@ from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.schemas.user import PreferencesResponse, PreferencesUpdate, UserResponse
-from app.utils.deps import get_current_user, get_db
+from app.db.routing import SessionRouter
+from app.utils.deps import get_current_read_user, get_current_user, get_db, get_session_router
 
 router = APIRouter(tags=["users"])
 
 
 @router.get("/me", response_model=UserResponse)
-def read_current_user(current_user: User = Depends(get_current_user)):
+def read_current_user(current_user: User = Depends(get_current_read_user)):
     return UserResponse.from_orm(current_user)
 
 
 @router.patch("/me/preferences", response_model=PreferencesResponse)
 def update_preferences(
-    preferences: PreferencesUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    preferences: PreferencesUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    session_router: SessionRouter = Depends(get_session_router),
 ):
     existing = dict(current_user.preferences or {})
-    if preferences.goal is None:
-        existing.pop("goal", None)
-    else:
-        existing["goal"] = preferences.goal
+    # Only the fields sent are applied; an explicit null clears one.
+    updates = preferences.model_dump(mode="json", include=preferences.model_fields_set)
+    for key, value in updates.items():
+        if value is None:
+            existing.pop(key, None)
+        else:
+            existing[key] = value
     current_user.preferences = existing
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    session_router.record_write(current_user.id)
     return PreferencesResponse.model_validate(current_user.preferences or {})
@@ -1,42 +1,64 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.db.routing import SessionRouter
+from app.db.search import search_items
 from app.models.clothing_item import ClothingItem
+from app.models.custom_subtype import CustomSubtype
 from app.models.enums import ClothingCategory, ColorFamily, Season
-from app.models.outfit import Outfit
+from app.models.outfit_item import OutfitItem
 from app.models.user import User
-from app.schemas.clothing_item import ClothingItemCreate, ClothingItemResponse, ClothingItemUpdate, WardrobeCategoriesResponse
-from app.services.wardrobe_catalog import (
-    get_color_families,
-    get_seasons,
-    get_wardrobe_categories,
-    valid_subtypes_for,
+from app.schemas.clothing_item import (
+    ClothingItemCreate,
+    ClothingItemResponse,
+    ClothingItemUpdate,
+    CustomSubtypeCreate,
+    CustomSubtypeResponse,
+    WardrobeCategoriesResponse,
+    WardrobeImportResult,
 )
-from app.utils.deps import get_current_user, get_db
+from app.services.revisions import bump_catalog_revision, bump_revision
+from app.services.wardrobe_catalog import BASE_CATALOG, catalog_cache, load_user_catalog, metadata_error
+from app.services.wardrobe_cache import wardrobe_cache
+from app.services.wardrobe_import import IMPORT_FORMATS, ImportFormatError, import_wardrobe_items
+from app.utils.conditional import check_etag, etag_matches
+from app.utils.deps import (
+    get_async_db,
+    get_async_read_db,
+    get_current_read_user_async,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+    get_optional_read_db,
+    get_optional_user,
+    get_session_router,
+)
+from app.utils.fast_json import (
+    fast_json_enabled,
+    fast_json_response,
+    response_columns,
+    response_fields,
+    row_dicts,
+)
+from app.utils.pagination import keyset_page, keyset_query, keyset_rows
 
 router = APIRouter(prefix="/wardrobe", tags=["wardrobe"])
 
+# The built-in catalog only changes with a deploy.
+CATALOG_CACHE_CONTROL = "public, max-age=86400"
 
-def _validate_metadata(category: ClothingCategory, subtype: str, color_family: str, season: str):
-    allowed_subtypes = valid_subtypes_for(category)
-    if allowed_subtypes and subtype not in allowed_subtypes:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-            detail="Invalid subtype for this category.",
-        )
-    if color_family not in get_color_families():
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-            detail="Invalid color_family. Refer to /wardrobe/categories.",
-        )
-    if season not in get_seasons():
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-            detail="Invalid season. Refer to /wardrobe/categories.",
-        )
+
+def _validate_metadata(
+    db: Session, user: User, category: ClothingCategory, subtype: str, color_family: str, season: str
+):
+    catalog = load_user_catalog(db, user.id, user.catalog_revision)
+    error = metadata_error(category, subtype, color_family, season, catalog.subtypes)
+    if error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=error)
 
 
 def _get_item_or_404(db: Session, user_id: int, item_id: int) -> ClothingItem:
@@ -48,35 +70,95 @@ def _get_item_or_404(db: Session, user_id: int, item_id: int) -> ClothingItem:
 
 @router.post("/items", response_model=ClothingItemResponse, status_code=status.HTTP_201_CREATED)
 def create_clothing_item(
-    item_in: ClothingItemCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    item_in: ClothingItemCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
 ):
-    _validate_metadata(item_in.category, item_in.subtype or "General", item_in.color_family.value, item_in.season.value)
+    _validate_metadata(
+        db,
+        current_user,
+        item_in.category,
+        item_in.subtype or "General",
+        item_in.color_family.value,
+        item_in.season.value,
+    )
     item = ClothingItem(**item_in.model_dump(), user_id=current_user.id)
     db.add(item)
+    bump_revision(db, current_user.id, wardrobe=True)
     db.commit()
+    wardrobe_cache.invalidate(current_user.id)
+    session_router.record_write(current_user.id)
     db.refresh(item)
     return item
 
 
+@router.post("/items/import", response_model=WardrobeImportResult)
+async def import_clothing_items(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    upload_format = IMPORT_FORMATS.get(content_type)
+    if upload_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload CSV (text/csv) or JSON lines (application/x-ndjson).",
+        )
+    catalog = await db.run_sync(load_user_catalog, current_user.id, current_user.catalog_revision)
+    try:
+        result = await import_wardrobe_items(db, current_user.id, request.stream(), upload_format, catalog.subtypes)
+    except ImportFormatError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err))
+    if result["imported"]:
+        wardrobe_cache.invalidate(current_user.id)
+        session_router.record_write(current_user.id)
+    return result
+
+
 @router.get("/items", response_model=List[ClothingItemResponse])
-def list_clothing_items(
+async def list_clothing_items(
+    request: Request,
+    response: Response,
     category: Optional[ClothingCategory] = Query(default=None),
-    q: Optional[str] = Query(default=None, min_length=1),
+    q: Optional[str] = Query(
+        default=None, min_length=1, description="Search name, subtype, color, notes and category."
+    ),
     limit: int = Query(default=50, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page."),
+    offset: int = Query(default=0, ge=0, description="Deprecated; use cursor."),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_read_user_async),
 ):
-    query = db.query(ClothingItem).filter(ClothingItem.user_id == current_user.id)
+    check_etag(request, response, current_user.id, current_user.data_revision)
+    fast = fast_json_enabled()
+    columns = response_columns(ClothingItemResponse, ClothingItem) if fast else [ClothingItem]
+    query = select(*columns).where(ClothingItem.user_id == current_user.id)
     if category:
-        query = query.filter(ClothingItem.category == category)
+        query = query.where(ClothingItem.category == category)
     if q:
-        like_term = f"%{q.strip()}%"
-        query = query.filter(or_(ClothingItem.name.ilike(like_term), ClothingItem.subtype.ilike(like_term)))
-    items = (
-        query.order_by(ClothingItem.created_at.desc()).offset(offset).limit(limit).all()
-    )
-    return items
+        # Search results are ranked by relevance, so they page by offset rather than cursor.
+        if cursor:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor cannot be combined with q.")
+        query = search_items(query, ClothingItem, db.get_bind().dialect.name, q)
+        query = query.order_by(ClothingItem.created_at.desc(), ClothingItem.id.desc()).offset(offset).limit(limit)
+        if fast:
+            rows = await db.execute(query)
+            return fast_json_response(row_dicts(response_fields(ClothingItemResponse), rows), response)
+        items = await db.scalars(query)
+        return items.all()
+    if cursor and offset:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either cursor or offset, not both.")
+    query = keyset_query(db, query, ClothingItem, cursor, limit)
+    if offset:
+        query = query.offset(offset)
+    rows = await db.execute(query)
+    if fast:
+        page = keyset_rows(rows.all(), limit, response)
+        return fast_json_response(row_dicts(response_fields(ClothingItemResponse), page), response)
+    return keyset_page(rows.all(), limit, response)
 
 
 @router.get("/items/{item_id}", response_model=ClothingItemResponse)
@@ -92,6 +174,7 @@ def update_clothing_item(
     item_update: ClothingItemUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
 ):
     item = _get_item_or_404(db, current_user.id, item_id)
     payload = item_update.model_dump(exclude_unset=True)
@@ -105,6 +188,8 @@ def update_clothing_item(
     season_str = new_season_value.value if isinstance(new_season_value, Season) else str(new_season_value)
 
     _validate_metadata(
+        db,
+        current_user,
         new_category,
         new_subtype or "General",
         color_family_str,
@@ -114,37 +199,112 @@ def update_clothing_item(
     for field, value in payload.items():
         setattr(item, field, value)
     db.add(item)
+    bump_revision(db, current_user.id, wardrobe=True)
     db.commit()
+    wardrobe_cache.invalidate(current_user.id)
+    session_router.record_write(current_user.id)
     db.refresh(item)
     return item
 
 
 @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_clothing_item(
-    item_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    item_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
 ):
     item = _get_item_or_404(db, current_user.id, item_id)
     # Prevent deleting items used in outfits
-    outfits = (
-        db.query(Outfit)
-        .filter(Outfit.user_id == current_user.id)
-        .all()
-    )
-    if any(item.id in (outfit.item_ids or []) for outfit in outfits):
+    if db.scalar(select(exists().where(OutfitItem.item_id == item.id))):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This item is used in saved outfits. Remove it from outfits first.",
         )
 
     db.delete(item)
+    bump_revision(db, current_user.id, wardrobe=True)
     db.commit()
+    wardrobe_cache.invalidate(current_user.id)
+    session_router.record_write(current_user.id)
     return None
 
 
 @router.get("/categories", response_model=WardrobeCategoriesResponse)
-def get_categories():
-    return {
-        "categories": get_wardrobe_categories(),
-        "color_families": get_color_families(),
-        "seasons": get_seasons(),
-    }
+def get_categories(
+    request: Request,
+    db: Optional[Session] = Depends(get_optional_read_db),
+    current_user: Optional[User] = Depends(get_optional_user),
+):
+    # The response is pre-encoded. Anonymous callers get the built-in catalog, which only changes
+    # with a deploy; signed-in users get it merged with their custom subtypes.
+    if current_user is None:
+        catalog, cache_control = BASE_CATALOG, CATALOG_CACHE_CONTROL
+    else:
+        catalog = load_user_catalog(db, current_user.id, current_user.catalog_revision)
+        cache_control = "private, no-cache"
+    headers = {"ETag": catalog.etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+    if etag_matches(request, catalog.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(catalog.body, media_type="application/json", headers=headers)
+
+
+@router.get("/subtypes", response_model=List[CustomSubtypeResponse])
+def list_custom_subtypes(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return db.scalars(
+        select(CustomSubtype).where(CustomSubtype.user_id == current_user.id).order_by(CustomSubtype.id)
+    ).all()
+
+
+@router.post("/subtypes", response_model=CustomSubtypeResponse, status_code=status.HTTP_201_CREATED)
+def create_custom_subtype(
+    subtype_in: CustomSubtypeCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    catalog = load_user_catalog(db, current_user.id, current_user.catalog_revision)
+    name = subtype_in.name.casefold()
+    if any(existing.casefold() == name for existing in catalog.subtypes[subtype_in.category]):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This category already has that subtype.")
+
+    subtype = CustomSubtype(user_id=current_user.id, category=subtype_in.category, name=subtype_in.name)
+    db.add(subtype)
+    bump_catalog_revision(db, current_user.id)
+    db.commit()
+    catalog_cache.invalidate(current_user.id)
+    session_router.record_write(current_user.id)
+    db.refresh(subtype)
+    return subtype
+
+
+@router.delete("/subtypes/{subtype_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_custom_subtype(
+    subtype_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    session_router: SessionRouter = Depends(get_session_router),
+):
+    subtype = db.scalar(
+        select(CustomSubtype).where(CustomSubtype.id == subtype_id, CustomSubtype.user_id == current_user.id)
+    )
+    if not subtype:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subtype not found.")
+    # Items keep their subtype as text, so a subtype still in use would make them fail validation.
+    in_use = exists().where(
+        ClothingItem.user_id == current_user.id,
+        ClothingItem.category == subtype.category,
+        ClothingItem.subtype == subtype.name,
+    )
+    if db.scalar(select(in_use)):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Items in your wardrobe use this subtype. Change them first.",
+        )
+
+    db.delete(subtype)
+    bump_catalog_revision(db, current_user.id)
+    db.commit()
+    catalog_cache.invalidate(current_user.id)
+    session_router.record_write(current_user.id)
+    return None
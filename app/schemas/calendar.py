@@ -1,10 +1,10 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, Union
 
 from pydantic import BaseModel, ConfigDict
 
 from app.models.enums import NegativeReason, OutfitStatus
-from app.schemas.outfit import OutfitResponse
+from app.schemas.outfit import NeedMoreItemsResponse, OutfitResponse
 
 
 class OutfitOccurrenceResponse(BaseModel):
@@ -28,7 +28,19 @@ class DayCalendarResponse(BaseModel):
     occurrence: Optional[OutfitOccurrenceResponse]
 
 
+class PlanRangeRequest(BaseModel):
+    start_date: date
+    end_date: date
+
+
+class PlanRangeResponse(BaseModel):
+    occurrences: list[OutfitOccurrenceResponse]
+
+
 class ConfirmWornRequest(BaseModel):
     date: date
     worn: bool = True
     negative_reason: Optional[NegativeReason] = None
+
+
+PlanRangeResult = Union[PlanRangeResponse, NeedMoreItemsResponse]
@@ -51,12 +51,45 @@ class ClothingItemResponse(ClothingItemBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WardrobeImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class WardrobeImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[WardrobeImportError]  # the first 100 failures
+
+
 class WardrobeCategory(BaseModel):
     slug: ClothingCategory
     label: str
     subtypes: list[str]
 
 
+class CustomSubtypeCreate(BaseModel):
+    category: ClothingCategory
+    name: str = Field(min_length=1, max_length=40)
+
+    @field_validator("name")
+    @classmethod
+    def strip_name(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("Subtype name cannot be blank.")
+        return value
+
+
+class CustomSubtypeResponse(BaseModel):
+    id: int
+    category: ClothingCategory
+    name: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class WardrobeCategoriesResponse(BaseModel):
     categories: list[WardrobeCategory]
     color_families: list[str]
@@ -17,6 +17,10 @@ class OutfitResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class OutfitCreate(BaseModel):
+    item_ids: List[int] = Field(min_length=1)
+
+
 class OutfitFeedbackUpdate(BaseModel):
     feedback: OutfitFeedback
 
@@ -27,4 +31,16 @@ class NeedMoreItemsResponse(BaseModel):
     message: str
 
 
+class RankedOutfitResponse(BaseModel):
+    rank: int
+    item_ids: List[int]
+    score: float
+    reason: str
+
+
+class RecommendationsResponse(BaseModel):
+    recommendations: List[RankedOutfitResponse]
+
+
 RecommendationResponse = Union[OutfitResponse, NeedMoreItemsResponse]
+RankedRecommendationsResponse = Union[RecommendationsResponse, NeedMoreItemsResponse]
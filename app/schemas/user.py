@@ -1,13 +1,31 @@
 from datetime import datetime
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from app.models.enums import ColorFamily, Season
+
 
 GoalPreference = Literal["daily", "plan_ahead"]
 
+
+class ColorPairOverride(BaseModel):
+    colors: Tuple[ColorFamily, ColorFamily]
+    # -1 (clash) to 1 (great match); null means never put these colors together.
+    score: Optional[float] = Field(default=None, ge=-1, le=1)
+
+
+class SeasonFitOverride(BaseModel):
+    item: Season
+    context: Season
+    # -1 (wrong for the weather) to 1 (ideal); null means never wear it then.
+    score: Optional[float] = Field(default=None, ge=-1, le=1)
+
+
 class PreferencesUpdate(BaseModel):
     goal: Optional[GoalPreference] = Field(default=None)
+    color_overrides: Optional[List[ColorPairOverride]] = Field(default=None)
+    season_overrides: Optional[List[SeasonFitOverride]] = Field(default=None)
 
 
 class PreferencesResponse(PreferencesUpdate):
@@ -1,13 +1,22 @@
 from calendar import monthrange
-from datetime import date, timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Union
 
 from fastapi import HTTPException, status
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session, joinedload
 
-from app.models.enums import NegativeReason, OutfitStatus
+from app.models.enums import NegativeReason, OutfitFeedback, OutfitStatus
 from app.models.outfit import Outfit
+from app.models.outfit_item import OutfitItem
 from app.models.outfit_occurrence import OutfitOccurrence
+from app.schemas.calendar import OutfitOccurrenceResponse
+from app.services.expansion import embed_items
+from app.services.item_usage import is_rejection, record_outfits_usage, record_rejection_change, record_worn
+from app.services.recommender import plan_outfit_sequence
+from app.services.revisions import bump_revision
+
+MAX_PLAN_DAYS = 31
 
 
 def _occurrence_query(db: Session, user_id: int):
@@ -18,21 +27,32 @@ def _occurrence_query(db: Session, user_id: int):
     )
 
 
-def get_month_occurrences(db: Session, user_id: int, year: int, month: int):
+def month_bounds(year: int, month: int) -> tuple[date, date]:
     try:
         start = date(year, month, 1)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid year or month.")
 
     last_day = monthrange(year, month)[1]
-    end = date(year, month, last_day)
+    return start, date(year, month, last_day)
 
-    return (
+
+def get_month_occurrences(
+    db: Session, user_id: int, year: int, month: int, expand_items: bool = False
+) -> list[Union[OutfitOccurrence, dict]]:
+    # With expand_items the occurrences come back as response dicts whose outfits embed their items.
+    start, end = month_bounds(year, month)
+    occurrences = (
         _occurrence_query(db, user_id)
         .filter(OutfitOccurrence.date >= start, OutfitOccurrence.date <= end)
         .order_by(OutfitOccurrence.date.asc())
         .all()
     )
+    if not expand_items:
+        return occurrences
+    payload = [OutfitOccurrenceResponse.model_validate(occurrence).model_dump() for occurrence in occurrences]
+    embed_items(db, user_id, [entry["outfit"] for entry in payload if entry["outfit"]])
+    return payload
 
 
 def get_day_occurrence(db: Session, user_id: int, target_date: date) -> Optional[OutfitOccurrence]:
@@ -44,27 +64,51 @@ def get_day_occurrence(db: Session, user_id: int, target_date: date) -> Optional
 
 
 def _latest_outfit(db: Session, user_id: int) -> Optional[Outfit]:
+    # Newest by creation: range plans store outfits under future dates, which must not outrank
+    # a recommendation made after them.
     return (
         db.query(Outfit)
         .filter(Outfit.user_id == user_id)
-        .order_by(Outfit.date.desc(), Outfit.created_at.desc())
+        .order_by(Outfit.created_at.desc(), Outfit.id.desc())
         .first()
     )
 
 
-def plan_outfit_for_date(db: Session, user_id: int, target_date: date) -> OutfitOccurrence:
-    latest_outfit = _latest_outfit(db, user_id)
-    if not latest_outfit:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No outfit available to plan. Request a recommendation first.",
-        )
+def _outfit_created_after(db: Session, user_id: int, outfit_id: int) -> Optional[Outfit]:
+    # Compared against the stored value, so SQLite's second-resolution text timestamps match exactly.
+    planned_at = select(Outfit.created_at).where(Outfit.id == outfit_id).scalar_subquery()
+    return db.scalar(
+        select(Outfit)
+        .where(Outfit.user_id == user_id, Outfit.created_at > planned_at)
+        .order_by(Outfit.created_at.desc(), Outfit.id.desc())
+        .limit(1)
+    )
+
 
+def plan_outfit_for_date(db: Session, user_id: int, target_date: date) -> OutfitOccurrence:
     occurrence = (
         _occurrence_query(db, user_id)
         .filter(OutfitOccurrence.date == target_date)
         .first()
     )
+    # An outfit generated for this very day (precomputed or range-planned) is kept without another
+    # write, unless the user has created an outfit since, e.g. asked for a fresh recommendation.
+    if (
+        occurrence
+        and occurrence.status == OutfitStatus.PLANNED
+        and occurrence.outfit
+        and occurrence.outfit.date == target_date
+    ):
+        latest_outfit = _outfit_created_after(db, user_id, occurrence.outfit_id)
+        if latest_outfit is None:
+            return occurrence
+    else:
+        latest_outfit = _latest_outfit(db, user_id)
+    if not latest_outfit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No outfit available to plan. Request a recommendation first.",
+        )
 
     if not occurrence:
         occurrence = OutfitOccurrence(
@@ -75,10 +119,13 @@ def plan_outfit_for_date(db: Session, user_id: int, target_date: date) -> Outfit
         )
         db.add(occurrence)
     else:
+        if occurrence.outfit and is_rejection(occurrence.status, occurrence.negative_reason):
+            record_rejection_change(db, user_id, occurrence.outfit.item_ids, was=True, now=False)
         occurrence.outfit_id = latest_outfit.id
         occurrence.status = OutfitStatus.PLANNED
         occurrence.negative_reason = None
 
+    bump_revision(db, user_id)
     db.commit()
     db.refresh(occurrence)
     occurrence.outfit = latest_outfit
@@ -90,6 +137,117 @@ def plan_tomorrow(db: Session, user_id: int) -> OutfitOccurrence:
     return plan_outfit_for_date(db, user_id, tomorrow)
 
 
+def plan_outfits_for_range(db: Session, user_id: int, start: date, end: date) -> list[dict]:
+    if end < start or (end - start).days >= MAX_PLAN_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Choose an end date on or after the start date, at most {MAX_PLAN_DAYS} days in total.",
+        )
+
+    existing = {
+        occurrence.date: occurrence
+        for occurrence in _occurrence_query(db, user_id).filter(
+            OutfitOccurrence.date >= start,
+            OutfitOccurrence.date <= end,
+        )
+    }
+    # Days already confirmed worn keep their history; skipped days are planned again.
+    days = [
+        day
+        for day in (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+        if day not in existing
+        or existing[day].status != OutfitStatus.WORN
+        or existing[day].negative_reason is not None
+    ]
+    if not days:
+        return []
+
+    plan = plan_outfit_sequence(db, user_id, days)
+    now = datetime.now(timezone.utc)
+
+    outfit_rows = db.execute(
+        insert(Outfit).returning(Outfit.id, Outfit.created_at, sort_by_parameter_order=True),
+        [
+            {"user_id": user_id, "date": day, "item_ids": ranked.item_ids, "feedback": OutfitFeedback.NONE}
+            for day, ranked in zip(days, plan)
+        ],
+    ).all()
+    db.execute(
+        insert(OutfitItem),
+        [
+            {"outfit_id": row.id, "item_id": item_id, "position": position}
+            for row, ranked in zip(outfit_rows, plan)
+            for position, item_id in enumerate(ranked.item_ids)
+        ],
+    )
+    record_outfits_usage(db, user_id, [(ranked.item_ids, now) for ranked in plan])
+
+    replanned = [day for day in days if day in existing]
+    fresh = [day for day in days if day not in existing]
+    outfit_by_day = {day: row for day, row in zip(days, outfit_rows)}
+    for day in replanned:
+        occurrence = existing[day]
+        if occurrence.outfit and is_rejection(occurrence.status, occurrence.negative_reason):
+            record_rejection_change(db, user_id, occurrence.outfit.item_ids, was=True, now=False)
+    if replanned:
+        db.execute(
+            update(OutfitOccurrence),
+            [
+                {
+                    "id": existing[day].id,
+                    "outfit_id": outfit_by_day[day].id,
+                    "status": OutfitStatus.PLANNED,
+                    "negative_reason": None,
+                }
+                for day in replanned
+            ],
+        )
+    occurrence_rows = {day: (existing[day].id, existing[day].created_at) for day in replanned}
+    if fresh:
+        inserted = db.execute(
+            insert(OutfitOccurrence).returning(
+                OutfitOccurrence.id, OutfitOccurrence.created_at, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "user_id": user_id,
+                    "date": day,
+                    "outfit_id": outfit_by_day[day].id,
+                    "status": OutfitStatus.PLANNED,
+                }
+                for day in fresh
+            ],
+        ).all()
+        occurrence_rows.update({day: (row.id, row.created_at) for day, row in zip(fresh, inserted)})
+    bump_revision(db, user_id)
+    db.commit()
+
+    occurrences = []
+    for day, ranked in zip(days, plan):
+        occurrence_id, occurrence_created_at = occurrence_rows[day]
+        outfit_row = outfit_by_day[day]
+        occurrences.append(
+            {
+                "id": occurrence_id,
+                "user_id": user_id,
+                "date": day,
+                "outfit_id": outfit_row.id,
+                "status": OutfitStatus.PLANNED,
+                "negative_reason": None,
+                "created_at": occurrence_created_at,
+                "outfit": {
+                    "id": outfit_row.id,
+                    "date": day,
+                    "item_ids": ranked.item_ids,
+                    "feedback": OutfitFeedback.NONE,
+                    "created_at": outfit_row.created_at,
+                    "reason": ranked.reason,
+                },
+            }
+        )
+    return occurrences
+
+
 def confirm_worn(
     db: Session,
     user_id: int,
@@ -114,9 +272,16 @@ def confirm_worn(
             detail="Please choose a reason if you skipped this outfit.",
         )
 
+    was_rejected = is_rejection(occurrence.status, occurrence.negative_reason)
     occurrence.status = OutfitStatus.WORN
     occurrence.negative_reason = negative_reason if not worn else None
+    if occurrence.outfit:
+        if worn:
+            record_worn(db, user_id, occurrence.outfit.item_ids, target_date)
+        rejected = is_rejection(occurrence.status, occurrence.negative_reason)
+        record_rejection_change(db, user_id, occurrence.outfit.item_ids, was_rejected, rejected)
 
+    bump_revision(db, user_id)
     db.commit()
     db.refresh(occurrence)
     return occurrence
@@ -0,0 +1,120 @@
+from datetime import date
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from app.models.enums import ColorFamily, Season
+
+COLOR_FAMILIES = tuple(ColorFamily)
+SEASONS = tuple(Season)
+COLOR_INDEX = {color: idx for idx, color in enumerate(COLOR_FAMILIES)}
+SEASON_INDEX = {season: idx for idx, season in enumerate(SEASONS)}
+
+_NEUTRALS = np.array(
+    [color in {ColorFamily.BLACK, ColorFamily.WHITE, ColorFamily.GREY, ColorFamily.BEIGE} for color in COLOR_FAMILIES]
+)
+# Neutral colors and same-family pairs go with anything; two different accent colors clash.
+COLOR_HARMONY = np.where(
+    _NEUTRALS[:, None] | _NEUTRALS[None, :] | np.eye(len(COLOR_FAMILIES), dtype=bool), 0.0, -1.0
+)
+
+# Rows: item season. Columns: season context of the day being dressed for.
+_SEASON_FIT = {
+    Season.ALL_SEASON: {Season.ALL_SEASON: 0.5, Season.WARM: 0.5, Season.COLD: 0.5, Season.RAIN: 0.5},
+    Season.WARM: {Season.ALL_SEASON: 0.5, Season.WARM: 1.0, Season.COLD: -1.0, Season.RAIN: 0.0},
+    Season.COLD: {Season.ALL_SEASON: 0.5, Season.WARM: -1.0, Season.COLD: 1.0, Season.RAIN: 0.5},
+    Season.RAIN: {Season.ALL_SEASON: 0.25, Season.WARM: 0.25, Season.COLD: 0.25, Season.RAIN: 1.0},
+}
+SEASON_FIT = np.array([[_SEASON_FIT[item][context] for context in SEASONS] for item in SEASONS])
+
+_SEASON_BY_MONTH = np.array(
+    [
+        SEASON_INDEX[season]
+        for season in (
+            Season.COLD, Season.COLD, Season.ALL_SEASON, Season.ALL_SEASON, Season.ALL_SEASON, Season.WARM,
+            Season.WARM, Season.WARM, Season.ALL_SEASON, Season.ALL_SEASON, Season.ALL_SEASON, Season.COLD,
+        )
+    ]
+)
+
+
+def season_context(day: date) -> int:
+    return int(_SEASON_BY_MONTH[day.month - 1])
+
+
+class CompatibilityTables:
+    # Lookup tables indexed by enum ordinal. Blocked cells are left out of recommendations
+    # whenever the wardrobe has any other option.
+    __slots__ = ("color_harmony", "color_blocked", "season_fit", "season_blocked")
+
+    def __init__(
+        self,
+        color_harmony: np.ndarray,
+        color_blocked: np.ndarray,
+        season_fit: np.ndarray,
+        season_blocked: np.ndarray,
+    ):
+        self.color_harmony = color_harmony
+        self.color_blocked = color_blocked
+        self.season_fit = season_fit
+        self.season_blocked = season_blocked
+        for table in (color_harmony, color_blocked, season_fit, season_blocked):
+            table.setflags(write=False)
+
+
+# A fully mismatched season (a cold-weather coat on a warm day) is blocked by default.
+DEFAULT_TABLES = CompatibilityTables(
+    COLOR_HARMONY,
+    np.zeros(COLOR_HARMONY.shape, dtype=bool),
+    SEASON_FIT,
+    SEASON_FIT <= -1.0,
+)
+
+ColorOverride = tuple[ColorFamily, ColorFamily, Optional[float]]
+SeasonOverride = tuple[Season, Season, Optional[float]]
+
+
+def _override_key(preferences: Optional[Mapping[str, Any]]) -> tuple[tuple[ColorOverride, ...], tuple[SeasonOverride, ...]]:
+    # Preferences were validated on the way in; anything unreadable (older rows) is ignored.
+    preferences = preferences or {}
+    colors: list[ColorOverride] = []
+    for entry in preferences.get("color_overrides") or ():
+        try:
+            first, second = (ColorFamily(color) for color in entry["colors"])
+            colors.append((first, second, entry.get("score")))
+        except (KeyError, TypeError, ValueError):
+            continue
+    seasons: list[SeasonOverride] = []
+    for entry in preferences.get("season_overrides") or ():
+        try:
+            seasons.append((Season(entry["item"]), Season(entry["context"]), entry.get("score")))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return tuple(colors), tuple(seasons)
+
+
+@lru_cache(maxsize=256)
+def _build_tables(colors: tuple[ColorOverride, ...], seasons: tuple[SeasonOverride, ...]) -> CompatibilityTables:
+    color_harmony = DEFAULT_TABLES.color_harmony.copy()
+    color_blocked = DEFAULT_TABLES.color_blocked.copy()
+    for first, second, score in colors:
+        for a, b in ((first, second), (second, first)):
+            cell = (COLOR_INDEX[a], COLOR_INDEX[b])
+            color_blocked[cell] = score is None
+            color_harmony[cell] = -1.0 if score is None else score
+
+    season_fit = DEFAULT_TABLES.season_fit.copy()
+    season_blocked = DEFAULT_TABLES.season_blocked.copy()
+    for item, context, score in seasons:
+        cell = (SEASON_INDEX[item], SEASON_INDEX[context])
+        season_blocked[cell] = score is None
+        season_fit[cell] = -1.0 if score is None else score
+    return CompatibilityTables(color_harmony, color_blocked, season_fit, season_blocked)
+
+
+def tables_for(preferences: Optional[Mapping[str, Any]]) -> CompatibilityTables:
+    colors, seasons = _override_key(preferences)
+    if not colors and not seasons:
+        return DEFAULT_TABLES
+    return _build_tables(colors, seasons)
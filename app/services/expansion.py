@@ -0,0 +1,116 @@
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.models.clothing_item import ClothingItem
+from app.models.outfit import Outfit
+from app.schemas.clothing_item import ClothingItemResponse
+from app.schemas.outfit import OutfitResponse
+from app.utils.fast_json import response_columns, response_fields, row_dicts
+
+EXPAND_ITEMS = "items"
+OUTFIT_FIELDS = response_fields(OutfitResponse)
+ITEM_FIELDS = response_fields(ClothingItemResponse)
+# Result sets this large are turned into payload dicts in the threadpool, off the event loop.
+THREADPOOL_MIN_ROWS = 500
+
+T = TypeVar("T")
+
+
+class Fieldset(NamedTuple):
+    outfit: list[str]
+    items: list[str]
+
+
+def parse_fieldset(fields: Optional[str], expand_items: bool) -> Fieldset:
+    # fields=id,date,items.name: bare names pick outfit fields, items.<name> the embedded items'.
+    # A part with no names keeps every field; the schema's field order is kept either way.
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    item_names = {name.removeprefix("items.") for name in requested if name.startswith("items.")}
+    outfit_names = {name for name in requested if not name.startswith("items.")} - {EXPAND_ITEMS}
+    unknown = sorted(outfit_names - set(OUTFIT_FIELDS)) + sorted(
+        f"items.{name}" for name in item_names - set(ITEM_FIELDS)
+    )
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown)}.")
+    if not expand_items and (item_names or EXPAND_ITEMS in requested):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Item fields need expand=items.")
+    return Fieldset(
+        [name for name in OUTFIT_FIELDS if name in outfit_names] or OUTFIT_FIELDS,
+        [name for name in ITEM_FIELDS if name in item_names] or ITEM_FIELDS,
+    )
+
+
+def outfit_columns(fieldset: Fieldset) -> tuple[list[str], list]:
+    # The requested columns plus id (the page cursor) and item_ids (expansion), in schema order.
+    selected = set(fieldset.outfit) | {"id", "item_ids"}
+    exclude = [name for name in OUTFIT_FIELDS if name not in selected]
+    return [name for name in OUTFIT_FIELDS if name in selected], response_columns(OutfitResponse, Outfit, exclude)
+
+
+def _item_query(user_id: int, ids: Iterable[int], fields: Sequence[str]) -> Select:
+    exclude = [name for name in ITEM_FIELDS if name not in fields]
+    return select(
+        ClothingItem.id.label("embedded_id"), *response_columns(ClothingItemResponse, ClothingItem, exclude)
+    ).where(ClothingItem.user_id == user_id, ClothingItem.id.in_(ids))
+
+
+def _item_ids(outfits: Sequence[dict]) -> set[int]:
+    return {item_id for outfit in outfits for item_id in outfit["item_ids"]}
+
+
+def _attach_items(outfits: Sequence[dict], rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> None:
+    items = {row[0]: dict(zip(fields, row[1:])) for row in rows}
+    for outfit in outfits:
+        outfit[EXPAND_ITEMS] = [items[item_id] for item_id in outfit["item_ids"] if item_id in items]
+
+
+def embed_items(db: Session, user_id: int, outfits: Sequence[dict], fields: Sequence[str] = ITEM_FIELDS) -> None:
+    # Every outfit's items from one IN query, in item_ids order, instead of one
+    # GET /wardrobe/items/{id} per item.
+    ids = _item_ids(outfits)
+    _attach_items(outfits, db.execute(_item_query(user_id, ids, fields)) if ids else (), fields)
+
+
+def _hide_fields(outfits: list[dict], names: Sequence[str], fieldset: Fieldset) -> list[dict]:
+    hidden = [name for name in names if name not in fieldset.outfit]
+    for outfit in outfits:
+        for name in hidden:
+            del outfit[name]
+    return outfits
+
+
+def _outfit_dicts(
+    names: Sequence[str], rows: Sequence[Any], fieldset: Fieldset, expand_items: bool
+) -> tuple[list[dict], set[int]]:
+    outfits = row_dicts(names, rows)
+    if not expand_items:
+        return _hide_fields(outfits, names, fieldset), set()
+    return outfits, _item_ids(outfits)
+
+
+def _expanded(outfits: list[dict], item_rows: Sequence[Any], names: Sequence[str], fieldset: Fieldset) -> list[dict]:
+    _attach_items(outfits, item_rows, fieldset.items)
+    return _hide_fields(outfits, names, fieldset)
+
+
+async def outfit_payloads(
+    db: AsyncSession, user_id: int, names: Sequence[str], rows: Sequence[Any], fieldset: Fieldset, expand_items: bool
+) -> list[dict]:
+    # rows were selected with outfit_columns(fieldset), which returned names. Only the item lookup
+    # uses the connection; the dict building around it grows with the rows, so a large result
+    # (e.g. the whole history) is built in the threadpool.
+    async def build(func: Callable[..., T], *args) -> T:
+        if len(rows) >= THREADPOOL_MIN_ROWS:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    outfits, ids = await build(_outfit_dicts, names, rows, fieldset, expand_items)
+    if not expand_items:
+        return outfits
+    item_rows = (await db.execute(_item_query(user_id, ids, fieldset.items))).all() if ids else []
+    return await build(_expanded, outfits, item_rows, names, fieldset)
@@ -0,0 +1,219 @@
+from datetime import date, datetime
+from itertools import combinations
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, select
+from sqlalchemy.orm import Session
+
+from app.models.clothing_item import ClothingItem
+from app.models.enums import NegativeReason, OutfitFeedback, OutfitStatus
+from app.models.item_pair_feedback import ItemPairFeedback
+from app.models.item_usage import ItemUsage
+from app.models.outfit import Outfit
+from app.models.outfit_occurrence import OutfitOccurrence
+from app.models.user import User
+
+
+FEEDBACK_COUNTERS = {
+    OutfitFeedback.LIKE: "likes",
+    OutfitFeedback.DISLIKE: "dislikes",
+    OutfitFeedback.SKIP: "skips",
+}
+# Skipped-with-reason confirmations that say something about the clothes themselves.
+REJECTION_REASONS = {NegativeReason.DIDNT_LIKE}
+
+
+def _upsert(db: Session, model=ItemUsage):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def _item_pairs(item_ids: Iterable[int]) -> list[tuple[int, int]]:
+    return list(combinations(sorted(set(item_ids)), 2))
+
+
+def is_rejection(status: Optional[OutfitStatus], negative_reason: Optional[NegativeReason]) -> bool:
+    return status == OutfitStatus.WORN and negative_reason in REJECTION_REASONS
+
+
+def record_outfit_usage(db: Session, user_id: int, item_ids: Iterable[int], used_at: datetime) -> None:
+    record_outfits_usage(db, user_id, [(item_ids, used_at)])
+
+
+def record_outfits_usage(db: Session, user_id: int, outfits: Iterable[tuple[Iterable[int], datetime]]) -> None:
+    # Fold several outfits into one row per item so a single upsert covers the whole batch.
+    merged: dict[int, dict] = {}
+    for item_ids, used_at in outfits:
+        for item_id in dict.fromkeys(item_ids):
+            entry = merged.get(item_id)
+            if entry is None:
+                merged[item_id] = {"item_id": item_id, "user_id": user_id, "last_used_at": used_at, "use_count": 1}
+            else:
+                entry["use_count"] += 1
+                entry["last_used_at"] = max(entry["last_used_at"], used_at)
+    if not merged:
+        return
+    stmt = _upsert(db).values(list(merged.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ItemUsage.item_id],
+        set_={
+            "last_used_at": stmt.excluded.last_used_at,
+            "use_count": ItemUsage.use_count + stmt.excluded.use_count,
+        },
+    )
+    db.execute(stmt)
+
+
+def record_worn(db: Session, user_id: int, item_ids: Iterable[int], worn_on: date) -> None:
+    values = [
+        {"item_id": item_id, "user_id": user_id, "last_worn_at": worn_on, "use_count": 0}
+        for item_id in dict.fromkeys(item_ids)
+    ]
+    if not values:
+        return
+    stmt = _upsert(db).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ItemUsage.item_id],
+        set_={
+            "last_worn_at": case(
+                (ItemUsage.last_worn_at.is_(None), stmt.excluded.last_worn_at),
+                (ItemUsage.last_worn_at < stmt.excluded.last_worn_at, stmt.excluded.last_worn_at),
+                else_=ItemUsage.last_worn_at,
+            )
+        },
+    )
+    db.execute(stmt)
+
+
+def _apply_feedback_deltas(db: Session, user_id: int, item_ids: Iterable[int], deltas: dict[str, int]) -> None:
+    # Every row gets the same deltas, so they are bound once in the UPDATE and clamped at zero
+    # for rows that predate the counters.
+    deltas = {counter: delta for counter, delta in deltas.items() if delta}
+    item_ids = list(dict.fromkeys(item_ids))
+    if not deltas or not item_ids:
+        return
+    initial = {counter: max(delta, 0) for counter, delta in deltas.items()}
+
+    targets = (
+        (
+            ItemUsage,
+            [ItemUsage.item_id],
+            [{"item_id": item_id, "user_id": user_id, "use_count": 0, **initial} for item_id in item_ids],
+        ),
+        (
+            ItemPairFeedback,
+            [ItemPairFeedback.item_a, ItemPairFeedback.item_b],
+            [{"item_a": a, "item_b": b, "user_id": user_id, **initial} for a, b in _item_pairs(item_ids)],
+        ),
+    )
+    for model, keys, rows in targets:
+        if not rows:
+            continue
+        stmt = _upsert(db, model).values(rows)
+        set_ = {}
+        for counter, delta in deltas.items():
+            column = getattr(model, counter)
+            set_[counter] = case((column + delta < 0, 0), else_=column + delta)
+        db.execute(stmt.on_conflict_do_update(index_elements=keys, set_=set_))
+
+
+def record_feedback_change(
+    db: Session, user_id: int, item_ids: Iterable[int], old: OutfitFeedback, new: OutfitFeedback
+) -> None:
+    deltas: dict[str, int] = {}
+    if old in FEEDBACK_COUNTERS:
+        deltas[FEEDBACK_COUNTERS[old]] = -1
+    if new in FEEDBACK_COUNTERS:
+        deltas[FEEDBACK_COUNTERS[new]] = deltas.get(FEEDBACK_COUNTERS[new], 0) + 1
+    _apply_feedback_deltas(db, user_id, item_ids, deltas)
+
+
+def record_rejection_change(db: Session, user_id: int, item_ids: Iterable[int], was: bool, now: bool) -> None:
+    _apply_feedback_deltas(db, user_id, item_ids, {"rejections": int(now) - int(was)})
+
+
+def _backfill_user(db: Session, user_id: int) -> int:
+    known_items = set(db.scalars(select(ClothingItem.id).where(ClothingItem.user_id == user_id)))
+    usage: dict[int, dict] = {}
+    pairs: dict[tuple[int, int], dict] = {}
+
+    def usage_entry(item_id: int) -> dict:
+        return usage.setdefault(
+            item_id,
+            {
+                "item_id": item_id,
+                "user_id": user_id,
+                "last_used_at": None,
+                "use_count": 0,
+                "last_worn_at": None,
+                "likes": 0,
+                "dislikes": 0,
+                "skips": 0,
+                "rejections": 0,
+            },
+        )
+
+    def count(item_ids: list[int], counter: str) -> None:
+        for item_id in item_ids:
+            usage_entry(item_id)[counter] += 1
+        for a, b in _item_pairs(item_ids):
+            pair = pairs.setdefault(
+                (a, b),
+                {"item_a": a, "item_b": b, "user_id": user_id, "likes": 0, "dislikes": 0, "skips": 0, "rejections": 0},
+            )
+            pair[counter] += 1
+
+    outfits = db.execute(
+        select(Outfit.item_ids, Outfit.created_at, Outfit.feedback)
+        .where(Outfit.user_id == user_id)
+        .execution_options(yield_per=500)
+    )
+    for item_ids, created_at, feedback in outfits:
+        item_ids = [item_id for item_id in dict.fromkeys(item_ids or []) if item_id in known_items]
+        for item_id in item_ids:
+            entry = usage_entry(item_id)
+            entry["use_count"] += 1
+            if entry["last_used_at"] is None or created_at > entry["last_used_at"]:
+                entry["last_used_at"] = created_at
+        if feedback in FEEDBACK_COUNTERS:
+            count(item_ids, FEEDBACK_COUNTERS[feedback])
+
+    worn = db.execute(
+        select(Outfit.item_ids, OutfitOccurrence.date, OutfitOccurrence.negative_reason)
+        .join(Outfit, OutfitOccurrence.outfit_id == Outfit.id)
+        .where(OutfitOccurrence.user_id == user_id, OutfitOccurrence.status == OutfitStatus.WORN)
+        .execution_options(yield_per=500)
+    )
+    for item_ids, worn_on, negative_reason in worn:
+        item_ids = [item_id for item_id in dict.fromkeys(item_ids or []) if item_id in known_items]
+        if negative_reason is None:
+            for item_id in item_ids:
+                entry = usage_entry(item_id)
+                if entry["last_worn_at"] is None or worn_on > entry["last_worn_at"]:
+                    entry["last_worn_at"] = worn_on
+        elif is_rejection(OutfitStatus.WORN, negative_reason):
+            count(item_ids, "rejections")
+
+    db.execute(delete(ItemUsage).where(ItemUsage.user_id == user_id))
+    db.execute(delete(ItemPairFeedback).where(ItemPairFeedback.user_id == user_id))
+    if usage:
+        db.execute(_upsert(db), list(usage.values()))
+    if pairs:
+        db.execute(_upsert(db, ItemPairFeedback), list(pairs.values()))
+    return len(usage)
+
+
+def backfill_item_usage(db: Session, user_id: Optional[int] = None, commit: bool = True) -> int:
+    # commit=False leaves the transaction to the caller, e.g. a migration step.
+    user_ids = [user_id] if user_id is not None else list(db.scalars(select(User.id).order_by(User.id)))
+    written = 0
+    for uid in user_ids:
+        written += _backfill_user(db, uid)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+    return written
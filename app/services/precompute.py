@@ -0,0 +1,114 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.outfit_occurrence import OutfitOccurrence
+from app.models.user import User
+from app.services.calendar import plan_outfits_for_range
+from app.services.recommender import RecommendationError
+
+logger = logging.getLogger(__name__)
+
+PLANNED = "planned"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+def _plan_ahead_user_ids(db: Session, after_id: int, limit: int) -> list[int]:
+    return list(
+        db.scalars(
+            select(User.id)
+            .where(User.preferences["goal"].as_string() == "plan_ahead", User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+    )
+
+
+def _precompute_user(session_factory: Callable[[], Session], user_id: int, target: date) -> str:
+    with session_factory() as db:
+        # Any existing slot means the user (or an earlier run) already planned this day.
+        already_planned = db.scalar(
+            select(OutfitOccurrence.id).where(OutfitOccurrence.user_id == user_id, OutfitOccurrence.date == target)
+        )
+        if already_planned is not None:
+            return SKIPPED
+        try:
+            plan_outfits_for_range(db, user_id, target, target)
+        except RecommendationError:
+            return SKIPPED
+        except IntegrityError:
+            db.rollback()
+            return SKIPPED
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            logger.exception("Precomputing outfit for user %s failed", user_id)
+            return FAILED
+    return PLANNED
+
+
+def precompute_tomorrow(
+    session_factory: Callable[[], Session],
+    batch_size: int,
+    concurrency: int,
+    target: Optional[date] = None,
+) -> dict[str, int]:
+    target = target or date.today() + timedelta(days=1)
+    counts = {PLANNED: 0, SKIPPED: 0, FAILED: 0}
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="precompute") as pool:
+        while True:
+            with session_factory() as db:
+                user_ids = _plan_ahead_user_ids(db, last_id, batch_size)
+            if not user_ids:
+                break
+            for outcome in pool.map(lambda user_id: _precompute_user(session_factory, user_id, target), user_ids):
+                counts[outcome] += 1
+            last_id = user_ids[-1]
+    logger.info("Precomputed outfits for %s: %s", target.isoformat(), counts)
+    return counts
+
+
+class PrecomputeScheduler:
+    def __init__(self, session_factory: Callable[[], Session]):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.hour_utc = settings.precompute_hour_utc
+        self.batch_size = settings.precompute_batch_size
+        self.concurrency = settings.precompute_concurrency
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def seconds_until_next_run(self, now: datetime) -> float:
+        next_run = now.replace(hour=self.hour_utc, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.seconds_until_next_run(datetime.now(timezone.utc))):
+            try:
+                precompute_tomorrow(self.session_factory, self.batch_size, self.concurrency)
+            except Exception:  # noqa: BLE001
+                logger.exception("Scheduled outfit precomputation failed")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="precompute-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Outfit precomputation scheduled daily at %02d:00 UTC", self.hour_utc)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
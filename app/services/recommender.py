@@ -1,11 +1,38 @@
-from datetime import date, datetime
-from typing import List, Optional, Sequence
+from datetime import date, datetime, time, timezone
+from typing import Collection, List, Optional
 
+import numpy as np
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.models.clothing_item import ClothingItem
 from app.models.enums import ClothingCategory, OutfitFeedback
+from app.models.item_pair_feedback import ItemPairFeedback
+from app.models.item_usage import ItemUsage
 from app.models.outfit import Outfit
+from app.models.outfit_item import OutfitItem
+from app.models.user import User
+from app.services.compatibility import tables_for
+from app.services.item_usage import record_outfit_usage
+from app.services.revisions import bump_revision
+from app.services.scoring import (
+    SKIPPED,
+    CategoryFeatures,
+    Slot,
+    UsageFeatures,
+    category_features,
+    feedback_signal,
+    item_scores,
+    pair_penalty,
+    pick_diverse,
+    search_outfits,
+    season_allowed,
+    season_context,
+    shortlist_ids,
+)
+from app.services.wardrobe_cache import load_wardrobe_snapshot
+
+
+DIVERSITY_POOL_FACTOR = 4
 
 
 class RecommendationError(Exception):
@@ -14,120 +41,243 @@ class RecommendationError(Exception):
         super().__init__("Missing required wardrobe items.")
 
 
-def _items_for_category(db: Session, user_id: int, category: ClothingCategory) -> List[ClothingItem]:
-    return (
-        db.query(ClothingItem)
-        .filter(ClothingItem.user_id == user_id, ClothingItem.category == category)
-        .order_by(ClothingItem.created_at.asc())
-        .all()
+def _usage_by_item(db: Session, user_id: int) -> tuple[dict[int, datetime], dict[int, tuple[float, float]]]:
+    last_used: dict[int, datetime] = {}
+    feedback: dict[int, tuple[float, float]] = {}
+    rows = db.execute(
+        select(
+            ItemUsage.item_id,
+            ItemUsage.last_used_at,
+            ItemUsage.likes,
+            ItemUsage.dislikes,
+            ItemUsage.skips,
+            ItemUsage.rejections,
+        ).where(ItemUsage.user_id == user_id)
     )
+    for item_id, last_used_at, likes, dislikes, skips, rejections in rows:
+        if last_used_at is not None:
+            last_used[item_id] = last_used_at
+        if likes or dislikes or skips or rejections:
+            feedback[item_id] = feedback_signal(likes, dislikes, skips, rejections)
+    return last_used, feedback
 
 
-def generate_outfit_recommendation(db: Session, user_id: int) -> Outfit:
-    outfits: Sequence[Outfit] = (
-        db.query(Outfit).filter(Outfit.user_id == user_id).order_by(Outfit.created_at.desc()).all()
+def _pair_penalties(db: Session, item_ids: Collection[int]) -> dict[tuple[int, int], float]:
+    # Only pairs within item_ids, so the rows read are bounded by the shortlists, not by history.
+    # The ids come from the user's own wardrobe; filtering on them alone lets the primary key
+    # serve the lookup instead of the user_id index, which walks every pair the user has.
+    ids = sorted(item_ids)
+    rows = db.execute(
+        select(
+            ItemPairFeedback.item_a,
+            ItemPairFeedback.item_b,
+            ItemPairFeedback.likes,
+            ItemPairFeedback.dislikes,
+            ItemPairFeedback.skips,
+            ItemPairFeedback.rejections,
+        ).where(
+            ItemPairFeedback.item_a.in_(ids),
+            ItemPairFeedback.item_b.in_(ids),
+            (ItemPairFeedback.dislikes + ItemPairFeedback.skips + ItemPairFeedback.rejections) > 0,
+        )
     )
-    last_outfit: Optional[Outfit] = outfits[0] if outfits else None
+    return {(row[0], row[1]): pair_penalty(*row[2:]) for row in rows}
 
-    last_used: dict[int, datetime] = {}
-    for outfit in outfits:
-        for item_id in outfit.item_ids:
-            if item_id not in last_used:
-                last_used[item_id] = outfit.created_at
-
-    def sorted_candidates(category: ClothingCategory) -> List[ClothingItem]:
-        candidates = _items_for_category(db, user_id, category)
-        candidates.sort(
-            key=lambda item: (
-                0 if item.id not in last_used else 1,
-                last_used.get(item.id) or datetime.min,
-            )
-        )
-        return candidates
 
-    selected: List[ClothingItem] = []
-    category_options: dict[ClothingCategory, List[ClothingItem]] = {}
+def _latest_outfit(db: Session, user_id: int) -> Optional[Outfit]:
+    return (
+        db.query(Outfit)
+        .filter(Outfit.user_id == user_id)
+        .order_by(Outfit.created_at.desc(), Outfit.id.desc())
+        .first()
+    )
 
-    footwear_options = sorted_candidates(ClothingCategory.FOOTWEAR)
-    one_piece_options = sorted_candidates(ClothingCategory.ONE_PIECE)
-    top_options = sorted_candidates(ClothingCategory.TOP)
-    bottom_options = sorted_candidates(ClothingCategory.BOTTOM)
-    outerwear_options = sorted_candidates(ClothingCategory.OUTERWEAR)
-    missing: List[str] = []
 
-    if not footwear_options:
+class RankedOutfit:
+    __slots__ = ("item_ids", "score", "reason")
+
+    def __init__(self, item_ids: List[int], score: float, reason: str):
+        self.item_ids = item_ids
+        self.score = score
+        self.reason = reason
+
+
+def _outfit_structures(features: dict[ClothingCategory, CategoryFeatures]) -> List[List[ClothingCategory]]:
+    missing: List[str] = []
+    if not len(features[ClothingCategory.FOOTWEAR]):
         missing.append(ClothingCategory.FOOTWEAR.value)
 
-    separates_ready = bool(top_options) and bool(bottom_options)
-    one_piece_ready = bool(one_piece_options)
+    separates_ready = bool(len(features[ClothingCategory.TOP])) and bool(len(features[ClothingCategory.BOTTOM]))
+    one_piece_ready = bool(len(features[ClothingCategory.ONE_PIECE]))
 
+    structures: List[List[ClothingCategory]] = []
     if separates_ready:
-        category_options[ClothingCategory.TOP] = top_options
-        category_options[ClothingCategory.BOTTOM] = bottom_options
-        selected.extend([top_options[0], bottom_options[0]])
-    elif one_piece_ready:
-        category_options[ClothingCategory.ONE_PIECE] = one_piece_options
-        selected.append(one_piece_options[0])
-    else:
-        if not one_piece_ready:
-            missing.append(ClothingCategory.ONE_PIECE.value)
-        if not separates_ready:
-            if not top_options:
-                missing.append(ClothingCategory.TOP.value)
-            if not bottom_options:
-                missing.append(ClothingCategory.BOTTOM.value)
-
-    if footwear_options:
-        category_options[ClothingCategory.FOOTWEAR] = footwear_options
-        selected.append(footwear_options[0])
-
-    if outerwear_options:
-        category_options[ClothingCategory.OUTERWEAR] = outerwear_options
-        selected.append(outerwear_options[0])
+        structures.append([ClothingCategory.TOP, ClothingCategory.BOTTOM])
+    if one_piece_ready:
+        structures.append([ClothingCategory.ONE_PIECE])
+    if not structures:
+        missing.append(ClothingCategory.ONE_PIECE.value)
+        if not len(features[ClothingCategory.TOP]):
+            missing.append(ClothingCategory.TOP.value)
+        if not len(features[ClothingCategory.BOTTOM]):
+            missing.append(ClothingCategory.BOTTOM.value)
 
     if missing:
         raise RecommendationError(sorted(set(missing)))
 
-    def current_item_ids(items: List[ClothingItem]) -> List[int]:
-        return [item.id for item in items]
-
-    # Avoid repeating the most recent outfit when alternatives exist
-    if last_outfit:
-        last_ids = set(last_outfit.item_ids)
-        if set(current_item_ids(selected)) == last_ids:
-            for cat, options in category_options.items():
-                if len(options) > 1:
-                    selected_copy = selected.copy()
-                    for idx, item in enumerate(selected_copy):
-                        if item.category == cat:
-                            selected_copy[idx] = options[1]
-                            break
-                    if set(current_item_ids(selected_copy)) != last_ids:
-                        selected = selected_copy
-                        break
-
-    item_ids = current_item_ids(selected)
+    for structure in structures:
+        structure.append(ClothingCategory.FOOTWEAR)
+        if len(features[ClothingCategory.OUTERWEAR]):
+            structure.append(ClothingCategory.OUTERWEAR)
+    return structures
+
+
+def _reason(categories: List[ClothingCategory], item_ids: List[int], last_ids: Optional[set[int]], rank: int) -> str:
+    core_mix = "one-piece + footwear" if ClothingCategory.ONE_PIECE in categories else "top + bottom + footwear"
+    applied_rules: List[str] = [
+        f"kept required mix ({core_mix})",
+        "favoured least-recently-worn, well-liked items that suit the season and each other",
+    ]
+    if last_ids is not None and set(item_ids) != last_ids:
+        applied_rules.append("avoided repeating your last outfit")
+    elif last_ids is not None:
+        applied_rules.append("no alternative to avoid last outfit")
+    if rank > 1:
+        applied_rules.append(f"varied it from the {rank - 1} higher-ranked option{'s' if rank > 2 else ''}")
+
+    return f"Selected items because we {' and '.join(applied_rules)}."
+
+
+class _RecommendationInputs:
+    __slots__ = ("db", "features", "structures", "usage", "pair_ids", "pairs", "tables", "last_ids")
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        # Usually already in the session from the auth lookup, so this costs no query.
+        user = db.get(User, user_id)
+        snapshot = load_wardrobe_snapshot(db, user_id, user.wardrobe_revision if user else 0)
+        self.features = {
+            category: category_features(snapshot, category)
+            for category in (
+                ClothingCategory.TOP,
+                ClothingCategory.BOTTOM,
+                ClothingCategory.ONE_PIECE,
+                ClothingCategory.FOOTWEAR,
+                ClothingCategory.OUTERWEAR,
+            )
+        }
+        self.structures = _outfit_structures(self.features)
+        self.usage = UsageFeatures(*_usage_by_item(db, user_id))
+        self.pair_ids: set[int] = set()
+        self.pairs: dict[tuple[int, int], float] = {}
+        self.tables = tables_for(user.preferences if user else None)
+        last_outfit: Optional[Outfit] = _latest_outfit(db, user_id)
+        self.last_ids = set(last_outfit.item_ids) if last_outfit else None
+
+    def pair_penalties(self, item_ids: Collection[int]) -> dict[tuple[int, int], float]:
+        # Reloaded only when the shortlists bring in new items, e.g. on later days of a plan.
+        if not self.pair_ids.issuperset(item_ids):
+            self.pair_ids.update(item_ids)
+            self.pairs = _pair_penalties(self.db, self.pair_ids)
+        return self.pairs
+
+
+def _rank(
+    inputs: _RecommendationInputs,
+    usage: UsageFeatures,
+    now: datetime,
+    day: date,
+    k: int,
+    avoid: List[set[int]],
+) -> List[RankedOutfit]:
+    season = season_context(day)
+    features = inputs.features
+    tables = inputs.tables
+    scores = {category: item_scores(features[category], usage, now, season, tables) for category in features}
+
+    pool_size = k * DIVERSITY_POOL_FACTOR + len(avoid)
+    width = max(len(structure) for structure in inputs.structures)
+    structure_slots = [
+        # A one-piece fills both the top and the bottom slot, so it carries their combined weight.
+        [
+            Slot(
+                features[category],
+                scores[category],
+                weight=2.0 if category == ClothingCategory.ONE_PIECE else 1.0,
+                optional=category == ClothingCategory.OUTERWEAR,
+                allowed=season_allowed(features[category], season, tables),
+            )
+            for category in structure
+        ]
+        for structure in inputs.structures
+    ]
+    pair_penalties = inputs.pair_penalties(set().union(*(shortlist_ids(slots) for slots in structure_slots)))
+
+    pools, pool_scores, pool_structures = [], [], []
+    for index, slots in enumerate(structure_slots):
+        item_ids, totals = search_outfits(slots, pool_size, pair_penalties=pair_penalties, tables=tables)
+        pools.append(np.pad(item_ids, ((0, 0), (0, width - item_ids.shape[1])), constant_values=SKIPPED))
+        pool_scores.append(totals)
+        pool_structures.append(np.full(len(totals), index))
+
+    candidates = np.concatenate(pools)
+    candidate_scores = np.concatenate(pool_scores)
+    candidate_structures = np.concatenate(pool_structures)
+    picks = pick_diverse(candidates, candidate_scores, k, avoid=avoid)
+
+    last_ids = avoid[-1] if avoid else None
+    ranked: List[RankedOutfit] = []
+    for rank, pick in enumerate(picks, start=1):
+        item_ids = [int(item_id) for item_id in candidates[pick] if item_id != SKIPPED]
+        categories = inputs.structures[candidate_structures[pick]]
+        ranked.append(
+            RankedOutfit(item_ids, float(candidate_scores[pick]), _reason(categories, item_ids, last_ids, rank))
+        )
+    return ranked
+
+
+def rank_outfit_recommendations(db: Session, user_id: int, k: int = 1) -> List[RankedOutfit]:
+    inputs = _RecommendationInputs(db, user_id)
+    now = datetime.now(timezone.utc)
+    avoid = [inputs.last_ids] if inputs.last_ids else []
+    return _rank(inputs, inputs.usage, now, now.date(), k, avoid)
 
+
+def plan_outfit_sequence(db: Session, user_id: int, days: List[date]) -> List[RankedOutfit]:
+    # One outfit per day, never repeating an outfit in the sequence. Each day's picks are treated
+    # as used from that day on, so later days rotate through the rest of the wardrobe.
+    inputs = _RecommendationInputs(db, user_id)
+    now = datetime.now(timezone.utc)
+    usage = inputs.usage
+    avoid = [inputs.last_ids] if inputs.last_ids else []
+    plan: List[RankedOutfit] = []
+    for day in days:
+        when = max(now, datetime.combine(day, time.min, tzinfo=timezone.utc))
+        best = _rank(inputs, usage, when, day, 1, avoid)[0]
+        usage = usage.mark_used(best.item_ids, when)
+        avoid.append(set(best.item_ids))
+        plan.append(best)
+    return plan
+
+
+def generate_outfit_recommendation(db: Session, user_id: int) -> Outfit:
+    best = rank_outfit_recommendations(db, user_id, k=1)[0]
+    outfit = save_outfit(db, user_id, best.item_ids)
+    setattr(outfit, "reason", best.reason)
+    return outfit
+
+
+def save_outfit(db: Session, user_id: int, item_ids: List[int]) -> Outfit:
     outfit = Outfit(
         user_id=user_id,
         date=date.today(),
         item_ids=item_ids,
         feedback=OutfitFeedback.NONE,
+        items=[OutfitItem(item_id=item_id, position=position) for position, item_id in enumerate(item_ids)],
     )
     db.add(outfit)
+    record_outfit_usage(db, user_id, item_ids, datetime.now(timezone.utc))
+    bump_revision(db, user_id)
     db.commit()
     db.refresh(outfit)
-
-    core_mix = "one-piece + footwear" if any(
-        item.category == ClothingCategory.ONE_PIECE for item in selected
-    ) else "top + bottom + footwear"
-    applied_rules: List[str] = [f"kept required mix ({core_mix})", "used least-recently-worn items per category"]
-    if last_outfit and set(item_ids) != set(last_outfit.item_ids):
-        applied_rules.append("avoided repeating your last outfit")
-    elif last_outfit:
-        applied_rules.append("no alternative to avoid last outfit")
-
-    reason = f"Selected items because we {' and '.join(applied_rules)}."
-    setattr(outfit, "reason", reason)
-
     return outfit
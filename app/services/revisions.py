@@ -0,0 +1,18 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+
+def bump_revision(db: Session, user_id: int, wardrobe: bool = False) -> None:
+    # Runs in the caller's transaction, so the new revision commits (or rolls back) with the change.
+    # wardrobe=True is for changes to the items themselves, which cached wardrobe snapshots are keyed on.
+    values = {"data_revision": User.data_revision + 1}
+    if wardrobe:
+        values["wardrobe_revision"] = User.wardrobe_revision + 1
+    db.execute(update(User).where(User.id == user_id).values(**values))
+
+
+def bump_catalog_revision(db: Session, user_id: int) -> None:
+    # Cached catalogs built from an older revision are rebuilt on next use (load_user_catalog).
+    db.execute(update(User).where(User.id == user_id).values(catalog_revision=User.catalog_revision + 1))
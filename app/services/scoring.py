@@ -0,0 +1,298 @@
+from datetime import datetime, timezone
+from typing import Collection, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.models.enums import ClothingCategory
+from app.services.compatibility import (  # noqa: F401
+    COLOR_FAMILIES,
+    COLOR_HARMONY,
+    COLOR_INDEX,
+    DEFAULT_TABLES,
+    SEASON_FIT,
+    SEASON_INDEX,
+    SEASONS,
+    CompatibilityTables,
+    season_context,
+)
+from app.services.wardrobe_cache import WardrobeEntry, WardrobeSnapshot
+
+RECENCY_SCALE_DAYS = 14.0
+RECENCY_WEIGHT = 1.0
+FEEDBACK_WEIGHT = 0.5
+SEASON_WEIGHT = 0.5
+COLOR_WEIGHT = 0.3
+DIVERSITY_WEIGHT = 0.5
+SKIP_FEEDBACK_WEIGHT = 0.25  # a skip is a much weaker signal than a dislike
+PAIR_WEIGHT = 0.5
+SHORTLIST_SIZE = 16
+BEAM_WIDTH = 128
+SKIPPED = 0  # item id placeholder for an optional slot left empty
+
+# Color index of an empty optional slot: the zero row/column padded onto the harmony table.
+_NO_COLOR = len(COLOR_FAMILIES)
+# Added per blocked color pair: enough to sink any outfit that has an alternative.
+BLOCKED_PENALTY = 100.0
+
+
+def feedback_signal(likes: int, dislikes: int, skips: int, rejections: int) -> tuple[float, float]:
+    # (positive, negative) evidence from the stored counters.
+    return float(likes), dislikes + rejections + SKIP_FEEDBACK_WEIGHT * skips
+
+
+def pair_penalty(likes: int, dislikes: int, skips: int, rejections: int) -> float:
+    # Liked pairs are not rewarded; a pairing is only ever marked down.
+    positive, negative = feedback_signal(likes, dislikes, skips, rejections)
+    return PAIR_WEIGHT * negative / (positive + negative + 1.0)
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return np.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class CategoryFeatures:
+    __slots__ = ("entries", "ids", "colors", "seasons")
+
+    def __init__(self, entries: Sequence[WardrobeEntry]):
+        self.entries = entries
+        self.ids = np.fromiter((entry.id for entry in entries), dtype=np.int64, count=len(entries))
+        self.colors = np.fromiter((COLOR_INDEX[entry.color_family] for entry in entries), dtype=np.intp, count=len(entries))
+        self.seasons = np.fromiter((SEASON_INDEX[entry.season] for entry in entries), dtype=np.intp, count=len(entries))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def category_features(snapshot: WardrobeSnapshot, category: ClothingCategory) -> CategoryFeatures:
+    # Static per-item arrays only depend on the snapshot, so they live as long as it does.
+    if snapshot.features is None:
+        snapshot.features = {}
+    features = snapshot.features.get(category)
+    if features is None:
+        features = CategoryFeatures(snapshot.items_for(category))
+        snapshot.features[category] = features
+    return features
+
+
+class UsageFeatures:
+    __slots__ = ("ids", "last_used", "likes", "dislikes")
+
+    def __init__(
+        self,
+        last_used: Mapping[int, Optional[datetime]],
+        feedback_counts: Mapping[int, tuple[float, float]],
+    ):
+        keys = list(last_used.keys() | feedback_counts.keys())
+        ids = np.fromiter(keys, dtype=np.int64, count=len(keys))
+        order = np.argsort(ids)
+        no_feedback = (0, 0)
+        stamps = np.fromiter((_timestamp(last_used.get(key)) for key in keys), dtype=np.float64, count=len(keys))
+        counts = np.array([feedback_counts.get(key, no_feedback) for key in keys], dtype=np.float64).reshape(-1, 2)
+        self.ids = ids[order]
+        self.last_used = stamps[order]
+        self.likes = counts[order, 0]
+        self.dislikes = counts[order, 1]
+
+    def mark_used(self, item_ids: Iterable[int], when: datetime) -> "UsageFeatures":
+        # Copy with item_ids treated as used at `when`, e.g. for later days of a multi-day plan.
+        used = np.unique(np.fromiter(item_ids, dtype=np.int64))
+        known = np.isin(used, self.ids)
+        ids = np.concatenate([self.ids, used[~known]])
+        order = np.argsort(ids, kind="stable")
+        last_used = np.concatenate([self.last_used, np.full((~known).sum(), np.nan)])
+        likes = np.concatenate([self.likes, np.zeros((~known).sum())])
+        dislikes = np.concatenate([self.dislikes, np.zeros((~known).sum())])
+
+        updated = UsageFeatures.__new__(UsageFeatures)
+        updated.ids = ids[order]
+        updated.last_used = last_used[order]
+        updated.likes = likes[order]
+        updated.dislikes = dislikes[order]
+        updated.last_used[np.searchsorted(updated.ids, used)] = _timestamp(when)
+        return updated
+
+    def gather(self, item_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Align usage columns with item_ids; unknown items get no history.
+        if not self.ids.size:
+            zeros = np.zeros(item_ids.shape, dtype=np.float64)
+            return np.full(item_ids.shape, np.nan), zeros, zeros
+        positions = np.minimum(np.searchsorted(self.ids, item_ids), self.ids.size - 1)
+        found = self.ids[positions] == item_ids
+        return (
+            np.where(found, self.last_used[positions], np.nan),
+            np.where(found, self.likes[positions], 0.0),
+            np.where(found, self.dislikes[positions], 0.0),
+        )
+
+
+def item_scores(
+    features: CategoryFeatures,
+    usage: UsageFeatures,
+    now: datetime,
+    season: int,
+    tables: CompatibilityTables = DEFAULT_TABLES,
+) -> np.ndarray:
+    last_used, likes, dislikes = usage.gather(features.ids)
+    days_idle = np.maximum(_timestamp(now) - last_used, 0.0) / 86400.0
+    recency = np.where(np.isnan(last_used), 1.0, 1.0 - np.exp(-days_idle / RECENCY_SCALE_DAYS))
+    feedback = (likes - dislikes) / (likes + dislikes + 1.0)
+
+    return (
+        RECENCY_WEIGHT * recency
+        + FEEDBACK_WEIGHT * feedback
+        + SEASON_WEIGHT * tables.season_fit[features.seasons, season]
+    )
+
+
+def season_allowed(features: CategoryFeatures, season: int, tables: CompatibilityTables = DEFAULT_TABLES) -> np.ndarray:
+    return ~tables.season_blocked[features.seasons, season]
+
+
+class Slot:
+    __slots__ = ("features", "scores", "weight", "optional", "allowed")
+
+    def __init__(
+        self,
+        features: CategoryFeatures,
+        scores: np.ndarray,
+        weight: float = 1.0,
+        optional: bool = False,
+        allowed: Optional[np.ndarray] = None,
+    ):
+        self.features = features
+        self.scores = scores
+        self.weight = weight
+        self.optional = optional
+        self.allowed = allowed
+
+
+def _slot_candidates(slot: Slot, shortlist_size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = np.argsort(-slot.scores, kind="stable")
+    # Blocked items only stay in when a required slot has nothing else to offer.
+    if slot.allowed is not None and (slot.optional or slot.allowed.any()):
+        order = order[slot.allowed[order]]
+    order = order[:shortlist_size]
+    ids = slot.features.ids[order]
+    scores = slot.weight * slot.scores[order]
+    colors = slot.features.colors[order]
+    if slot.optional:
+        ids = np.append(ids, SKIPPED)
+        scores = np.append(scores, 0.0)
+        colors = np.append(colors, _NO_COLOR)
+    return ids, scores, colors
+
+
+def shortlist_ids(slots: Sequence[Slot], shortlist_size: int = SHORTLIST_SIZE) -> set[int]:
+    # Every item search_outfits can consider for these slots; pair feedback outside them is never read.
+    ids: set[int] = set()
+    for slot in slots:
+        ids.update(_slot_candidates(slot, shortlist_size)[0].tolist())
+    ids.discard(SKIPPED)
+    return ids
+
+
+def _pair_terms(
+    a: tuple[np.ndarray, np.ndarray, np.ndarray],
+    b: tuple[np.ndarray, np.ndarray, np.ndarray],
+    pair_penalties: Mapping[tuple[int, int], float],
+    harmony: np.ndarray,
+) -> np.ndarray:
+    # Score added by putting each candidate of one slot next to each candidate of another.
+    terms = harmony[a[2][:, None], b[2][None, :]]
+    if pair_penalties:
+        for row, first in enumerate(a[0].tolist()):
+            for col, second in enumerate(b[0].tolist()):
+                penalty = pair_penalties.get((first, second) if first < second else (second, first))
+                if penalty:
+                    terms[row, col] -= penalty
+    return terms
+
+
+def search_outfits(
+    slots: Sequence[Slot],
+    pool_size: int,
+    beam_width: int = BEAM_WIDTH,
+    shortlist_size: int = SHORTLIST_SIZE,
+    pair_penalties: Mapping[tuple[int, int], float] = {},
+    tables: CompatibilityTables = DEFAULT_TABLES,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Beam search over slots with a branch-and-bound cut. Returns item id rows (SKIPPED for an
+    # empty optional slot) and their scores, best first. pair_penalties is keyed by (low id, high id).
+    candidates = [_slot_candidates(slot, shortlist_size) for slot in slots]
+    harmony = np.pad(
+        np.where(tables.color_blocked, -BLOCKED_PENALTY, COLOR_WEIGHT * tables.color_harmony), (0, 1)
+    )
+    pair_terms = {
+        (i, j): _pair_terms(candidates[i], candidates[j], pair_penalties, harmony)
+        for j in range(len(slots))
+        for i in range(j)
+    }
+    # Optimistic bound on what the slots from each depth on can still add. Pair terms are
+    # usually penalties, but user overrides may reward a color pairing.
+    best = np.array(
+        [
+            scores.max() + sum(max(float(pair_terms[(i, j)].max()), 0.0) for i in range(j))
+            for j, (_, scores, _) in enumerate(candidates)
+        ]
+    )
+    remaining = np.append(np.cumsum(best[::-1])[::-1], 0.0)
+
+    # Greedy completions of the top first-slot choices are real outfits, so the pool_size-th best
+    # of them is a lower bound on the final pool; partial outfits that cannot beat it are dropped.
+    floor = -np.inf
+    if len(candidates[0][0]) >= pool_size:
+        choices = [np.arange(pool_size)] + [np.full(pool_size, np.argmax(scores)) for _, scores, _ in candidates[1:]]
+        totals = sum(candidates[slot][1][choices[slot]] for slot in range(len(slots)))
+        for (i, j), terms in pair_terms.items():
+            totals = totals + terms[choices[i], choices[j]]
+        floor = float(np.min(totals))
+
+    states = np.zeros((1, 0), dtype=np.intp)
+    partial = np.zeros(1)
+    for depth, (_, scores, _) in enumerate(candidates):
+        expanded = partial[:, None] + scores[None, :]
+        for previous in range(depth):
+            expanded = expanded + pair_terms[(previous, depth)][states[:, previous]]
+
+        flat = expanded.ravel()
+        keep = np.nonzero(flat + remaining[depth + 1] >= floor - 1e-9)[0]
+        keep = keep[np.argsort(-flat[keep], kind="stable")[:beam_width]]
+        states = np.column_stack([states[keep // len(scores)], keep % len(scores)])
+        partial = flat[keep]
+
+    item_ids = np.stack([candidates[slot][0][states[:, slot]] for slot in range(len(slots))], axis=1)
+    return item_ids[:pool_size], partial[:pool_size]
+
+
+def pick_diverse(
+    item_ids: np.ndarray, scores: np.ndarray, k: int, avoid: Sequence[Collection[int]] = ()
+) -> list[int]:
+    # Greedy top-K that trades a little score for outfits sharing fewer items with earlier picks.
+    # Outfits identical to one in `avoid` are only returned when nothing else is left.
+    adjusted = scores.astype(np.float64).copy()
+    present = item_ids != SKIPPED
+    sizes = present.sum(axis=1)
+    repeats = np.zeros(len(item_ids), dtype=bool)
+    for outfit in avoid:
+        outfit = set(outfit)
+        repeats |= (np.isin(item_ids, list(outfit)) | ~present).all(axis=1) & (sizes == len(outfit))
+    if not repeats.all():
+        adjusted[repeats] = -np.inf
+
+    overlap = np.zeros(len(item_ids))
+    picks: list[int] = []
+    for _ in range(min(k, len(item_ids))):
+        ranked = adjusted - DIVERSITY_WEIGHT * overlap
+        if picks:
+            ranked[picks] = -np.inf
+        pick = int(np.argmax(ranked))
+        if not np.isfinite(ranked[pick]):
+            break
+        picks.append(pick)
+        shared = (np.isin(item_ids, item_ids[pick][present[pick]]) & present).sum(axis=1)
+        overlap = np.maximum(overlap, shared / np.maximum(sizes, 1))
+    return picks
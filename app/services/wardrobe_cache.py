@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.clothing_item import ClothingItem
+from app.models.enums import ClothingCategory, ColorFamily, Season
+
+
+class WardrobeEntry(NamedTuple):
+    id: int
+    category: ClothingCategory
+    color_family: ColorFamily
+    season: Season
+    created_at: datetime
+
+
+class WardrobeSnapshot:
+    __slots__ = ("user_id", "revision", "by_category", "features")
+
+    def __init__(
+        self, user_id: int, by_category: dict[ClothingCategory, tuple[WardrobeEntry, ...]], revision: int = 0
+    ):
+        self.user_id = user_id
+        self.revision = revision  # the user's wardrobe_revision it was loaded at
+        self.by_category = by_category
+        self.features: Optional[dict] = None
+
+    def items_for(self, category: ClothingCategory) -> tuple[WardrobeEntry, ...]:
+        return self.by_category.get(category, ())
+
+
+# Size-bounded LRU of per-user wardrobe snapshots. Entries are checked against the user's
+# wardrobe_revision on use, so writes made through another worker are picked up too; local
+# writes also drop the entry right away.
+class WardrobeCache:
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, WardrobeSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> Optional[WardrobeSnapshot]:
+        with self._lock:
+            snapshot = self._entries.get(user_id)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return snapshot
+
+    def put(self, snapshot: WardrobeSnapshot) -> None:
+        if self.max_users <= 0:
+            return
+        with self._lock:
+            self._entries[snapshot.user_id] = snapshot
+            self._entries.move_to_end(snapshot.user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_users,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+wardrobe_cache = WardrobeCache(get_settings().wardrobe_cache_size)
+
+
+def load_wardrobe_snapshot(db: Session, user_id: int, revision: int) -> WardrobeSnapshot:
+    # revision is the caller's users.wardrobe_revision. It is read before the items, so a snapshot
+    # is never tagged newer than its contents; a write racing this load only costs a reload.
+    snapshot = wardrobe_cache.get(user_id)
+    if snapshot is not None and snapshot.revision == revision:
+        return snapshot
+
+    rows = db.execute(
+        select(
+            ClothingItem.id,
+            ClothingItem.category,
+            ClothingItem.color_family,
+            ClothingItem.season,
+            ClothingItem.created_at,
+        )
+        .where(ClothingItem.user_id == user_id)
+        .order_by(ClothingItem.created_at.asc(), ClothingItem.id.asc())
+    )
+    grouped: dict[ClothingCategory, list[WardrobeEntry]] = {}
+    for row in rows:
+        grouped.setdefault(row.category, []).append(WardrobeEntry(*row))
+
+    snapshot = WardrobeSnapshot(
+        user_id, {category: tuple(entries) for category, entries in grouped.items()}, revision
+    )
+    wardrobe_cache.put(snapshot)
+    return snapshot
@@ -1,4 +1,15 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Mapping, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.custom_subtype import CustomSubtype
 from app.models.enums import ClothingCategory, ColorFamily, Season
+from app.schemas.clothing_item import WardrobeCategoriesResponse
 
 WARDROBE_CATEGORIES = [
     {
@@ -33,16 +44,16 @@ WARDROBE_CATEGORIES = [
     },
 ]
 
-
-def get_wardrobe_categories():
-    return WARDROBE_CATEGORIES
+COLOR_FAMILIES = frozenset(color.value for color in ColorFamily)
+SEASONS = frozenset(season.value for season in Season)
 
 
-def valid_subtypes_for(category: ClothingCategory) -> list[str]:
-    for entry in WARDROBE_CATEGORIES:
-        if entry["slug"] == category:
-            return entry["subtypes"]
-    return []
+class CompiledCatalog(NamedTuple):
+    user_id: Optional[int]  # None for the built-in catalog
+    revision: int  # the user's catalog_revision it was built from
+    subtypes: dict[ClothingCategory, frozenset[str]]
+    body: bytes  # encoded WardrobeCategoriesResponse, sent as is
+    etag: str
 
 
 def get_color_families() -> list[str]:
@@ -51,3 +62,119 @@ def get_color_families() -> list[str]:
 
 def get_seasons() -> list[str]:
     return [season.value for season in Season]
+
+
+def compile_catalog(
+    custom: Optional[Mapping[ClothingCategory, Sequence[str]]] = None, user_id: Optional[int] = None, revision: int = 0
+) -> CompiledCatalog:
+    # Done once per distinct catalog: validation reads the frozensets, the endpoint sends body.
+    custom = custom or {}
+    categories = []
+    for entry in WARDROBE_CATEGORIES:
+        extra = [name for name in custom.get(entry["slug"], ()) if name not in entry["subtypes"]]
+        categories.append({**entry, "subtypes": entry["subtypes"] + extra})
+    payload = {"categories": categories, "color_families": get_color_families(), "seasons": get_seasons()}
+    body = WardrobeCategoriesResponse.model_validate(payload).model_dump_json().encode()
+    return CompiledCatalog(
+        user_id=user_id,
+        revision=revision,
+        subtypes={entry["slug"]: frozenset(entry["subtypes"]) for entry in categories},
+        body=body,
+        etag=f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"',
+    )
+
+
+BASE_CATALOG = compile_catalog()
+
+class CatalogCache:
+    # Small per-user LRU of compiled catalogs (built-ins plus the user's custom subtypes).
+    # Entries carry their catalog_revision; load_user_catalog checks it on use.
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, CompiledCatalog]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> Optional[CompiledCatalog]:
+        with self._lock:
+            catalog = self._entries.get(user_id)
+            if catalog is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return catalog
+
+    def put(self, catalog: CompiledCatalog) -> None:
+        if self.max_users <= 0:
+            return
+        with self._lock:
+            self._entries[catalog.user_id] = catalog
+            self._entries.move_to_end(catalog.user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_users,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+catalog_cache = CatalogCache(get_settings().catalog_cache_size)
+
+
+def load_user_catalog(db: Session, user_id: int, revision: int) -> CompiledCatalog:
+    # revision is the caller's users.catalog_revision, so changes made through another worker
+    # are picked up even though this process never saw the invalidation.
+    catalog = catalog_cache.get(user_id)
+    if catalog is not None and catalog.revision == revision:
+        return catalog
+
+    custom: dict[ClothingCategory, list[str]] = {}
+    rows = db.execute(
+        select(CustomSubtype.category, CustomSubtype.name)
+        .where(CustomSubtype.user_id == user_id)
+        .order_by(CustomSubtype.id)
+    )
+    for category, name in rows:
+        custom.setdefault(category, []).append(name)
+    if custom:
+        catalog = compile_catalog(custom, user_id, revision)
+    else:
+        catalog = BASE_CATALOG._replace(user_id=user_id, revision=revision)
+    catalog_cache.put(catalog)
+    return catalog
+
+
+def metadata_error(
+    category: ClothingCategory,
+    subtype: str,
+    color_family: str,
+    season: str,
+    subtypes: Optional[Mapping[ClothingCategory, frozenset[str]]] = None,
+) -> Optional[str]:
+    allowed_subtypes = (subtypes or BASE_CATALOG.subtypes).get(category)
+    if allowed_subtypes and subtype not in allowed_subtypes:
+        return "Invalid subtype for this category."
+    if color_family not in COLOR_FAMILIES:
+        return "Invalid color_family. Refer to /wardrobe/categories."
+    if season not in SEASONS:
+        return "Invalid season. Refer to /wardrobe/categories."
+    return None
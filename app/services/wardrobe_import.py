@@ -0,0 +1,166 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Mapping, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models.clothing_item import ClothingItem
+from app.models.enums import ClothingCategory
+from app.schemas.clothing_item import ClothingItemCreate
+from app.services.revisions import bump_revision
+from app.services.wardrobe_catalog import metadata_error
+
+CSV = "csv"
+JSONL = "jsonl"
+IMPORT_FORMATS = {
+    "text/csv": CSV,
+    "application/x-ndjson": JSONL,
+    "application/jsonl": JSONL,
+    "application/x-jsonlines": JSONL,
+}
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+CSV_REQUIRED_COLUMNS = ("name", "category", "color")
+
+# A parsed row is either the field mapping or the reason it could not be parsed.
+ParsedRow = tuple[int, Union[dict[str, Any], str]]
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    # Only the current chunk and one partial line are held in memory.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_no = 0
+    try:
+        async for chunk in chunks:
+            *complete, pending = (pending + decoder.decode(chunk)).split("\n")
+            for line in complete:
+                line_no += 1
+                yield line_no, line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ImportFormatError("Upload is not valid UTF-8.")
+    if pending:
+        yield line_no + 1, pending.rstrip("\r")
+
+
+async def _csv_rows(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[ParsedRow]:
+    header: Optional[list[str]] = None
+    record: list[str] = []
+    start = 0
+    async for line_no, line in lines:
+        if not record:
+            start = line_no
+        record.append(line)
+        text = "\n".join(record)
+        if text.count('"') % 2:
+            # A quoted field continues on the next line.
+            continue
+        record = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            missing = [column for column in CSV_REQUIRED_COLUMNS if column not in header]
+            if missing:
+                raise ImportFormatError(f"CSV header is missing: {', '.join(missing)}.")
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} columns, got {len(values)}."
+            continue
+        # Empty cells fall back to the field defaults.
+        yield start, {column: value for column, value in zip(header, values) if value != ""}
+    if record:
+        yield start, "Unterminated quoted field."
+    elif header is None:
+        raise ImportFormatError("CSV upload is empty.")
+
+
+async def _jsonl_rows(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[ParsedRow]:
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, "Invalid JSON."
+            continue
+        yield line_no, row if isinstance(row, dict) else "Expected a JSON object."
+
+
+def _validation_detail(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in err.errors()
+    )
+
+
+def _validate_batch(
+    batch: list[ParsedRow], user_id: int, subtypes: Mapping[ClothingCategory, frozenset[str]]
+) -> tuple[list[dict], list[dict]]:
+    rows: list[dict] = []
+    errors: list[dict] = []
+    for line, parsed in batch:
+        if isinstance(parsed, str):
+            errors.append({"line": line, "detail": parsed})
+            continue
+        try:
+            item = ClothingItemCreate.model_validate(parsed)
+        except ValidationError as err:
+            errors.append({"line": line, "detail": _validation_detail(err)})
+            continue
+        error = metadata_error(item.category, item.subtype, item.color_family.value, item.season.value, subtypes)
+        if error:
+            errors.append({"line": line, "detail": error})
+            continue
+        rows.append({**item.model_dump(), "user_id": user_id})
+    return rows, errors
+
+
+async def import_wardrobe_items(
+    db: AsyncSession,
+    user_id: int,
+    chunks: AsyncIterator[bytes],
+    upload_format: str,
+    subtypes: Mapping[ClothingCategory, frozenset[str]],
+) -> dict:
+    # Valid rows are inserted in executemany batches and committed together at the end; invalid
+    # rows are skipped and reported by line number (CSV: the line the record starts on).
+    parser = _csv_rows if upload_format == CSV else _jsonl_rows
+    imported = 0
+    failed = 0
+    errors: list[dict] = []
+
+    async def flush(batch: list[ParsedRow]) -> None:
+        nonlocal imported, failed
+        # Validation is CPU work; the threadpool keeps long uploads from stalling the event loop.
+        rows, batch_errors = await run_in_threadpool(_validate_batch, batch, user_id, subtypes)
+        if rows:
+            # render_nulls keeps rows with and without optional fields in one executemany instead of
+            # splitting the batch wherever the set of non-null keys changes.
+            await db.execute(insert(ClothingItem), rows, execution_options={"render_nulls": True})
+            imported += len(rows)
+        failed += len(batch_errors)
+        errors.extend(batch_errors[: MAX_REPORTED_ERRORS - len(errors)])
+
+    batch: list[ParsedRow] = []
+    async for parsed in parser(_lines(chunks)):
+        batch.append(parsed)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    if imported:
+        await db.run_sync(bump_revision, user_id, wardrobe=True)
+    await db.commit()
+    return {"imported": imported, "failed": failed, "errors": errors}
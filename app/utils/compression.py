@@ -0,0 +1,105 @@
+import gzip
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+# Brotli first: on equal q-values it wins, since it packs our JSON tighter at similar CPU cost.
+SUPPORTED_ENCODINGS = (BROTLI, GZIP) if brotli else (GZIP,)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+# Bodies this large are compressed off the event loop.
+THREADPOOL_MIN_SIZE = 256 * 1024
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            weights[coding.strip().lower()] = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            weights[coding.strip().lower()] = 0.0
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=level)
+    # mtime=0 keeps the output a pure function of the body.
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    # Compresses complete responses of at least minimum_size bytes. Streaming responses (several
+    # body messages) and bodies that already carry a Content-Encoding are passed through untouched.
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {GZIP: gzip_level, BROTLI: brotli_quality}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                # Later chunks of a streaming response.
+                await send(message)
+                return
+
+            start_message, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if message.get("more_body", False) or not self._compressible(headers, body):
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is not None:
+                level = self.levels[encoding]
+                if len(body) >= THREADPOOL_MIN_SIZE:
+                    body = await run_in_threadpool(compress, body, encoding, level)
+                else:
+                    body = compress(body, encoding, level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                # A strong validator must change with the bytes; weak ones (all of ours) already compare equal.
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers: MutableHeaders, body: bytes) -> bool:
+        return (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
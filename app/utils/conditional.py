@@ -0,0 +1,29 @@
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def etag_for(request: Request, *validators: Any) -> str:
+    # Weak: equal validators mean the same data, not necessarily the same bytes on the wire.
+    key = "\n".join([request.url.path, request.url.query, *(str(validator) for validator in validators)])
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # Weak comparison against If-None-Match, as RFC 9110 prescribes for GET.
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def check_etag(request: Request, response: Response, *validators: Any) -> None:
+    # Call before loading any rows: a matching If-None-Match ends the request with a bodiless 304.
+    etag = etag_for(request, *validators)
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
@@ -1,12 +1,17 @@
+from typing import AsyncIterator, Iterator, Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.security import JWTDecodeError, JWTExpired, decode_access_token
-from app.db.session import SessionLocal
+from app.db.routing import SessionRouter
+from app.db.session import AsyncSessionLocal, SessionLocal, session_router
 from app.models.user import User
 
 auth_scheme = HTTPBearer()
+optional_auth_scheme = HTTPBearer(auto_error=False)
 
 
 def get_db() -> Session:
@@ -17,9 +22,16 @@ def get_db() -> Session:
         db.close()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme), db: Session = Depends(get_db)
-) -> User:
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_session_router() -> SessionRouter:
+    return session_router
+
+
+def _user_id_from_token(credentials: HTTPAuthorizationCredentials) -> int:
     token = credentials.credentials
     try:
         payload = decode_access_token(token)
@@ -31,8 +43,82 @@ def get_current_user(
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token.")
+    return int(user_id)
 
-    user = db.get(User, int(user_id))
+
+def _require_user(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User no longer exists.")
     return user
+
+
+# Primary-session users. Write handlers call SessionRouter.record_write themselves once they
+# have committed: dependency teardown only runs after the response has been sent, which is too
+# late for a client that reads straight after.
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme), db: Session = Depends(get_db)
+) -> User:
+    return _require_user(db.get(User, _user_id_from_token(credentials)))
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    return _require_user(await db.get(User, _user_id_from_token(credentials)))
+
+
+# Read-only endpoints: the replica when one is configured.
+def get_read_db(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    router: SessionRouter = Depends(get_session_router),
+) -> Iterator[Session]:
+    db = router.read_session(_user_id_from_token(credentials))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    router: SessionRouter = Depends(get_session_router),
+) -> AsyncIterator[AsyncSession]:
+    async with router.async_read_session(_user_id_from_token(credentials)) as db:
+        yield db
+
+
+def get_current_read_user(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme), db: Session = Depends(get_read_db)
+) -> User:
+    return _require_user(db.get(User, _user_id_from_token(credentials)))
+
+
+async def get_current_read_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme), db: AsyncSession = Depends(get_async_read_db)
+) -> User:
+    return _require_user(await db.get(User, _user_id_from_token(credentials)))
+
+
+# Endpoints that also serve anonymous callers; a token that is sent must still be valid.
+# Anonymous requests get no session at all.
+def get_optional_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_auth_scheme),
+    router: SessionRouter = Depends(get_session_router),
+) -> Iterator[Optional[Session]]:
+    if credentials is None:
+        yield None
+        return
+    db = router.read_session(_user_id_from_token(credentials))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_auth_scheme),
+    db: Optional[Session] = Depends(get_optional_read_db),
+) -> Optional[User]:
+    if credentials is None or db is None:
+        return None
+    return _require_user(db.get(User, _user_id_from_token(credentials)))
@@ -0,0 +1,58 @@
+from typing import Any, Iterable, Sequence
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import null
+from starlette.responses import Response
+
+from app.core.config import get_settings
+
+
+class FastJSONResponse(Response):
+    # Same bytes Pydantic's dump_json produces for our schemas: compact separators, ISO dates,
+    # enum values, and a trailing "Z" for UTC datetimes.
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def fast_json_enabled() -> bool:
+    return get_settings().fast_json_responses
+
+
+def response_fields(schema: type[BaseModel], exclude: Iterable[str] = ()) -> list[str]:
+    return [name for name in schema.model_fields if name not in exclude]
+
+
+def response_columns(schema: type[BaseModel], model: Any, exclude: Iterable[str] = ()) -> list:
+    # One selectable per response field, in the schema's order, so rows zip straight into
+    # payload dicts. Fields the table lacks (e.g. Outfit.reason) must default to None.
+    table_columns = model.__table__.c
+    return [
+        getattr(model, name) if name in table_columns else null().label(name)
+        for name in response_fields(schema, exclude)
+    ]
+
+
+def row_dicts(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict]:
+    # zip stops at the last field, so trailing helper columns (the keyset cursor) are dropped.
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def nested_row_dicts(
+    fields: Sequence[str], key: str, nested_fields: Sequence[str], rows: Iterable[Sequence[Any]]
+) -> list[dict]:
+    # Rows from an outer join: the parent's columns, then a to-one child's (all NULL when absent).
+    split = len(fields)
+    payload = []
+    for row in rows:
+        entry = dict(zip(fields, row))
+        entry[key] = dict(zip(nested_fields, row[split:])) if row[split] is not None else None
+        payload.append(entry)
+    return payload
+
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    # Returning a Response skips FastAPI's merge of the injected response, so carry its headers.
+    return FastJSONResponse(content, headers=response.headers)
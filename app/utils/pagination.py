@@ -0,0 +1,62 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, String, literal, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    value = created_at if isinstance(created_at, str) else created_at.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, row_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(created_at, str) or not isinstance(row_id, int):
+            raise ValueError(cursor)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return created_at, row_id
+
+
+def keyset_query(db: Session | AsyncSession, query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    # Newest first over (created_at, id), which the (user_id, created_at) indexes serve in order.
+    # The cursor keeps created_at exactly as stored: SQLite holds server defaults as
+    # 'YYYY-MM-DD HH:MM:SS' text, which a re-bound datetime ('... .000000') would not match.
+    stored_created_at = type_coerce(model.created_at, String).label("cursor_created_at")
+    query = query.add_columns(stored_created_at).order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if db.get_bind().dialect.name == "sqlite":
+            bound = literal(created_at, String)
+        else:
+            try:
+                bound = literal(datetime.fromisoformat(created_at), model.created_at.type)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(bound, literal(row_id)))
+    return query.limit(limit + 1)
+
+
+def keyset_page(rows: Sequence[Any], limit: int, response: Response) -> list:
+    # rows come from keyset_query: (entity, stored created_at), one more than the page holds.
+    page = rows[:limit]
+    if len(rows) > limit:
+        last, created_at = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(created_at, last.id)
+    return [entity for entity, _ in page]
+
+
+def keyset_rows(rows: Sequence[Any], limit: int, response: Response) -> list:
+    # Like keyset_page, for column selects (which include the model's id) instead of entities.
+    page = rows[:limit]
+    if len(rows) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1].cursor_created_at, page[-1].id)
+    return page
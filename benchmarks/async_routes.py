@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.db.migrations import run_migrations
+from app.db.pool import InstrumentedAsyncQueuePool, PoolMetrics
+from app.db.session import async_database_url, configure_sqlite, engine_options
+from app.models.clothing_item import ClothingItem
+from app.models.user import User
+from app.schemas.clothing_item import ClothingItemResponse
+from app.utils.deps import get_async_db, get_current_user, get_current_user_async, get_db
+from benchmarks.synthetic import Profile, populate_user
+
+
+def _items_query(user_id: int):
+    query = select(ClothingItem).where(ClothingItem.user_id == user_id)
+    return query.order_by(ClothingItem.created_at.desc()).limit(50)
+
+
+def _comparison_app(latency_ms: float) -> FastAPI:
+    # The same wardrobe page served both ways. The optional round trip stands in for network
+    # latency to the database: it sleeps on whichever thread runs the driver, so the sync
+    # handler holds its threadpool worker while the async one only holds a connection.
+    bench = FastAPI()
+    round_trip = text("SELECT bench_sleep(:ms)").bindparams(ms=latency_ms)
+
+    @bench.get("/sync/items", response_model=List[ClothingItemResponse])
+    def sync_items(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+        if latency_ms:
+            db.execute(round_trip)
+        return db.scalars(_items_query(current_user.id)).all()
+
+    @bench.get("/async/items", response_model=List[ClothingItemResponse])
+    async def async_items(
+        db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)
+    ):
+        if latency_ms:
+            await db.execute(round_trip)
+        return (await db.scalars(_items_query(current_user.id))).all()
+
+    return bench
+
+
+def _register_sleep(engine: Engine) -> None:
+    @event.listens_for(engine, "connect")
+    def add_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+async def _drive(bench: FastAPI, path: str, token: str, concurrency: int, requests: int) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def _summary(latencies: list[float], errors: int, elapsed: float, pool: dict) -> dict:
+    latencies.sort()
+    return {
+        "completed": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(statistics.median(latencies), 3) if latencies else None,
+            "p95": round(latencies[round(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+        },
+        "pool": pool,
+    }
+
+
+def _load(database_url: str, token: str, concurrency: int, requests: int, latency_ms: float) -> dict:
+    # Both pools are sized so the connection pool is never the limit; only the execution model differs.
+    settings = Settings(database_url=database_url, db_pool_size=concurrency, db_max_overflow=0)
+    engine = create_engine(database_url, **engine_options(settings))
+    async_engine = create_async_engine(
+        async_database_url(database_url), **engine_options(settings, poolclass=InstrumentedAsyncQueuePool)
+    )
+    metrics, async_metrics = PoolMetrics(), PoolMetrics()
+    metrics.attach(engine)
+    async_metrics.attach(async_engine.sync_engine)
+    if engine.dialect.name == "sqlite":
+        for target in (engine, async_engine.sync_engine):
+            configure_sqlite(target, settings)
+            _register_sleep(target)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    bench = _comparison_app(latency_ms)
+    bench.dependency_overrides[get_db] = override_get_db
+    bench.dependency_overrides[get_async_db] = override_get_async_db
+
+    async def measure() -> dict:
+        sync = await _drive(bench, "/sync/items", token, concurrency, requests)
+        asynchronous = await _drive(bench, "/async/items", token, concurrency, requests)
+        result = {
+            "concurrency": concurrency,
+            "threadpool_limit": anyio.to_thread.current_default_thread_limiter().total_tokens,
+            "sync": _summary(*sync, metrics.stats(engine)),
+            "async": _summary(*asynchronous, async_metrics.stats(async_engine.sync_engine)),
+        }
+        await async_engine.dispose()
+        return result
+
+    try:
+        return asyncio.run(measure())
+    finally:
+        engine.dispose()
+
+
+def run(database_url: str, levels: Sequence[int], requests: int, latency_ms: float, items: int) -> dict:
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    with sessionmaker(bind=engine)() as db:
+        user_id = populate_user(db, Profile(items, 0))
+    dialect = engine.dialect.name
+    engine.dispose()
+    if latency_ms and dialect != "sqlite":
+        # A real server already has its own round trip; only SQLite needs the stand-in.
+        latency_ms = 0.0
+    token = create_access_token(user_id)
+    return {
+        "benchmark": "async_routes",
+        "dialect": dialect,
+        "db_latency_ms": latency_ms,
+        "requests_per_client": requests,
+        "results": [_load(database_url, token, level, requests, latency_ms) for level in levels],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.async_routes",
+        description="Compare sync (threadpool) and async handlers for the wardrobe list at high concurrency.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="SQLAlchemy URL to load (default: a throwaway SQLite file)."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, action="append", help="Concurrent clients; repeatable (default: 10, 100, 400)."
+    )
+    parser.add_argument("--requests", type=int, default=10, help="Requests per client.")
+    parser.add_argument(
+        "--db-latency-ms", type=float, default=50.0, help="Simulated database round trip per request (SQLite only)."
+    )
+    parser.add_argument("--items", type=int, default=20, help="Wardrobe size of the benchmark user.")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    levels = args.concurrency or [10, 100, 400]
+    if args.database_url:
+        report = run(args.database_url, levels, args.requests, args.db_latency_ms, args.items)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", levels, args.requests, args.db_latency_ms, args.items)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
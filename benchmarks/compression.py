@@ -0,0 +1,159 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional, Sequence
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.db.migrations import run_migrations
+from app.models.clothing_item import ClothingItem
+from app.models.enums import OutfitStatus
+from app.models.outfit import Outfit
+from app.models.outfit_occurrence import OutfitOccurrence
+from app.routes.outfits import HISTORY_PAGE_SIZE
+from app.schemas.calendar import MonthCalendarResponse
+from app.schemas.clothing_item import ClothingItemResponse
+from app.schemas.outfit import OutfitResponse
+from app.utils.compression import BROTLI, GZIP, SUPPORTED_ENCODINGS, compress
+
+from benchmarks.synthetic import Profile, populate_user
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 11)
+
+
+def _payloads(db, items: int, outfits: int, seed: int) -> dict[str, bytes]:
+    # The bodies the endpoints send, built through the same response models.
+    user_id = populate_user(db, Profile(items, outfits), seed)
+    today = date.today()
+    recent = db.scalars(
+        select(Outfit.id).where(Outfit.user_id == user_id).order_by(Outfit.created_at.desc()).limit(31)
+    ).all()
+    # A month of calendar days; every tenth was worn without a planned outfit.
+    db.execute(
+        insert(OutfitOccurrence),
+        [
+            {
+                "user_id": user_id,
+                "date": today - timedelta(days=index),
+                "outfit_id": None if index % 10 == 0 else outfit_id,
+                "status": OutfitStatus.WORN if index % 10 == 0 else OutfitStatus.PLANNED,
+            }
+            for index, outfit_id in enumerate(recent)
+        ],
+    )
+    db.commit()
+
+    newest_items = select(ClothingItem).where(ClothingItem.user_id == user_id)
+    newest_items = newest_items.order_by(ClothingItem.created_at.desc(), ClothingItem.id.desc())
+    newest_outfits = select(Outfit).where(Outfit.user_id == user_id)
+    newest_outfits = newest_outfits.order_by(Outfit.created_at.desc(), Outfit.id.desc())
+    occurrences = db.scalars(
+        select(OutfitOccurrence)
+        .options(joinedload(OutfitOccurrence.outfit))
+        .where(OutfitOccurrence.user_id == user_id)
+        .order_by(OutfitOccurrence.date.asc())
+    ).unique().all()
+
+    items_adapter = TypeAdapter(list[ClothingItemResponse])
+    outfits_adapter = TypeAdapter(list[OutfitResponse])
+    return {
+        "wardrobe_page": items_adapter.dump_json(
+            items_adapter.validate_python(db.scalars(newest_items.limit(50)).all(), from_attributes=True)
+        ),
+        "history_page": outfits_adapter.dump_json(
+            outfits_adapter.validate_python(
+                db.scalars(newest_outfits.limit(HISTORY_PAGE_SIZE)).unique().all(), from_attributes=True
+            )
+        ),
+        "history_all": outfits_adapter.dump_json(
+            outfits_adapter.validate_python(db.scalars(newest_outfits).unique().all(), from_attributes=True)
+        ),
+        "calendar_month": MonthCalendarResponse.model_validate(
+            {"occurrences": occurrences}, from_attributes=True
+        ).model_dump_json().encode(),
+    }
+
+
+def _settings() -> list[tuple[str, int]]:
+    settings = [(GZIP, level) for level in GZIP_LEVELS]
+    if BROTLI in SUPPORTED_ENCODINGS:
+        settings += [(BROTLI, quality) for quality in BROTLI_QUALITIES]
+    return settings
+
+
+def _measure(body: bytes, encoding: str, level: int, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        packed = compress(body, encoding, level)
+        samples.append((time.process_time() - start) * 1000)
+    cpu_ms = statistics.median(samples)
+    return {
+        "encoding": encoding,
+        "level": level,
+        "bytes": len(packed),
+        "ratio": round(len(body) / len(packed), 2),
+        "bytes_saved": len(body) - len(packed),
+        "cpu_ms": round(cpu_ms, 3),
+        # What one millisecond of CPU buys, the figure to weigh against a slow link.
+        "kib_saved_per_cpu_ms": round((len(body) - len(packed)) / 1024 / cpu_ms, 1) if cpu_ms else None,
+    }
+
+
+def run(database_url: str, items: int, outfits: int, repeat: int, seed: int) -> dict:
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    try:
+        with Session() as db:
+            payloads = _payloads(db, items, outfits, seed)
+    finally:
+        engine.dispose()
+    results = {
+        name: {
+            "bytes": len(body),
+            "codecs": [_measure(body, encoding, level, repeat) for encoding, level in _settings()],
+        }
+        for name, body in payloads.items()
+    }
+    return {"benchmark": "compression", "dialect": engine.dialect.name, "repeat": repeat, "results": results}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compression",
+        description="Measure compression CPU cost against bytes saved on wardrobe, history and calendar payloads.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="SQLAlchemy URL to load (default: a throwaway SQLite file)."
+    )
+    parser.add_argument("--items", type=int, default=300, help="Wardrobe items for the synthetic user.")
+    parser.add_argument("--outfits", type=int, default=1000, help="Outfits in the user's history.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        report = run(args.database_url, args.items, args.outfits, args.repeat, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", args.items, args.outfits, args.repeat, args.seed)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
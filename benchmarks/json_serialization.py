@@ -0,0 +1,169 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.db.migrations import run_migrations
+from app.models.clothing_item import ClothingItem
+from app.models.enums import OutfitStatus
+from app.models.outfit import Outfit
+from app.models.outfit_occurrence import OutfitOccurrence
+from app.schemas.calendar import OutfitOccurrenceResponse
+from app.schemas.clothing_item import ClothingItemResponse
+from app.schemas.outfit import OutfitResponse
+from app.utils.fast_json import FastJSONResponse, nested_row_dicts, response_columns, response_fields, row_dicts
+
+from benchmarks.synthetic import Profile, populate_user
+
+
+def _populate(db, rows: int, seed: int) -> int:
+    user_id = populate_user(db, Profile(rows, rows), seed)
+    outfit_ids = db.scalars(select(Outfit.id).where(Outfit.user_id == user_id).order_by(Outfit.id)).all()
+    today = date.today()
+    # One occurrence per day going back; every tenth day was worn without a planned outfit.
+    db.execute(
+        insert(OutfitOccurrence),
+        [
+            {
+                "user_id": user_id,
+                "date": today - timedelta(days=index),
+                "outfit_id": None if index % 10 == 0 else outfit_id,
+                "status": OutfitStatus.WORN if index % 10 == 0 else OutfitStatus.PLANNED,
+            }
+            for index, outfit_id in enumerate(outfit_ids)
+        ],
+    )
+    db.commit()
+    return user_id
+
+
+def _payloads(user_id: int) -> dict[str, tuple[Callable, Callable]]:
+    # Each payload as the routes build it: ORM entities through the response model (what FastAPI
+    # does with response_model), or column rows straight into FastJSONResponse.
+    def standard(schema, query):
+        adapter = TypeAdapter(list[schema])
+
+        def build(db) -> bytes:
+            entities = db.scalars(query).unique().all()
+            return adapter.dump_json(adapter.validate_python(entities, from_attributes=True))
+
+        return build
+
+    def fast(schema, model, order_by):
+        fields = response_fields(schema)
+        query = select(*response_columns(schema, model)).where(model.user_id == user_id).order_by(*order_by)
+        return lambda db: FastJSONResponse(row_dicts(fields, db.execute(query))).body
+
+    def fast_occurrences(db) -> bytes:
+        exclude = ("outfit",)
+        query = (
+            select(
+                *response_columns(OutfitOccurrenceResponse, OutfitOccurrence, exclude=exclude),
+                *response_columns(OutfitResponse, Outfit),
+            )
+            .outerjoin(Outfit, OutfitOccurrence.outfit_id == Outfit.id)
+            .where(OutfitOccurrence.user_id == user_id)
+            .order_by(OutfitOccurrence.date.asc())
+        )
+        rows = db.execute(query)
+        fields = response_fields(OutfitOccurrenceResponse, exclude=exclude)
+        return FastJSONResponse(nested_row_dicts(fields, "outfit", response_fields(OutfitResponse), rows)).body
+
+    newest_items = (ClothingItem.created_at.desc(), ClothingItem.id.desc())
+    newest_outfits = (Outfit.created_at.desc(), Outfit.id.desc())
+    items = select(ClothingItem).where(ClothingItem.user_id == user_id).order_by(*newest_items)
+    outfits = select(Outfit).where(Outfit.user_id == user_id).order_by(*newest_outfits)
+    return {
+        "wardrobe_items": (
+            standard(ClothingItemResponse, items),
+            fast(ClothingItemResponse, ClothingItem, newest_items),
+        ),
+        "outfit_history": (
+            standard(OutfitResponse, outfits),
+            fast(OutfitResponse, Outfit, newest_outfits),
+        ),
+        "calendar_occurrences": (
+            standard(
+                OutfitOccurrenceResponse,
+                select(OutfitOccurrence)
+                .options(joinedload(OutfitOccurrence.outfit))
+                .where(OutfitOccurrence.user_id == user_id)
+                .order_by(OutfitOccurrence.date.asc()),
+            ),
+            fast_occurrences,
+        ),
+    }
+
+
+def _time(Session, build: Callable, repeat: int) -> tuple[bytes, dict]:
+    samples = []
+    for _ in range(repeat):
+        with Session() as db:
+            start = time.perf_counter()
+            body = build(db)
+            samples.append((time.perf_counter() - start) * 1000)
+    return body, {"p50_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def run(database_url: str, rows: int, repeat: int, seed: int) -> dict:
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    try:
+        with Session() as db:
+            user_id = _populate(db, rows, seed)
+        results = {}
+        for name, (standard, fast) in _payloads(user_id).items():
+            standard_body, standard_stats = _time(Session, standard, repeat)
+            fast_body, fast_stats = _time(Session, fast, repeat)
+            results[name] = {
+                "rows": len(json.loads(fast_body)),
+                "bytes": len(fast_body),
+                "identical": fast_body == standard_body,
+                "response_model": standard_stats,
+                "fast": fast_stats,
+                "speedup": round(standard_stats["p50_ms"] / fast_stats["p50_ms"], 2),
+            }
+    finally:
+        engine.dispose()
+    return {"benchmark": "json_serialization", "dialect": engine.dialect.name, "repeat": repeat, "results": results}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.json_serialization",
+        description="Compare response-model serialization of list payloads with the fast row-tuple path.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="SQLAlchemy URL to load (default: a throwaway SQLite file)."
+    )
+    parser.add_argument("--rows", type=int, default=10_000, help="Items, outfits and calendar days per payload.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        report = run(args.database_url, args.rows, args.repeat, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", args.rows, args.repeat, args.seed)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
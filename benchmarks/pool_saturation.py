@@ -0,0 +1,124 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import Settings
+from app.db.pool import PoolMetrics
+from app.db.session import engine_options
+
+
+def _load(database_url: str, threads: int, requests: int, hold_ms: float, pool: dict) -> dict:
+    settings = Settings(database_url=database_url, **pool)
+    engine = create_engine(database_url, **engine_options(settings))
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker() -> None:
+        nonlocal errors
+        barrier.wait()
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                # Stand-in for a request that holds its connection while it works.
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    time.sleep(hold_ms / 1000)
+            except PoolTimeoutError:
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stats = metrics.stats(engine)
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "threads": threads,
+        "completed": len(latencies),
+        "timeouts": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(statistics.median(latencies), 3) if latencies else None,
+            "p95": round(latencies[round(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+        },
+        "pool": stats,
+    }
+
+
+def run(database_url: str, thread_counts: Sequence[int], requests: int, hold_ms: float, pool: dict) -> dict:
+    # Make sure the database exists before the first pooled connection is timed.
+    bootstrap = create_engine(database_url)
+    with bootstrap.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    dialect = bootstrap.dialect.name
+    bootstrap.dispose()
+    return {
+        "benchmark": "pool_saturation",
+        "dialect": dialect,
+        "pool_settings": pool,
+        "hold_ms": hold_ms,
+        "requests_per_thread": requests,
+        "results": [_load(database_url, threads, requests, hold_ms, pool) for threads in thread_counts],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.pool_saturation",
+        description="Drive more concurrent connection holders than the pool allows and report queueing.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="SQLAlchemy URL to load (default: a throwaway SQLite file)."
+    )
+    parser.add_argument("--threads", type=int, action="append", help="Concurrent workers; repeatable (default: 2, 8, 32).")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per worker.")
+    parser.add_argument("--hold-ms", type=float, default=20.0, help="How long each request holds its connection.")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-overflow", type=int, default=0)
+    parser.add_argument("--pool-timeout", type=float, default=1.0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    pool = {
+        "db_pool_size": args.pool_size,
+        "db_max_overflow": args.max_overflow,
+        "db_pool_timeout": args.pool_timeout,
+    }
+    thread_counts = args.threads or [2, 8, 32]
+    if args.database_url:
+        report = run(args.database_url, thread_counts, args.requests, args.hold_ms, pool)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", thread_counts, args.requests, args.hold_ms, pool)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
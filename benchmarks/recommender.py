@@ -0,0 +1,146 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional, Sequence
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrations import run_migrations
+from app.services.recommender import generate_outfit_recommendation
+from app.services.wardrobe_cache import wardrobe_cache
+
+from benchmarks.synthetic import DEFAULT_PROFILES, Profile, populate_user
+
+# Ensure models are imported so metadata is ready for table creation
+from app import models  # noqa: E402,F401
+
+
+class QueryCounter:
+    def __init__(self, engine: Engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def _summary(samples: list[dict]) -> dict:
+    latencies = sorted(sample["latency_ms"] for sample in samples)
+    p95 = latencies[min(len(latencies) - 1, round(0.95 * (len(latencies) - 1)))]
+    return {
+        "runs": len(samples),
+        "latency_ms": {
+            "min": round(latencies[0], 3),
+            "p50": round(statistics.median(latencies), 3),
+            "p95": round(p95, 3),
+            "max": round(latencies[-1], 3),
+        },
+        "queries": max(sample["queries"] for sample in samples),
+        "peak_memory_kib": round(max(sample["peak_memory_kib"] for sample in samples), 1),
+    }
+
+
+def _measure(Session, counter: QueryCounter, user_id: int, cold: bool) -> dict:
+    if cold:
+        wardrobe_cache.clear()
+    with Session() as db:
+        counter.count = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        generate_outfit_recommendation(db, user_id)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"latency_ms": elapsed * 1000, "queries": counter.count, "peak_memory_kib": peak / 1024}
+
+
+def run(database_url: str, profiles: Sequence[Profile], repeat: int, seed: int) -> dict:
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+    )
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    counter = QueryCounter(engine)
+
+    results = []
+    try:
+        for profile in profiles:
+            setup_start = time.perf_counter()
+            with Session() as db:
+                user_id = populate_user(db, profile, seed)
+            setup_s = time.perf_counter() - setup_start
+
+            # Cold runs rebuild the wardrobe snapshot; warm runs reuse the cached one.
+            cold = [_measure(Session, counter, user_id, cold=True) for _ in range(repeat)]
+            warm = [_measure(Session, counter, user_id, cold=False) for _ in range(repeat)]
+            results.append(
+                {
+                    "profile": profile.name,
+                    "items": profile.items,
+                    "outfits": profile.outfits,
+                    "setup_s": round(setup_s, 3),
+                    "cold": _summary(cold),
+                    "warm": _summary(warm),
+                }
+            )
+    finally:
+        wardrobe_cache.clear()
+        engine.dispose()
+
+    return {
+        "benchmark": "generate_outfit_recommendation",
+        "dialect": engine.dialect.name,
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.recommender",
+        description="Measure recommendation latency, query count and peak memory on synthetic wardrobes.",
+    )
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="SQLAlchemy URL to benchmark against (default: a throwaway SQLite file). Synthetic users are added to it.",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profiles",
+        action="append",
+        type=Profile.parse,
+        help="ITEMS:OUTFITS for one synthetic user; repeatable (default: "
+        + ", ".join(profile.name for profile in DEFAULT_PROFILES)
+        + ").",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Measured runs per profile and cache state.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    profiles = args.profiles or DEFAULT_PROFILES
+    if args.database_url:
+        report = run(args.database_url, profiles, args.repeat, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", profiles, args.repeat, args.seed)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional, Sequence
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import Settings
+from app.db.migrations import run_migrations
+from app.db.session import async_database_url, configure_sqlite, engine_options
+from app.main import app
+from app.services.wardrobe_cache import wardrobe_cache
+from app.db.routing import SessionRouter
+from app.utils.deps import get_async_db, get_db, get_session_router
+
+# Stock SQLite (rollback journal, full fsync, no mmap) next to the tuned defaults from Settings.
+PROFILES = {
+    "stock": {
+        "sqlite_journal_mode": "DELETE",
+        "sqlite_synchronous": "FULL",
+        "sqlite_mmap_size": 0,
+        "sqlite_cache_size": -2000,
+        "sqlite_foreign_keys": False,
+    },
+    "tuned": {},
+}
+
+
+def _auth(client: TestClient, email: str) -> dict:
+    token = client.post("/auth/register", json={"email": email, "password": "secret123"}).json()["token"]
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+def _run_profile(path: Path, profile: dict, threads: int, requests: int, write_ratio: float, seed: int) -> dict:
+    url = f"sqlite:///{path}"
+    settings = Settings(database_url=url, **profile)
+    engine = create_engine(url, **engine_options(settings))
+    configure_sqlite(engine, settings)
+    run_migrations(engine)
+    # Every TestClient call runs on a fresh event loop, so async connections are not pooled here.
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    configure_sqlite(async_engine.sync_engine, settings)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    AsyncSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    router = SessionRouter(Session, async_primary=AsyncSession)
+    app.dependency_overrides[get_session_router] = lambda: router
+    wardrobe_cache.clear()
+    setup = TestClient(app)
+    users = [_auth(setup, f"bench-{index}@example.com") for index in range(threads)]
+    for headers in users:
+        for category in ("top", "bottom", "footwear"):
+            setup.post("/wardrobe/items", json={"name": category, "category": category, "color": "black"}, headers=headers)
+
+    samples: dict[str, list[float]] = {"read": [], "write": []}
+    failures = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    today = date.today()
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        client = TestClient(app)
+        headers = users[index]
+        barrier.wait()
+        for _ in range(requests):
+            if rng.random() < write_ratio:
+                kind = "write"
+                if rng.random() < 0.5:
+                    call = lambda: client.post(
+                        "/wardrobe/items", json={"name": "top", "category": "top", "color": "blue"}, headers=headers
+                    )
+                else:
+                    day = today - timedelta(days=rng.randrange(60))
+                    call = lambda: client.post(
+                        "/calendar/confirm-worn", json={"date": day.isoformat(), "worn": True}, headers=headers
+                    )
+            else:
+                kind = "read"
+                if rng.random() < 0.5:
+                    call = lambda: client.get("/wardrobe/items", headers=headers)
+                else:
+                    call = lambda: client.get(
+                        f"/calendar/month?year={today.year}&month={today.month}", headers=headers
+                    )
+            start = time.perf_counter()
+            response = call()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if response.status_code < 400:
+                    samples[kind].append(elapsed)
+                else:
+                    failures[kind] += 1
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    app.dependency_overrides.clear()
+    wardrobe_cache.clear()
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+    result = {"seconds": round(elapsed, 3)}
+    for kind, latencies in samples.items():
+        latencies.sort()
+        result[kind] = {
+            "completed": len(latencies),
+            "failed": failures[kind],
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+            "p95_ms": round(latencies[round(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+        }
+    return result
+
+
+def run(directory: Path, threads: int, requests: int, write_ratio: float, seed: int) -> dict:
+    return {
+        "benchmark": "sqlite_concurrency",
+        "threads": threads,
+        "requests_per_thread": requests,
+        "write_ratio": write_ratio,
+        "results": {
+            name: _run_profile(directory / f"{name}.db", profile, threads, requests, write_ratio, seed)
+            for name, profile in PROFILES.items()
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.sqlite_concurrency",
+        description="Compare stock and tuned SQLite under many threads hitting wardrobe and calendar endpoints.",
+    )
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per thread.")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(Path(tmp), args.threads, args.requests, args.write_ratio, args.seed)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
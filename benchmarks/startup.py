@@ -0,0 +1,110 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+from app.db.migrations import ensure_schema, run_migrations
+
+# Ensure models are imported so metadata is ready for table creation
+from app import models  # noqa: E402,F401
+
+
+def reflect_on_boot(engine: Engine) -> None:
+    # What startup used to do before schema versioning: reflect every table and column the
+    # migrations might touch, then let create_all check every table again.
+    for table, column in [
+        ("clothing_items", "subtype"),
+        ("clothing_items", "color_family"),
+        ("clothing_items", "season"),
+        ("clothing_items", "name"),
+        ("clothing_items", "updated_at"),
+        ("item_usage", "likes"),
+        ("item_usage", "dislikes"),
+        ("item_usage", "skips"),
+        ("item_usage", "rejections"),
+    ]:
+        inspector = inspect(engine)
+        if table in inspector.get_table_names():
+            any(col["name"] == column for col in inspector.get_columns(table))
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if inspector.has_table(table.name):
+            inspector.get_indexes(table.name)
+            inspector.get_columns(table.name)
+    Base.metadata.create_all(bind=engine)
+
+
+def _measure(database_url: str, boot: Callable[[Engine], None], repeat: int) -> dict:
+    samples, queries = [], 0
+    for _ in range(repeat):
+        # A new engine per run, like a new worker process.
+        engine = create_engine(database_url)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        start = time.perf_counter()
+        boot(engine)
+        samples.append((time.perf_counter() - start) * 1000)
+        queries = len(statements)
+        engine.dispose()
+    return {
+        "runs": repeat,
+        "latency_ms": {
+            "min": round(min(samples), 3),
+            "p50": round(statistics.median(samples), 3),
+            "max": round(max(samples), 3),
+        },
+        "queries": queries,
+    }
+
+
+def run(database_url: str, repeat: int) -> dict:
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    dialect = engine.dialect.name
+    engine.dispose()
+    return {
+        "benchmark": "startup_schema_check",
+        "dialect": dialect,
+        "repeat": repeat,
+        "results": {
+            "reflect_on_boot": _measure(database_url, reflect_on_boot, repeat),
+            "version_check": _measure(database_url, ensure_schema, repeat),
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Compare the startup schema cost of full reflection with the schema_version check.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="SQLAlchemy URL to benchmark against (default: a throwaway SQLite file)."
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        report = run(args.database_url, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", args.repeat)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.clothing_item import ClothingItem
+from app.models.enums import ClothingCategory, ColorFamily, OutfitFeedback, Season
+from app.models.outfit import Outfit
+from app.models.outfit_item import OutfitItem
+from app.models.user import User
+from app.services.item_usage import backfill_item_usage
+
+CHUNK_SIZE = 5000
+HISTORY_DAYS = 365
+
+# Rough shape of a real wardrobe: mostly tops and bottoms, fewer shoes and one-pieces.
+_CATEGORY_WEIGHTS = {
+    ClothingCategory.TOP: 35,
+    ClothingCategory.BOTTOM: 25,
+    ClothingCategory.FOOTWEAR: 12,
+    ClothingCategory.OUTERWEAR: 10,
+    ClothingCategory.ONE_PIECE: 8,
+    ClothingCategory.ACCESSORIES: 10,
+}
+_FEEDBACK_WEIGHTS = {
+    OutfitFeedback.NONE: 70,
+    OutfitFeedback.LIKE: 15,
+    OutfitFeedback.DISLIKE: 10,
+    OutfitFeedback.SKIP: 5,
+}
+
+
+class Profile(NamedTuple):
+    items: int
+    outfits: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.items}:{self.outfits}"
+
+    @classmethod
+    def parse(cls, value: str) -> "Profile":
+        items, _, outfits = value.partition(":")
+        return cls(int(items), int(outfits or 0))
+
+
+DEFAULT_PROFILES = [Profile(10, 0), Profile(100, 1000), Profile(1000, 10000), Profile(10000, 100000)]
+
+
+def _chunks(rows: list[dict]):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield rows[start:start + CHUNK_SIZE]
+
+
+def _item_rows(rng: random.Random, user_id: int, count: int, now: datetime) -> list[dict]:
+    categories = list(_CATEGORY_WEIGHTS)
+    weights = list(_CATEGORY_WEIGHTS.values())
+    # The first three items guarantee a complete outfit even for the smallest profile.
+    picked = [ClothingCategory.TOP, ClothingCategory.BOTTOM, ClothingCategory.FOOTWEAR][:count]
+    picked += rng.choices(categories, weights, k=max(count - len(picked), 0))
+    return [
+        {
+            "user_id": user_id,
+            "name": f"{category.value} {index}",
+            "category": category,
+            "color": f"color-{index}",
+            "color_family": rng.choice(list(ColorFamily)),
+            "season": rng.choice(list(Season)),
+            "created_at": now - timedelta(days=rng.uniform(0, HISTORY_DAYS)),
+        }
+        for index, category in enumerate(picked)
+    ]
+
+
+def _outfit_rows(
+    rng: random.Random, user_id: int, count: int, by_category: dict[ClothingCategory, list[int]], today: date
+) -> list[dict]:
+    feedback = list(_FEEDBACK_WEIGHTS)
+    weights = list(_FEEDBACK_WEIGHTS.values())
+    rows = []
+    for _ in range(count):
+        if by_category.get(ClothingCategory.ONE_PIECE) and rng.random() < 0.2:
+            item_ids = [rng.choice(by_category[ClothingCategory.ONE_PIECE])]
+        else:
+            item_ids = [rng.choice(by_category[ClothingCategory.TOP]), rng.choice(by_category[ClothingCategory.BOTTOM])]
+        item_ids.append(rng.choice(by_category[ClothingCategory.FOOTWEAR]))
+        if by_category.get(ClothingCategory.OUTERWEAR) and rng.random() < 0.3:
+            item_ids.append(rng.choice(by_category[ClothingCategory.OUTERWEAR]))
+        day = today - timedelta(days=rng.randrange(HISTORY_DAYS))
+        rows.append(
+            {
+                "user_id": user_id,
+                "date": day,
+                "item_ids": item_ids,
+                "feedback": rng.choices(feedback, weights)[0],
+                "created_at": datetime.combine(day, time(hour=rng.randrange(6, 22)), tzinfo=timezone.utc),
+            }
+        )
+    return rows
+
+
+def populate_user(db: Session, profile: Profile, seed: int = 0) -> int:
+    # Deterministic for a given (profile, seed): same wardrobe, same history.
+    rng = random.Random(f"{seed}:{profile.name}")
+    now = datetime.now(timezone.utc)
+    # Only the email is random, so repeated runs can share one database.
+    email = f"bench-{profile.items}-{profile.outfits}-{uuid.uuid4().hex[:12]}@example.com"
+    user_id = db.execute(insert(User).returning(User.id), [{"email": email, "password_hash": "!benchmark"}]).scalar_one()
+
+    by_category: dict[ClothingCategory, list[int]] = {}
+    item_rows = _item_rows(rng, user_id, max(profile.items, 3), now)
+    for chunk in _chunks(item_rows):
+        ids = db.execute(
+            insert(ClothingItem).returning(ClothingItem.id, sort_by_parameter_order=True), chunk
+        ).scalars()
+        for row, item_id in zip(chunk, ids):
+            by_category.setdefault(row["category"], []).append(item_id)
+
+    for chunk in _chunks(_outfit_rows(rng, user_id, profile.outfits, by_category, now.date())):
+        outfit_ids = db.execute(insert(Outfit).returning(Outfit.id, sort_by_parameter_order=True), chunk).scalars()
+        db.execute(
+            insert(OutfitItem),
+            [
+                {"outfit_id": outfit_id, "item_id": item_id, "position": position}
+                for row, outfit_id in zip(chunk, outfit_ids)
+                for position, item_id in enumerate(row["item_ids"])
+            ],
+        )
+    db.commit()
+
+    backfill_item_usage(db, user_id)
+    return user_id
@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Settings
+from app.core.security import create_access_token
+from app.db.migrations import run_migrations
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.routing import SessionRouter
+from app.db.session import async_database_url, configure_sqlite, engine_options
+from app.main import app
+from app.models.user import User
+from app.services.wardrobe_catalog import WARDROBE_CATEGORIES
+from app.utils.deps import get_async_db, get_db, get_session_router
+
+COLUMNS = ("name", "category", "subtype", "color", "color_family", "season", "notes")
+CHUNK_BYTES = 64 * 1024
+
+
+def _rows(count: int, seed: int) -> Iterator[dict]:
+    rng = random.Random(seed)
+    for index in range(count):
+        entry = rng.choice(WARDROBE_CATEGORIES)
+        yield {
+            "name": f"Item {index}",
+            "category": entry["slug"].value,
+            "subtype": rng.choice(entry["subtypes"]),
+            "color": rng.choice(["navy", "white", "black", "olive", "rust"]),
+            "color_family": rng.choice(["Blue", "White", "Black", "Green", "Red"]),
+            "season": rng.choice(["All-season", "Warm", "Cold", "Rain"]),
+            "notes": "bulk import" if index % 3 else "",
+        }
+
+
+def _csv_body(count: int, seed: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writeheader()
+    for row in _rows(count, seed):
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _jsonl_body(count: int, seed: int) -> Iterator[bytes]:
+    lines: list[str] = []
+    size = 0
+    for row in _rows(count, seed):
+        line = json.dumps(row) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(lines).encode()
+            lines, size = [], 0
+    yield "".join(lines).encode()
+
+
+async def _upload(content_type: str, body: Iterator[bytes], token: str) -> tuple[dict, float]:
+    async def stream():
+        for chunk in body:
+            yield chunk
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        response = await client.post(
+            "/wardrobe/items/import",
+            content=stream(),
+            headers={"Authorization": f"Bearer {token}", "Content-Type": content_type},
+        )
+        elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return response.json(), elapsed
+
+
+def run(database_url: str, rows: int, seed: int) -> dict:
+    settings = Settings(database_url=database_url)
+    engine = create_engine(database_url, **engine_options(settings))
+    async_engine = create_async_engine(
+        async_database_url(database_url), **engine_options(settings, poolclass=InstrumentedAsyncQueuePool)
+    )
+    if engine.dialect.name == "sqlite":
+        configure_sqlite(engine, settings)
+        configure_sqlite(async_engine.sync_engine, settings)
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    router = SessionRouter(Session, async_primary=AsyncSessionLocal)
+    app.dependency_overrides.update(
+        {get_db: override_get_db, get_async_db: override_get_async_db, get_session_router: lambda: router}
+    )
+
+    results = {}
+    try:
+        for name, content_type, body in (
+            ("csv", "text/csv", _csv_body),
+            ("jsonl", "application/x-ndjson", _jsonl_body),
+        ):
+            with Session() as db:
+                user = User(email=f"import-{name}-{time.time_ns()}@example.com", password_hash="!benchmark")
+                db.add(user)
+                db.commit()
+                token = create_access_token(user.id)
+            summary, elapsed = asyncio.run(_upload(content_type, body(rows, seed), token))
+            results[name] = {
+                "imported": summary["imported"],
+                "failed": summary["failed"],
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(rows / elapsed),
+            }
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+    return {"benchmark": "wardrobe_import", "dialect": engine.dialect.name, "rows": rows, "results": results}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.wardrobe_import",
+        description="Stream a large CSV and JSONL wardrobe through POST /wardrobe/items/import.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="SQLAlchemy URL to load (default: a throwaway SQLite file)."
+    )
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows per upload.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        report = run(args.database_url, args.rows, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(f"sqlite:///{Path(tmp) / 'bench.db'}", args.rows, args.seed)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
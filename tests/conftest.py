@@ -7,15 +7,22 @@ from typing import Generator
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
   sys.path.insert(0, str(ROOT_DIR))
 
 from app.db.base import Base
-from app.utils.deps import get_db
+from app.db.session import async_database_url
+from app.db.routing import SessionRouter
+from app.utils.deps import get_async_db, get_db, get_session_router
 from app.main import app
+from app.services.wardrobe_cache import wardrobe_cache
+from app.services.wardrobe_catalog import catalog_cache
 
 
 @pytest.fixture(scope="function")
@@ -30,9 +37,26 @@ def temp_db() -> Generator[str, None, None]:
 
 
 @pytest.fixture(scope="function")
-def client(temp_db: str) -> Generator[TestClient, None, None]:
-  engine = create_engine(temp_db, connect_args={"check_same_thread": False})
-  TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engine(temp_db: str) -> Generator[Engine, None, None]:
+  test_engine = create_engine(temp_db, connect_args={"check_same_thread": False})
+  try:
+    yield test_engine
+  finally:
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def async_engine(temp_db: str) -> Generator[AsyncEngine, None, None]:
+  # NullPool: aiosqlite connections are closed when each request's session ends.
+  test_engine = create_async_engine(async_database_url(temp_db), poolclass=NullPool)
+  yield test_engine
+
+
+@pytest.fixture(scope="function")
+def client(engine: Engine, async_engine: AsyncEngine) -> Generator[TestClient, None, None]:
+  # Same session options as SessionLocal, so query counts match production.
+  TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+  TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
   Base.metadata.create_all(bind=engine)
 
   def override_get_db():
@@ -42,7 +66,16 @@ def client(temp_db: str) -> Generator[TestClient, None, None]:
     finally:
       db.close()
 
+  async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+      yield db
+
   app.dependency_overrides[get_db] = override_get_db
+  app.dependency_overrides[get_async_db] = override_get_async_db
+  router = SessionRouter(TestingSessionLocal, async_primary=TestingAsyncSessionLocal)
+  app.dependency_overrides[get_session_router] = lambda: router
+  wardrobe_cache.clear()
+  catalog_cache.clear()
 
   with TestClient(app) as test_client:
     yield test_client
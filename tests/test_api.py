@@ -133,6 +133,53 @@ def test_update_preferences_sets_and_clears_goal(client):
     assert clear.json()["goal"] is None
 
 
+def test_update_preferences_stores_compatibility_overrides(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    client.patch("/me/preferences", json={"goal": "plan_ahead"}, headers=auth_headers(token))
+
+    update = client.patch(
+        "/me/preferences",
+        json={
+            "goal": "plan_ahead",
+            "color_overrides": [{"colors": ["Red", "Green"], "score": None}],
+            "season_overrides": [{"item": "Cold", "context": "Warm", "score": 0.25}],
+        },
+        headers=auth_headers(token),
+    )
+    assert update.status_code == 200
+    data = update.json()
+    assert data["goal"] == "plan_ahead"
+    assert data["color_overrides"] == [{"colors": ["Red", "Green"], "score": None}]
+    assert data["season_overrides"] == [{"item": "Cold", "context": "Warm", "score": 0.25}]
+
+    invalid = client.patch(
+        "/me/preferences",
+        json={"color_overrides": [{"colors": ["Red", "Teal"], "score": 2}]},
+        headers=auth_headers(token),
+    )
+    assert invalid.status_code == 422
+
+
+def test_update_preferences_keeps_fields_not_sent(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    client.patch("/me/preferences", json={"goal": "plan_ahead"}, headers=auth_headers(token))
+
+    update = client.patch(
+        "/me/preferences",
+        json={"season_overrides": [{"item": "Cold", "context": "Warm", "score": 0.25}]},
+        headers=auth_headers(token),
+    )
+    assert update.status_code == 200
+    assert update.json()["goal"] == "plan_ahead"
+
+    clear = client.patch("/me/preferences", json={"season_overrides": None}, headers=auth_headers(token))
+    assert clear.status_code == 200
+    assert clear.json()["goal"] == "plan_ahead"
+    assert clear.json()["season_overrides"] is None
+
+
 def test_update_preferences_rejects_invalid_goal(client):
     reg = register(client)
     token = reg.json()["token"]["access_token"]
@@ -0,0 +1,102 @@
+import json
+
+from benchmarks import (
+    async_routes,
+    compression,
+    json_serialization,
+    pool_saturation,
+    sqlite_concurrency,
+    startup,
+    wardrobe_import,
+)
+from benchmarks.recommender import main
+
+
+def test_recommender_benchmark_emits_json(tmp_path, temp_db):
+    output = tmp_path / "results.json"
+    main(["--database-url", temp_db, "--profile", "12:30", "--profile", "3", "--repeat", "2", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert report["dialect"] == "sqlite"
+    assert [result["profile"] for result in report["results"]] == ["12:30", "3:0"]
+    for result in report["results"]:
+        for state in ("cold", "warm"):
+            summary = result[state]
+            assert summary["runs"] == 2
+            assert summary["queries"] > 0
+            assert summary["peak_memory_kib"] > 0
+            assert summary["latency_ms"]["min"] <= summary["latency_ms"]["max"]
+
+
+def test_startup_benchmark_compares_boot_paths(tmp_path, temp_db):
+    output = tmp_path / "startup.json"
+    startup.main(["--database-url", temp_db, "--repeat", "2", "--output", str(output)])
+
+    results = json.loads(output.read_text())["results"]
+    assert results["version_check"]["queries"] == 1
+    assert results["reflect_on_boot"]["queries"] > results["version_check"]["queries"]
+
+
+def test_pool_saturation_benchmark_reports_queueing(tmp_path, temp_db):
+    output = tmp_path / "pool.json"
+    args = ["--database-url", temp_db, "--threads", "4", "--requests", "2", "--hold-ms", "5", "--pool-size", "2"]
+    pool_saturation.main(args + ["--output", str(output)])
+
+    (result,) = json.loads(output.read_text())["results"]
+    assert result["completed"] + result["timeouts"] == 8
+    assert result["pool"]["max_in_use"] <= 2
+
+
+def test_sqlite_concurrency_benchmark_compares_profiles(tmp_path):
+    output = tmp_path / "sqlite.json"
+    sqlite_concurrency.main(["--threads", "2", "--requests", "4", "--write-ratio", "0.5", "--output", str(output)])
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {"stock", "tuned"}
+    for result in results.values():
+        assert result["read"]["completed"] + result["write"]["completed"] == 8
+        assert result["read"]["failed"] == result["write"]["failed"] == 0
+
+
+def test_async_routes_benchmark_compares_both_paths(tmp_path, temp_db):
+    output = tmp_path / "async.json"
+    args = ["--database-url", temp_db, "--concurrency", "3", "--requests", "2", "--items", "5", "--db-latency-ms", "1"]
+    async_routes.main(args + ["--output", str(output)])
+
+    (result,) = json.loads(output.read_text())["results"]
+    for path in ("sync", "async"):
+        assert result[path]["completed"] == 6
+        assert result[path]["errors"] == 0
+
+
+def test_wardrobe_import_benchmark_streams_both_formats(tmp_path, temp_db):
+    output = tmp_path / "import.json"
+    wardrobe_import.main(["--database-url", temp_db, "--rows", "200", "--output", str(output)])
+
+    results = json.loads(output.read_text())["results"]
+    for name in ("csv", "jsonl"):
+        assert results[name]["imported"] == 200
+        assert results[name]["failed"] == 0
+
+
+def test_json_serialization_benchmark_matches_response_models(tmp_path, temp_db):
+    output = tmp_path / "json.json"
+    json_serialization.main(["--database-url", temp_db, "--rows", "30", "--repeat", "1", "--output", str(output)])
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {"wardrobe_items", "outfit_history", "calendar_occurrences"}
+    for result in results.values():
+        assert result["rows"] == 30
+        assert result["identical"]
+
+
+def test_compression_benchmark_reports_bytes_saved(tmp_path, temp_db):
+    output = tmp_path / "compression.json"
+    args = ["--database-url", temp_db, "--items", "20", "--outfits", "40", "--repeat", "1"]
+    compression.main(args + ["--output", str(output)])
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {"wardrobe_page", "history_page", "history_all", "calendar_month"}
+    for result in results.values():
+        for codec in result["codecs"]:
+            assert 0 < codec["bytes"] < result["bytes"]
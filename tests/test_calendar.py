@@ -1,5 +1,11 @@
 from datetime import date, timedelta
 
+from sqlalchemy import select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.item_pair_feedback import ItemPairFeedback
+from app.models.item_usage import ItemUsage
+
 from .test_api import auth_headers, register
 
 
@@ -80,3 +86,155 @@ def test_confirm_worn_updates_status_and_reason(client):
     worn_data = worn_resp.json()
     assert worn_data["status"] == "worn"
     assert worn_data["negative_reason"] is None
+
+
+def test_plan_range_creates_distinct_outfits_per_day(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    tops = {_add_item(client, token, "top", color) for color in ["navy", "white", "grey"]}
+    for color in ["black", "blue", "beige"]:
+        _add_item(client, token, "bottom", color)
+    _add_item(client, token, "footwear", "white")
+
+    start = date.today() + timedelta(days=1)
+    end = start + timedelta(days=4)
+    resp = client.post(
+        "/calendar/plan-range",
+        json={"start_date": start.isoformat(), "end_date": end.isoformat()},
+        headers=auth_headers(token),
+    )
+    assert resp.status_code == 200
+    occurrences = resp.json()["occurrences"]
+    assert [entry["date"] for entry in occurrences] == [(start + timedelta(days=n)).isoformat() for n in range(5)]
+    item_sets = [frozenset(entry["outfit"]["item_ids"]) for entry in occurrences]
+    assert len(set(item_sets)) == 5
+    # Items picked earlier in the range count as recently used, so the first days rotate tops.
+    assert {next(iter(s & tops)) for s in item_sets[:3]} == tops
+
+    month = client.get(f"/calendar/month?year={start.year}&month={start.month}", headers=auth_headers(token))
+    planned = {entry["date"]: entry["outfit_id"] for entry in month.json()["occurrences"]}
+    for entry in occurrences:
+        if entry["date"] in planned:
+            assert planned[entry["date"]] == entry["outfit_id"]
+
+
+def test_plan_range_keeps_worn_days_and_replans_others(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    _seed_outfit(client, token)
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+
+    client.post("/calendar/plan-tomorrow", headers=auth_headers(token))
+    worn = client.post(
+        "/calendar/confirm-worn", json={"date": today.isoformat(), "worn": True}, headers=auth_headers(token)
+    ).json()
+
+    resp = client.post(
+        "/calendar/plan-range",
+        json={"start_date": today.isoformat(), "end_date": tomorrow.isoformat()},
+        headers=auth_headers(token),
+    )
+    assert resp.status_code == 200
+    occurrences = resp.json()["occurrences"]
+    assert [entry["date"] for entry in occurrences] == [tomorrow.isoformat()]
+
+    day = client.get(f"/calendar/day?date={today.isoformat()}", headers=auth_headers(token)).json()["occurrence"]
+    assert day["id"] == worn["id"] and day["status"] == "worn"
+    replanned = client.get(f"/calendar/day?date={tomorrow.isoformat()}", headers=auth_headers(token)).json()
+    assert replanned["occurrence"]["outfit_id"] == occurrences[0]["outfit_id"]
+
+
+def test_plan_range_replans_skipped_days_and_rolls_back_rejections(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    user_id = reg.json()["user"]["id"]
+    _seed_outfit(client, token)
+    tomorrow = date.today() + timedelta(days=1)
+    after = tomorrow + timedelta(days=1)
+    range_body = {"start_date": tomorrow.isoformat(), "end_date": after.isoformat()}
+    client.post("/calendar/plan-range", json=range_body, headers=auth_headers(token))
+    for day, reason in ((tomorrow, "Didn't like it"), (after, "Plans changed")):
+        client.post(
+            "/calendar/confirm-worn",
+            json={"date": day.isoformat(), "worn": False, "negative_reason": reason},
+            headers=auth_headers(token),
+        )
+
+    def rejections():
+        Session = sessionmaker(bind=engine)
+        with Session() as db:
+            items = db.scalars(select(ItemUsage.rejections).where(ItemUsage.user_id == user_id)).all()
+            pairs = db.scalars(select(ItemPairFeedback.rejections).where(ItemPairFeedback.user_id == user_id)).all()
+        return set(items), set(pairs)
+
+    assert rejections() == ({1}, {1})
+
+    resp = client.post("/calendar/plan-range", json=range_body, headers=auth_headers(token))
+    assert [entry["date"] for entry in resp.json()["occurrences"]] == [tomorrow.isoformat(), after.isoformat()]
+    assert all(entry["status"] == "planned" for entry in resp.json()["occurrences"])
+    assert rejections() == ({0}, {0})
+
+
+def test_plan_tomorrow_prefers_a_recommendation_made_after_the_range_plan(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    _seed_outfit(client, token)
+    tomorrow = date.today() + timedelta(days=1)
+    resp = client.post(
+        "/calendar/plan-range",
+        json={"start_date": tomorrow.isoformat(), "end_date": (tomorrow + timedelta(days=2)).isoformat()},
+        headers=auth_headers(token),
+    )
+    planned_outfit_id = resp.json()["occurrences"][0]["outfit_id"]
+
+    # Unchanged since the range plan: tomorrow's slot is served as is.
+    kept = client.post("/calendar/plan-tomorrow", headers=auth_headers(token)).json()
+    assert kept["outfit_id"] == planned_outfit_id
+
+    # SQLite timestamps have second resolution; move the plan into the past.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE outfits SET created_at = datetime(created_at, '-1 minute')"))
+    fresh = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+    replanned = client.post("/calendar/plan-tomorrow", headers=auth_headers(token)).json()
+    assert replanned["id"] == kept["id"]
+    assert replanned["outfit_id"] == fresh["id"]
+
+
+def test_plan_tomorrow_prefers_a_recommendation_made_after_a_later_range_plan(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    _seed_outfit(client, token)
+    start = date.today() + timedelta(days=5)
+    client.post(
+        "/calendar/plan-range",
+        json={"start_date": start.isoformat(), "end_date": (start + timedelta(days=2)).isoformat()},
+        headers=auth_headers(token),
+    )
+
+    # Tomorrow is outside the range, so the range's future-dated outfits must not win.
+    fresh = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+    planned = client.post("/calendar/plan-tomorrow", headers=auth_headers(token))
+    assert planned.status_code == 200
+    assert planned.json()["outfit_id"] == fresh["id"]
+
+
+def test_plan_range_validates_range_and_wardrobe(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    today = date.today()
+
+    too_long = client.post(
+        "/calendar/plan-range",
+        json={"start_date": today.isoformat(), "end_date": (today + timedelta(days=31)).isoformat()},
+        headers=auth_headers(token),
+    )
+    assert too_long.status_code == 400
+
+    empty = client.post(
+        "/calendar/plan-range",
+        json={"start_date": today.isoformat(), "end_date": today.isoformat()},
+        headers=auth_headers(token),
+    )
+    assert empty.status_code == 200
+    assert empty.json()["status"] == "need_more_items"
@@ -0,0 +1,104 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from app.utils.compression import (
+    BROTLI,
+    GZIP,
+    SUPPORTED_ENCODINGS,
+    CompressionMiddleware,
+    compress,
+    negotiate_encoding,
+)
+
+from .test_api import auth_headers, register
+
+
+@pytest.fixture
+def token(client):
+    token = register(client).json()["token"]["access_token"]
+    for index in range(20):
+        client.post(
+            "/wardrobe/items",
+            json={"name": f"Navy tee {index}", "category": "top", "color": "navy", "notes": "cotton, regular fit"},
+            headers=auth_headers(token),
+        )
+    return token
+
+
+def _get(client, token, url, accept_encoding):
+    return client.get(url, headers={**auth_headers(token), "Accept-Encoding": accept_encoding})
+
+
+def test_large_json_is_gzipped_with_the_same_etag(client, token):
+    plain = _get(client, token, "/wardrobe/items", "identity")
+    assert "content-encoding" not in plain.headers
+    assert len(plain.content) > 1024
+
+    packed = _get(client, token, "/wardrobe/items", "gzip")
+    assert packed.headers["content-encoding"] == "gzip"
+    assert int(packed.headers["content-length"]) < len(plain.content) / 4
+    assert "Accept-Encoding" in packed.headers["vary"]
+    assert packed.content == plain.content
+    assert packed.headers["etag"] == plain.headers["etag"]
+
+    # The weak ETag revalidates whichever encoding the client cached.
+    again = client.get(
+        "/wardrobe/items",
+        headers={**auth_headers(token), "Accept-Encoding": "gzip", "If-None-Match": packed.headers["etag"]},
+    )
+    assert again.status_code == 304
+    assert "content-encoding" not in again.headers
+
+
+@pytest.mark.skipif(BROTLI not in SUPPORTED_ENCODINGS, reason="brotli is not installed")
+def test_brotli_is_preferred_when_accepted(client, token):
+    plain = _get(client, token, "/wardrobe/items", "identity")
+    packed = _get(client, token, "/wardrobe/items", "gzip, br")
+    assert packed.headers["content-encoding"] == "br"
+    assert packed.content == plain.content
+
+
+def test_small_responses_are_sent_as_is(client):
+    resp = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert resp.json() == {"status": "ok"}
+    assert "content-encoding" not in resp.headers
+    assert "Accept-Encoding" not in resp.headers["vary"]
+
+
+def test_streaming_responses_are_passed_through():
+    async def chunks():
+        for _ in range(3):
+            yield b"x" * 4096
+
+    app = Starlette(routes=[Route("/stream", lambda request: StreamingResponse(chunks(), media_type="text/plain"))])
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+    resp = TestClient(app).get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+    assert resp.content == b"x" * 3 * 4096
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", GZIP),
+        ("gzip;q=0", None),
+        ("br;q=0.5, gzip", GZIP),
+        ("*", SUPPORTED_ENCODINGS[0]),
+        ("*;q=0.8, gzip;q=0", BROTLI if BROTLI in SUPPORTED_ENCODINGS else None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_gzip_output_is_deterministic():
+    body = b'{"name": "Navy tee"}' * 100
+    assert compress(body, GZIP, 6) == compress(body, GZIP, 6)
+    assert gzip.decompress(compress(body, GZIP, 6)) == body
@@ -0,0 +1,139 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from .test_api import auth_headers, register
+
+
+def _token(client, email="test@example.com"):
+    return register(client, email).json()["token"]["access_token"]
+
+
+def _add_item(client, token, category="top", **fields):
+    resp = client.post(
+        "/wardrobe/items",
+        json={"name": f"{category} item", "category": category, "color": "navy", **fields},
+        headers=auth_headers(token),
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _revalidate(client, token, url, etag):
+    return client.get(url, headers={**auth_headers(token), "If-None-Match": etag})
+
+
+def test_unchanged_wardrobe_answers_304(client):
+    token = _token(client)
+    _add_item(client, token)
+
+    first = client.get("/wardrobe/items", headers=auth_headers(token))
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    again = _revalidate(client, token, "/wardrobe/items", etag)
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+    # Weak comparison, lists and "*" all match.
+    assert _revalidate(client, token, "/wardrobe/items", etag.removeprefix("W/")).status_code == 304
+    assert _revalidate(client, token, "/wardrobe/items", f'"other", {etag}').status_code == 304
+    assert _revalidate(client, token, "/wardrobe/items", "*").status_code == 304
+    # Each page or filter is its own representation.
+    assert client.get("/wardrobe/items?category=top", headers=auth_headers(token)).headers["ETag"] != etag
+
+
+def test_wardrobe_writes_change_the_etag(client):
+    token = _token(client)
+    item_id = _add_item(client, token)
+    etags = [client.get("/wardrobe/items", headers=auth_headers(token)).headers["ETag"]]
+
+    client.patch(f"/wardrobe/items/{item_id}", json={"notes": "new"}, headers=auth_headers(token))
+    etags.append(client.get("/wardrobe/items", headers=auth_headers(token)).headers["ETag"])
+    client.post(
+        "/wardrobe/items/import",
+        content=b"name,category,color\nScarf,accessories,red\n",
+        headers={**auth_headers(token), "Content-Type": "text/csv"},
+    )
+    etags.append(client.get("/wardrobe/items", headers=auth_headers(token)).headers["ETag"])
+    client.delete(f"/wardrobe/items/{item_id}", headers=auth_headers(token))
+    etags.append(client.get("/wardrobe/items", headers=auth_headers(token)).headers["ETag"])
+
+    assert len(set(etags)) == 4
+    modified = _revalidate(client, token, "/wardrobe/items", etags[0])
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] == etags[-1]
+
+
+def test_rejected_write_keeps_the_etag(client):
+    token = _token(client)
+    _add_item(client, token)
+    etag = client.get("/wardrobe/items", headers=auth_headers(token)).headers["ETag"]
+
+    bad = client.post(
+        "/wardrobe/items",
+        json={"name": "Odd", "category": "top", "subtype": "Boots", "color": "navy"},
+        headers=auth_headers(token),
+    )
+    assert bad.status_code == 422
+    assert _revalidate(client, token, "/wardrobe/items", etag).status_code == 304
+
+
+def test_etags_are_per_user(client):
+    first, second = _token(client, "a@example.com"), _token(client, "b@example.com")
+    assert (
+        client.get("/wardrobe/items", headers=auth_headers(first)).headers["ETag"]
+        != client.get("/wardrobe/items", headers=auth_headers(second)).headers["ETag"]
+    )
+
+
+def test_304_does_not_load_rows(client, async_engine):
+    token = _token(client)
+    _add_item(client, token)
+    etag = client.get("/wardrobe/items", headers=auth_headers(token)).headers["ETag"]
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        assert _revalidate(client, token, "/wardrobe/items", etag).status_code == 304
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    # Only the user lookup that authenticates the request.
+    assert len(statements) == 1
+    assert "FROM users" in statements[0]
+
+
+def test_history_and_calendar_follow_outfit_changes(client):
+    token = _token(client)
+    for category in ["top", "bottom", "footwear"]:
+        _add_item(client, token, category)
+    today = date.today()
+    urls = ["/outfits/history", f"/calendar/month?year={today.year}&month={today.month}"]
+
+    outfit = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+    etags = {url: client.get(url, headers=auth_headers(token)).headers["ETag"] for url in urls}
+    assert all(_revalidate(client, token, url, etag).status_code == 304 for url, etag in etags.items())
+
+    client.post(f"/outfits/{outfit['id']}/feedback", json={"feedback": "like"}, headers=auth_headers(token))
+    assert all(_revalidate(client, token, url, etag).status_code == 200 for url, etag in etags.items())
+
+    day_url = f"/calendar/day?date={today.isoformat()}"
+    etag = client.get(day_url, headers=auth_headers(token)).headers["ETag"]
+    client.post("/calendar/confirm-worn", json={"date": today.isoformat()}, headers=auth_headers(token))
+    changed = _revalidate(client, token, day_url, etag)
+    assert changed.status_code == 200
+    assert changed.json()["occurrence"]["status"] == "worn"
+
+
+def test_categories_catalog_has_a_stable_etag(client):
+    first = client.get("/wardrobe/categories")
+    etag = first.headers["ETag"]
+    assert client.get("/wardrobe/categories").headers["ETag"] == etag
+
+    again = client.get("/wardrobe/categories", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
@@ -0,0 +1,152 @@
+import json
+
+from app.db.routing import SessionRouter
+from app.main import app
+from app.services.wardrobe_catalog import BASE_CATALOG, CatalogCache, catalog_cache, compile_catalog
+from app.utils.deps import get_db, get_session_router
+
+from .test_api import auth_headers, register
+
+
+def _token(client, email="test@example.com"):
+    return register(client, email).json()["token"]["access_token"]
+
+
+def _add_subtype(client, token, category="top", name="Polo"):
+    return client.post("/wardrobe/subtypes", json={"category": category, "name": name}, headers=auth_headers(token))
+
+
+def _subtypes(resp, category):
+    return next(c["subtypes"] for c in resp.json()["categories"] if c["slug"] == category)
+
+
+def test_anonymous_catalog_is_precompiled_and_publicly_cacheable(client):
+    resp = client.get("/wardrobe/categories")
+    assert resp.status_code == 200
+    assert resp.content == BASE_CATALOG.body
+    assert resp.headers["ETag"] == BASE_CATALOG.etag
+    assert resp.headers["Cache-Control"] == "public, max-age=86400"
+    assert "Authorization" in resp.headers["Vary"]
+    assert _subtypes(resp, "top") == ["General", "T-shirt", "Shirt", "Sweater", "Blouse"]
+
+
+def test_anonymous_catalog_opens_no_database_session(client):
+    def no_session():
+        raise AssertionError("an anonymous catalog request opened a database session")
+
+    app.dependency_overrides[get_db] = no_session
+    app.dependency_overrides[get_session_router] = lambda: SessionRouter(no_session)
+    resp = client.get("/wardrobe/categories")
+    assert resp.status_code == 200
+    assert resp.content == BASE_CATALOG.body
+
+
+def test_catalog_cache_evicts_least_recently_used_users():
+    cache = CatalogCache(max_users=2)
+    for user_id in (1, 2):
+        cache.put(compile_catalog(user_id=user_id))
+    cache.get(1)
+    cache.put(compile_catalog(user_id=3))
+    cache.invalidate(3)
+
+    assert cache.get(1) is not None
+    assert cache.get(2) is None and cache.get(3) is None
+    assert cache.stats() == {"size": 1, "max_size": 2, "hits": 2, "misses": 2, "evictions": 1}
+
+
+def test_custom_subtype_is_merged_into_the_users_catalog_only(client):
+    token = _token(client)
+    other = _token(client, "other@example.com")
+    before = client.get("/wardrobe/categories", headers=auth_headers(token))
+    assert before.content == BASE_CATALOG.body
+    assert before.headers["Cache-Control"] == "private, no-cache"
+
+    created = _add_subtype(client, token)
+    assert created.status_code == 201
+    assert created.json()["category"] == "top" and created.json()["name"] == "Polo"
+
+    after = client.get("/wardrobe/categories", headers=auth_headers(token))
+    assert _subtypes(after, "top")[-1] == "Polo"
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert "Polo" not in _subtypes(client.get("/wardrobe/categories", headers=auth_headers(other)), "top")
+    assert "Polo" not in _subtypes(client.get("/wardrobe/categories"), "top")
+    assert [s["name"] for s in client.get("/wardrobe/subtypes", headers=auth_headers(token)).json()] == ["Polo"]
+
+
+def test_items_validate_against_custom_subtypes(client):
+    token = _token(client)
+    item = {"name": "Pique polo", "category": "top", "subtype": "Polo", "color": "white"}
+    assert client.post("/wardrobe/items", json=item, headers=auth_headers(token)).status_code == 422
+
+    _add_subtype(client, token)
+    created = client.post("/wardrobe/items", json=item, headers=auth_headers(token))
+    assert created.status_code == 201
+    # Custom subtypes are per category.
+    moved = client.patch(
+        f"/wardrobe/items/{created.json()['id']}", json={"category": "bottom"}, headers=auth_headers(token)
+    )
+    assert moved.status_code == 422
+
+    upload = "\n".join(json.dumps({**item, "category": category}) for category in ("top", "bottom"))
+    resp = client.post(
+        "/wardrobe/items/import",
+        content=upload,
+        headers={**auth_headers(token), "Content-Type": "application/x-ndjson"},
+    )
+    assert resp.json()["imported"] == 1
+    assert resp.json()["errors"] == [{"line": 2, "detail": "Invalid subtype for this category."}]
+
+
+def test_duplicate_and_blank_subtypes_are_rejected(client):
+    token = _token(client)
+    assert _add_subtype(client, token, name="shirt").status_code == 409
+    assert _add_subtype(client, token).status_code == 201
+    assert _add_subtype(client, token, name=" POLO ").status_code == 409
+    assert _add_subtype(client, token, category="bottom").status_code == 201
+    assert _add_subtype(client, token, name="   ").status_code == 422
+
+
+def test_subtype_in_use_cannot_be_deleted(client):
+    token = _token(client)
+    subtype_id = _add_subtype(client, token).json()["id"]
+    item = client.post(
+        "/wardrobe/items",
+        json={"name": "Pique polo", "category": "top", "subtype": "Polo", "color": "white"},
+        headers=auth_headers(token),
+    ).json()
+
+    assert client.delete(f"/wardrobe/subtypes/{subtype_id}", headers=auth_headers(token)).status_code == 409
+    client.delete(f"/wardrobe/items/{item['id']}", headers=auth_headers(token))
+    assert client.delete(f"/wardrobe/subtypes/{subtype_id}", headers=auth_headers(token)).status_code == 204
+    assert client.delete(f"/wardrobe/subtypes/{subtype_id}", headers=auth_headers(token)).status_code == 404
+
+    resp = client.get("/wardrobe/categories", headers=auth_headers(token))
+    assert resp.content == BASE_CATALOG.body
+
+
+def test_users_catalog_revalidates_until_it_changes(client):
+    token = _token(client)
+    _add_subtype(client, token)
+    etag = client.get("/wardrobe/categories", headers=auth_headers(token)).headers["ETag"]
+
+    unchanged = client.get("/wardrobe/categories", headers={**auth_headers(token), "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+
+    _add_subtype(client, token, name="Tank")
+    changed = client.get("/wardrobe/categories", headers={**auth_headers(token), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "Tank" in _subtypes(changed, "top")
+
+
+def test_stale_cached_catalog_is_rebuilt_from_the_revision(client):
+    registered = register(client).json()
+    token = registered["token"]["access_token"]
+    client.get("/wardrobe/categories", headers=auth_headers(token))
+    stale = catalog_cache.get(registered["user"]["id"])
+
+    _add_subtype(client, token)
+    # Another worker served the change: this process still holds the old catalog.
+    catalog_cache.put(stale)
+    resp = client.get("/wardrobe/categories", headers=auth_headers(token))
+    assert "Polo" in _subtypes(resp, "top")
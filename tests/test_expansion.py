@@ -0,0 +1,126 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import event
+
+from app.services import expansion
+
+from .test_api import auth_headers, register
+
+
+def _setup(client, outfits=3):
+    token = register(client).json()["token"]["access_token"]
+    ids = []
+    for category in ["top", "bottom", "footwear", "top", "bottom"]:
+        resp = client.post(
+            "/wardrobe/items",
+            json={"name": f"{category} {len(ids)}", "category": category, "color": "navy"},
+            headers=auth_headers(token),
+        )
+        ids.append(resp.json()["id"])
+    for index in range(outfits):
+        item_ids = [ids[2], ids[index % 2], ids[3 + index % 2]]
+        client.post("/outfits", json={"item_ids": item_ids}, headers=auth_headers(token))
+    return token
+
+
+def _history(client, token, query):
+    return client.get(f"/outfits/history?{query}", headers=auth_headers(token))
+
+
+def test_expand_items_embeds_each_outfits_items_in_order(client, async_engine):
+    token = _setup(client)
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        resp = _history(client, token, "expand=items")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    # User lookup, outfits, then one IN query for every outfit's items.
+    assert len(statements) == 3
+    assert sum("FROM clothing_items" in statement for statement in statements) == 1
+
+    plain = _history(client, token, "").json()
+    outfits = resp.json()
+    assert [{k: v for k, v in outfit.items() if k != "items"} for outfit in outfits] == plain
+    for outfit in outfits:
+        assert [item["id"] for item in outfit["items"]] == outfit["item_ids"]
+        for item in outfit["items"]:
+            assert item == client.get(f"/wardrobe/items/{item['id']}", headers=auth_headers(token)).json()
+
+
+def test_large_results_are_built_off_the_event_loop(client, monkeypatch):
+    token = _setup(client)
+    inline = _history(client, token, "all=true&expand=items&fields=id,items.name").json()
+
+    on_loop = []
+    original = expansion._outfit_dicts
+
+    def record(*args):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return original(*args)
+
+    monkeypatch.setattr(expansion, "THREADPOOL_MIN_ROWS", 2)
+    monkeypatch.setattr(expansion, "_outfit_dicts", record)
+    offloaded = _history(client, token, "all=true&expand=items&fields=id,items.name").json()
+    assert offloaded == inline
+    assert on_loop == [False]
+
+
+def test_fields_trim_outfits_and_items(client):
+    token = _setup(client)
+    outfits = _history(client, token, "fields=date,id").json()
+    assert all(list(outfit) == ["id", "date"] for outfit in outfits)
+
+    outfits = _history(client, token, "expand=items&fields=id,items.color,items.name").json()
+    assert all(list(outfit) == ["id", "items"] for outfit in outfits)
+    assert all(list(item) == ["name", "color"] for outfit in outfits for item in outfit["items"])
+
+    # Item fields alone keep every outfit field.
+    outfits = _history(client, token, "expand=items&fields=items.id").json()
+    assert set(outfits[0]) == {"id", "date", "item_ids", "feedback", "created_at", "reason", "items"}
+
+
+def test_sparse_history_pages_without_id(client):
+    token = _setup(client, outfits=3)
+    first = _history(client, token, "fields=feedback&limit=2")
+    assert first.json() == [{"feedback": "none"}] * 2
+    rest = _history(client, token, f"fields=feedback&limit=2&cursor={first.headers['X-Next-Cursor']}")
+    assert len(rest.json()) == 1
+    assert "X-Next-Cursor" not in rest.headers
+
+    everything = _history(client, token, "all=true&expand=items&fields=items.name").json()
+    assert len(everything) == 3
+
+
+def test_invalid_fields_are_rejected(client):
+    token = _setup(client, outfits=1)
+    resp = _history(client, token, "fields=id,colour,items.size&expand=items")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Unknown fields: colour, items.size."
+    assert _history(client, token, "fields=items.name").status_code == 400
+    assert _history(client, token, "expand=wardrobe").status_code == 422
+
+
+def test_calendar_month_expands_planned_outfits(client):
+    token = _setup(client, outfits=1)
+    client.post("/calendar/confirm-worn", json={"date": date.today().isoformat()}, headers=auth_headers(token))
+    plan = client.post("/calendar/plan-tomorrow", headers=auth_headers(token)).json()
+    planned = date.fromisoformat(plan["date"])
+
+    resp = client.get(
+        f"/calendar/month?year={planned.year}&month={planned.month}&expand=items", headers=auth_headers(token)
+    )
+    assert resp.status_code == 200
+    (occurrence,) = [o for o in resp.json()["occurrences"] if o["date"] == plan["date"]]
+    assert [item["id"] for item in occurrence["outfit"]["items"]] == occurrence["outfit"]["item_ids"]
+    assert occurrence["outfit"]["items"][0]["name"]
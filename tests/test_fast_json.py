@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.config import get_settings
+from app.schemas.calendar import MonthCalendarResponse
+from app.schemas.clothing_item import ClothingItemResponse
+from app.schemas.outfit import OutfitResponse
+
+from .test_api import auth_headers, register
+
+
+@pytest.fixture
+def token(client):
+    token = register(client).json()["token"]["access_token"]
+    items = [
+        {"name": "Navy tee", "category": "top", "color": "navy", "color_family": "Blue"},
+        {"name": "Linen shirt", "category": "top", "subtype": "Shirt", "color": "white", "notes": "iron first"},
+        {"name": "Jeans", "category": "bottom", "color": "indigo", "image_url": "https://example.com/j.png"},
+        {"name": "Boots", "category": "footwear", "subtype": "Boots", "color": "brown", "season": "Cold"},
+    ]
+    ids = [client.post("/wardrobe/items", json=item, headers=auth_headers(token)).json()["id"] for item in items]
+    client.patch(f"/wardrobe/items/{ids[0]}", json={"notes": "favourite"}, headers=auth_headers(token))
+    outfit = client.post("/outfits", json={"item_ids": [ids[1], ids[2], ids[3]]}, headers=auth_headers(token)).json()
+    client.post(f"/outfits/{outfit['id']}/feedback", json={"feedback": "like"}, headers=auth_headers(token))
+    client.post("/outfits/recommendation", headers=auth_headers(token))
+    client.post("/calendar/plan-tomorrow", headers=auth_headers(token))
+    client.post("/calendar/confirm-worn", json={"date": date.today().isoformat()}, headers=auth_headers(token))
+    return token
+
+
+def _both(client, token, url):
+    settings = get_settings()
+    assert not settings.fast_json_responses
+    standard = client.get(url, headers=auth_headers(token))
+    settings.fast_json_responses = True
+    try:
+        fast = client.get(url, headers=auth_headers(token))
+    finally:
+        settings.fast_json_responses = False
+    assert standard.status_code == fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.headers.get("X-Next-Cursor") == standard.headers.get("X-Next-Cursor")
+    # Byte-for-byte: same keys, order, and date/enum formatting as the response models.
+    assert fast.content == standard.content
+    return fast
+
+
+@pytest.mark.parametrize(
+    "url", ["/wardrobe/items", "/wardrobe/items?limit=2", "/wardrobe/items?category=top", "/wardrobe/items?q=shi"]
+)
+def test_fast_wardrobe_list_matches_response_model(client, token, url):
+    fast = _both(client, token, url)
+    TypeAdapter(list[ClothingItemResponse]).validate_json(fast.content)
+
+
+def test_fast_wardrobe_list_follows_cursor(client, token):
+    first = _both(client, token, "/wardrobe/items?limit=3")
+    cursor = first.headers["X-Next-Cursor"]
+    _both(client, token, f"/wardrobe/items?limit=3&cursor={cursor}")
+
+
+@pytest.mark.parametrize("url", ["/outfits/history", "/outfits/history?limit=1", "/outfits/history?all=true"])
+def test_fast_history_matches_response_model(client, token, url):
+    fast = _both(client, token, url)
+    outfits = TypeAdapter(list[OutfitResponse]).validate_json(fast.content)
+    assert outfits
+
+
+@pytest.mark.parametrize("expand", ["", "&expand=items"])
+def test_fast_calendar_month_nests_outfits(client, token, expand):
+    occurrences = []
+    tomorrow = date.fromordinal(date.today().toordinal() + 1)
+    for year, month in {(date.today().year, date.today().month), (tomorrow.year, tomorrow.month)}:
+        fast = _both(client, token, f"/calendar/month?year={year}&month={month}{expand}")
+        occurrences += MonthCalendarResponse.model_validate_json(fast.content).occurrences
+    # Tomorrow is planned; today was confirmed worn without a plan, so it has no outfit.
+    assert len(occurrences) == 2
+    for occurrence in occurrences:
+        assert (occurrence.outfit.id if occurrence.outfit else None) == occurrence.outfit_id
+    assert any(occurrence.outfit is None for occurrence in occurrences)
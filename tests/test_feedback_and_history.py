@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 
+from sqlalchemy import text
+
 from .test_api import auth_headers, register
 
 
@@ -53,3 +55,70 @@ def test_history_order(client):
     assert len(outfits) >= 2
     created = [datetime.fromisoformat(o["created_at"]) for o in outfits]
     assert created == sorted(created, reverse=True)
+
+
+def test_history_filters_by_item(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    top_a = _add_item(client, token, "top", "navy")
+    top_b = _add_item(client, token, "top", "white")
+    bottom = _add_item(client, token, "bottom", "grey")
+    shoe = _add_item(client, token, "footwear", "black")
+
+    first = client.post("/outfits", json={"item_ids": [top_a, bottom, shoe]}, headers=auth_headers(token)).json()
+    second = client.post("/outfits", json={"item_ids": [top_b, bottom, shoe]}, headers=auth_headers(token)).json()
+    plan = client.post(
+        "/calendar/plan-range",
+        json={"start_date": datetime.now().date().isoformat(), "end_date": datetime.now().date().isoformat()},
+        headers=auth_headers(token),
+    ).json()
+
+    with_a = client.get(f"/outfits/history?item_id={top_a}", headers=auth_headers(token)).json()
+    assert first["id"] in [outfit["id"] for outfit in with_a]
+    assert second["id"] not in [outfit["id"] for outfit in with_a]
+    assert all(top_a in outfit["item_ids"] for outfit in with_a)
+
+    with_bottom = client.get(f"/outfits/history?item_id={bottom}", headers=auth_headers(token)).json()
+    assert {first["id"], second["id"], plan["occurrences"][0]["outfit_id"]} == {outfit["id"] for outfit in with_bottom}
+
+
+def test_history_pages_with_cursor(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    items = [_add_item(client, token, cat, "black") for cat in ["top", "bottom", "footwear"]]
+    # Saved within the same second, so the pages also exercise the id tie-break.
+    created = [
+        client.post("/outfits", json={"item_ids": items}, headers=auth_headers(token)).json()["id"] for _ in range(5)
+    ]
+
+    seen, cursor = [], None
+    for _ in range(3):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/outfits/history", params=params, headers=auth_headers(token))
+        assert page.status_code == 200
+        seen.extend(outfit["id"] for outfit in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+    assert seen == sorted(created, reverse=True)
+    assert cursor is None
+
+    everything = client.get("/outfits/history?all=true&limit=1", headers=auth_headers(token))
+    assert [outfit["id"] for outfit in everything.json()] == seen
+    assert "X-Next-Cursor" not in everything.headers
+
+    bad = client.get("/outfits/history?cursor=not-a-cursor", headers=auth_headers(token))
+    assert bad.status_code == 400
+
+
+def test_create_outfit_checks_items_against_the_database(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    items = [_add_item(client, token, cat, "black") for cat in ["top", "bottom", "footwear"]]
+    spare = _add_item(client, token, "top", "white")
+    # Warm this process's wardrobe snapshot, then delete an item the way another worker would.
+    assert client.post("/outfits", json={"item_ids": items}, headers=auth_headers(token)).status_code == 201
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM clothing_items WHERE id = :id"), {"id": spare})
+
+    resp = client.post("/outfits", json={"item_ids": [spare, *items[1:]]}, headers=auth_headers(token))
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "Outfits can only contain items from your wardrobe."
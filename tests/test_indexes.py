@@ -0,0 +1,86 @@
+from sqlalchemy import create_engine, event, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.migrations import run_migrations
+from app.models.outfit import Outfit
+from app.services.calendar import get_month_occurrences
+from app.services.recommender import _latest_outfit
+from app.services.wardrobe_cache import load_wardrobe_snapshot, wardrobe_cache
+from app.utils.pagination import encode_cursor, keyset_query
+
+
+def _query_plans(engine, call):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    with engine.connect() as conn:
+        return [
+            " | ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            for statement, parameters in statements
+        ]
+
+
+def _assert_index_search(plan, table, index):
+    assert f"SEARCH {table} USING INDEX {index}" in plan or f"SEARCH {table} USING COVERING INDEX {index}" in plan, plan
+    assert f"SCAN {table}" not in plan, plan
+
+
+def test_month_calendar_uses_user_date_index(client, engine):
+    (plan,) = _query_plans(engine, lambda db: get_month_occurrences(db, 1, 2024, 5))
+    _assert_index_search(plan, "outfit_occurrences", "sqlite_autoindex_outfit_occurrences_1")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_history_uses_user_created_index(client, engine):
+    (plan,) = _query_plans(
+        engine,
+        lambda db: db.query(Outfit).filter(Outfit.user_id == 1).order_by(Outfit.created_at.desc()).all(),
+    )
+    _assert_index_search(plan, "outfits", "ix_outfits_user_id_created_at")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_history_keyset_page_uses_user_created_index(client, engine):
+    def next_page(db):
+        cursor = encode_cursor("2024-05-01 10:00:00", 7)
+        db.execute(keyset_query(db, select(Outfit).where(Outfit.user_id == 1), Outfit, cursor, 50)).all()
+
+    (plan,) = _query_plans(engine, next_page)
+    _assert_index_search(plan, "outfits", "ix_outfits_user_id_created_at")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_recommender_queries_use_composite_indexes(client, engine):
+    wardrobe_cache.clear()
+    snapshot_plan, latest_plan = _query_plans(
+        engine, lambda db: (load_wardrobe_snapshot(db, 1, 0), _latest_outfit(db, 1))
+    )
+    _assert_index_search(snapshot_plan, "clothing_items", "ix_clothing_items_user_id_created_at")
+    _assert_index_search(latest_plan, "outfits", "ix_outfits_user_id_created_at")
+    assert "TEMP B-TREE" not in latest_plan
+
+
+def test_run_migrations_adds_composite_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_outfits_user_id_date"))
+        conn.execute(text("DROP INDEX ix_clothing_items_user_id_category_created_at"))
+
+    run_migrations(engine)
+
+    inspector = inspect(engine)
+    assert "ix_outfits_user_id_date" in {index["name"] for index in inspector.get_indexes("outfits")}
+    assert "ix_clothing_items_user_id_category_created_at" in {
+        index["name"] for index in inspector.get_indexes("clothing_items")
+    }
@@ -0,0 +1,178 @@
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.enums import OutfitFeedback
+from app.models.item_pair_feedback import ItemPairFeedback
+from app.models.item_usage import ItemUsage
+from app.models.outfit import Outfit
+from app.services.item_usage import backfill_item_usage
+
+from .test_api import auth_headers, register
+
+
+def _usage(db, user_id):
+    return {usage.item_id: usage for usage in db.scalars(select(ItemUsage).where(ItemUsage.user_id == user_id))}
+
+
+def _add_item(client, token, category, color):
+    resp = client.post(
+        "/wardrobe/items",
+        json={"name": f"{category} item", "category": category, "color": color},
+        headers=auth_headers(token),
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_recommendation_updates_usage_index(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    user_id = reg.json()["user"]["id"]
+    for cat in ["top", "bottom", "footwear"]:
+        _add_item(client, token, cat, f"{cat}-color")
+
+    first = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+    client.post("/outfits/recommendation", headers=auth_headers(token))
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        usage = _usage(db, user_id)
+
+    assert set(usage) == set(first["item_ids"])
+    assert all(entry.use_count == 2 for entry in usage.values())
+    assert all(entry.last_used_at is not None for entry in usage.values())
+    assert all(entry.last_worn_at is None for entry in usage.values())
+
+
+def test_confirm_worn_records_last_worn(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    user_id = reg.json()["user"]["id"]
+    for cat in ["top", "bottom", "footwear"]:
+        _add_item(client, token, cat, f"{cat}-color")
+    outfit = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+
+    plan = client.post("/calendar/plan-tomorrow", headers=auth_headers(token)).json()
+    worn = client.post(
+        "/calendar/confirm-worn",
+        json={"date": plan["date"], "worn": True},
+        headers=auth_headers(token),
+    )
+    assert worn.status_code == 200
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        usage = _usage(db, user_id)
+
+    assert {item_id: entry.last_worn_at.isoformat() for item_id, entry in usage.items()} == {
+        item_id: plan["date"] for item_id in outfit["item_ids"]
+    }
+
+
+def test_backfill_rebuilds_usage_from_history(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    user_id = reg.json()["user"]["id"]
+    top = _add_item(client, token, "top", "navy")
+    bottom = _add_item(client, token, "bottom", "grey")
+    shoe = _add_item(client, token, "footwear", "white")
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(
+            [
+                Outfit(user_id=user_id, date=date.today(), item_ids=[top, bottom, shoe], feedback=OutfitFeedback.NONE),
+                Outfit(user_id=user_id, date=date.today(), item_ids=[top, shoe], feedback=OutfitFeedback.NONE),
+            ]
+        )
+        db.add(ItemUsage(item_id=bottom, user_id=user_id, use_count=99))
+        db.commit()
+
+        assert backfill_item_usage(db, user_id) == 3
+        usage = _usage(db, user_id)
+
+    assert {item_id: entry.use_count for item_id, entry in usage.items()} == {top: 2, bottom: 1, shoe: 2}
+
+
+def _counters(engine, user_id):
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        items = {
+            item_id: (entry.likes, entry.dislikes, entry.skips, entry.rejections)
+            for item_id, entry in _usage(db, user_id).items()
+        }
+        pairs = {
+            (pair.item_a, pair.item_b): (pair.likes, pair.dislikes, pair.skips, pair.rejections)
+            for pair in db.scalars(select(ItemPairFeedback).where(ItemPairFeedback.user_id == user_id))
+        }
+    return items, pairs
+
+
+def test_feedback_counters_follow_changes_without_double_counting(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    user_id = reg.json()["user"]["id"]
+    for cat in ["top", "bottom", "footwear"]:
+        _add_item(client, token, cat, f"{cat}-color")
+    outfit = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+    item_ids = sorted(outfit["item_ids"])
+
+    for feedback in ["like", "like", "dislike"]:
+        client.post(f"/outfits/{outfit['id']}/feedback", json={"feedback": feedback}, headers=auth_headers(token))
+    items, pairs = _counters(engine, user_id)
+    assert set(items.values()) == {(0, 1, 0, 0)}
+    assert set(pairs) == {(item_ids[0], item_ids[1]), (item_ids[0], item_ids[2]), (item_ids[1], item_ids[2])}
+    assert set(pairs.values()) == {(0, 1, 0, 0)}
+
+    plan = client.post("/calendar/plan-tomorrow", headers=auth_headers(token)).json()
+    client.post(
+        "/calendar/confirm-worn",
+        json={"date": plan["date"], "worn": False, "negative_reason": "Didn't like it"},
+        headers=auth_headers(token),
+    )
+    client.post(
+        "/calendar/confirm-worn",
+        json={"date": plan["date"], "worn": False, "negative_reason": "Didn't like it"},
+        headers=auth_headers(token),
+    )
+    items, pairs = _counters(engine, user_id)
+    assert set(items.values()) == {(0, 1, 0, 1)}
+    assert set(pairs.values()) == {(0, 1, 0, 1)}
+
+    client.post("/calendar/confirm-worn", json={"date": plan["date"], "worn": True}, headers=auth_headers(token))
+    client.post(f"/outfits/{outfit['id']}/feedback", json={"feedback": "none"}, headers=auth_headers(token))
+    incremental = _counters(engine, user_id)
+    assert set(incremental[0].values()) == {(0, 0, 0, 0)}
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        backfill_item_usage(db, user_id)
+    assert _counters(engine, user_id)[0] == incremental[0]
+
+
+def test_backfill_rebuilds_feedback_counters(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    user_id = reg.json()["user"]["id"]
+    top = _add_item(client, token, "top", "navy")
+    bottom = _add_item(client, token, "bottom", "grey")
+    shoe = _add_item(client, token, "footwear", "white")
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(
+            [
+                Outfit(user_id=user_id, date=date.today(), item_ids=[top, bottom, shoe], feedback=OutfitFeedback.DISLIKE),
+                Outfit(user_id=user_id, date=date.today(), item_ids=[top, shoe], feedback=OutfitFeedback.SKIP),
+                Outfit(user_id=user_id, date=date.today(), item_ids=[top, shoe], feedback=OutfitFeedback.LIKE),
+            ]
+        )
+        db.commit()
+        backfill_item_usage(db, user_id)
+
+    items, pairs = _counters(engine, user_id)
+    assert items == {top: (1, 1, 1, 0), bottom: (0, 1, 0, 0), shoe: (1, 1, 1, 0)}
+    assert pairs[tuple(sorted((top, shoe)))] == (1, 1, 1, 0)
+    assert pairs[tuple(sorted((top, bottom)))] == (0, 1, 0, 0)
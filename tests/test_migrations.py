@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, inspect, text
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
 
-from app.db.migrations import run_migrations
+from app.db.migrations import LATEST_VERSION, current_version, ensure_schema, run_migrations
 
 
 def test_run_migrations_adds_metadata_columns(tmp_path):
@@ -34,3 +35,156 @@ def test_run_migrations_adds_metadata_columns(tmp_path):
     assert row.subtype == "General"
     assert row.color_family == "Other"
     assert row.season == "All-season"
+
+
+def test_run_migrations_backfills_outfit_items(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE outfits (
+                    id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    date DATE NOT NULL,
+                    item_ids JSON NOT NULL,
+                    feedback VARCHAR NOT NULL
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO outfits (id, user_id, date, item_ids, feedback) VALUES "
+                "(1, 1, '2024-01-01', '[7, 3, 9]', 'none'), (2, 1, '2024-01-02', '[3]', 'like')"
+            )
+        )
+
+    run_migrations(engine)
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT outfit_id, position, item_id FROM outfit_items ORDER BY outfit_id, position"))
+        assert [tuple(row) for row in rows] == [(1, 0, 7), (1, 1, 3), (1, 2, 9), (2, 0, 3)]
+
+
+def test_fresh_database_is_created_at_latest_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    assert current_version(engine) is None
+    run_migrations(engine)
+    assert current_version(engine) == LATEST_VERSION
+    assert {"users", "outfits", "outfit_items", "item_usage"}.issubset(inspect(engine).get_table_names())
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    ensure_schema(engine)
+    assert len(statements) == 1
+
+
+def test_pending_steps_run_in_order_from_stored_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'partial.db'}")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_outfits_user_id_date"))
+        conn.execute(text("UPDATE schema_version SET version = 3"))
+
+    with pytest.raises(RuntimeError):
+        ensure_schema(engine, auto_migrate=False)
+    assert run_migrations(engine) == 3
+
+    assert current_version(engine) == LATEST_VERSION
+    assert "ix_outfits_user_id_date" in {index["name"] for index in inspect(engine).get_indexes("outfits")}
+
+
+def test_run_migrations_builds_search_index_for_existing_items(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'partial.db'}")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE clothing_items_fts"))
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(text(f"DROP TRIGGER clothing_items_fts_{suffix}"))
+        conn.execute(
+            text(
+                "INSERT INTO clothing_items (user_id, name, category, subtype, color, notes) "
+                "VALUES (1, 'Linen shirt', 'TOP', 'General', 'white', 'summer only')"
+            )
+        )
+        conn.execute(text("UPDATE schema_version SET version = 4"))
+
+    run_migrations(engine)
+
+    match = text("SELECT rowid FROM clothing_items_fts WHERE clothing_items_fts MATCH 'summ*'")
+    with engine.begin() as conn:
+        assert conn.execute(match).all()
+        conn.execute(text("UPDATE clothing_items SET notes = 'all year'"))
+        assert not conn.execute(match).all()
+
+
+def test_run_migrations_adds_user_data_revision(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO users (id, email) VALUES (1, 'old@example.com')"))
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT data_revision FROM users WHERE id = 1")).scalar() == 0
+
+
+def test_run_migrations_adds_user_catalog_revision(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO users (id, email) VALUES (1, 'old@example.com')"))
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT catalog_revision FROM users WHERE id = 1")).scalar() == 0
+        assert conn.execute(text("SELECT COUNT(*) FROM custom_subtypes")).scalar() == 0
+
+
+def test_run_migrations_adds_user_wardrobe_revision(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO users (id, email) VALUES (1, 'old@example.com')"))
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT wardrobe_revision FROM users WHERE id = 1")).scalar() == 0
+
+
+def test_run_migrations_backfills_item_usage_from_history(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'partial.db'}")
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, password_hash) VALUES (1, 'old@example.com', 'x')"))
+        conn.execute(
+            text(
+                "INSERT INTO clothing_items (id, user_id, name, category, subtype, color) VALUES "
+                "(1, 1, 'Shirt', 'TOP', 'General', 'white'), (2, 1, 'Jeans', 'BOTTOM', 'General', 'blue')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO outfits (id, user_id, date, item_ids, feedback, created_at) VALUES "
+                "(1, 1, '2024-01-01', '[1, 2]', 'DISLIKE', '2024-01-01 08:00:00'), "
+                "(2, 1, '2024-01-02', '[1]', 'NONE', '2024-01-02 08:00:00')"
+            )
+        )
+        conn.execute(text("UPDATE schema_version SET version = 8"))
+
+    assert run_migrations(engine) == 8
+
+    assert current_version(engine) == LATEST_VERSION
+    with engine.connect() as conn:
+        usage = conn.execute(text("SELECT item_id, use_count, dislikes FROM item_usage ORDER BY item_id")).all()
+        pairs = conn.execute(text("SELECT item_a, item_b, dislikes FROM item_pair_feedback")).all()
+    assert [tuple(row) for row in usage] == [(1, 2, 1), (2, 1, 1)]
+    assert [tuple(row) for row in pairs] == [(1, 2, 1)]
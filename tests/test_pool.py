@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import Settings
+from app.db.pool import InstrumentedQueuePool, PoolMetrics
+from app.db.session import engine_options
+
+
+def test_engine_options_follow_settings(temp_db):
+    options = engine_options(
+        Settings(database_url=temp_db, db_pool_size=3, db_max_overflow=1, db_pool_timeout=2.5, db_pool_pre_ping=True)
+    )
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"], options["pool_timeout"]) == (3, 1, 2.5)
+    assert options["pool_pre_ping"] is True
+
+    assert "poolclass" not in engine_options(Settings(database_url="sqlite:///:memory:"))
+
+
+def test_pool_metrics_track_in_use_waits_and_timeouts(temp_db):
+    settings = Settings(database_url=temp_db, db_pool_size=1, db_max_overflow=0, db_pool_timeout=0.05)
+    engine = create_engine(temp_db, **engine_options(settings))
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert metrics.stats(engine)["in_use"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = metrics.stats(engine)
+    assert stats["in_use"] == 0
+    assert stats["max_in_use"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["size"] == 1
+
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert metrics.stats(engine)["checkouts"] == 2
+
+
+def test_metrics_endpoint_reports_pool(client):
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert {"in_use", "max_in_use", "timeouts", "wait_max_ms"}.issubset(resp.json()["db_pool"])
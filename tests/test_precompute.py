@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.outfit import Outfit
+from app.services.precompute import precompute_tomorrow
+
+from .test_api import auth_headers, register
+
+
+def _plan_ahead_user(client, email, categories=("top", "bottom", "footwear")):
+    token = register(client, email).json()["token"]["access_token"]
+    resp = client.patch("/me/preferences", json={"goal": "plan_ahead"}, headers=auth_headers(token))
+    assert resp.status_code == 200
+    for cat in categories:
+        client.post(
+            "/wardrobe/items",
+            json={"name": f"{cat} item", "category": cat, "color": "black"},
+            headers=auth_headers(token),
+        )
+    return token
+
+
+def test_precompute_plans_tomorrow_for_plan_ahead_users(client, engine):
+    planners = [_plan_ahead_user(client, f"planner{i}@example.com") for i in range(3)]
+    _plan_ahead_user(client, "sparse@example.com", categories=("top",))
+    daily = register(client, "daily@example.com").json()["token"]["access_token"]
+
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    counts = precompute_tomorrow(Session, batch_size=2, concurrency=2)
+    assert counts == {"planned": 3, "skipped": 1, "failed": 0}
+
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    for token in planners:
+        day = client.get(f"/calendar/day?date={tomorrow}", headers=auth_headers(token)).json()["occurrence"]
+        assert day["status"] == "planned"
+        assert day["outfit"]["date"] == tomorrow
+
+        planned = client.post("/calendar/plan-tomorrow", headers=auth_headers(token))
+        assert planned.status_code == 200
+        assert planned.json()["id"] == day["id"]
+        assert planned.json()["outfit_id"] == day["outfit_id"]
+
+    daily_day = client.get(f"/calendar/day?date={tomorrow}", headers=auth_headers(daily)).json()
+    assert daily_day["occurrence"] is None
+
+    with Session() as db:
+        outfits = db.scalar(select(func.count()).select_from(Outfit))
+    assert precompute_tomorrow(Session, batch_size=2, concurrency=2) == {"planned": 0, "skipped": 4, "failed": 0}
+    with Session() as db:
+        assert db.scalar(select(func.count()).select_from(Outfit)) == outfits
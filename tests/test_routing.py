@@ -0,0 +1,126 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.routing import SessionRouter
+from app.db.session import async_database_url
+from app.main import app
+from app.services.wardrobe_cache import wardrobe_cache
+from app.utils.deps import get_async_db, get_db, get_session_router
+
+from .test_api import auth_headers, register
+
+
+def test_router_sticks_to_primary_after_a_write():
+    now = [100.0]
+    router = SessionRouter(lambda: "primary", lambda: "replica", sticky_seconds=5, clock=lambda: now[0])
+
+    assert router.read_session(1) == "replica"
+    router.record_write(1)
+    assert router.read_session(1) == "primary"
+    assert router.read_session(2) == "replica"
+    now[0] += 5
+    assert router.read_session(1) == "replica"
+
+
+def test_router_without_replica_reads_from_primary():
+    router = SessionRouter(lambda: "primary")
+    router.record_write(1)
+    assert router.read_session(1) == "primary"
+    assert not router.has_replica
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    # Two SQLite files stand in for primary and replica; replicate() copies one onto the other.
+    urls = {name: f"sqlite:///{tmp_path / f'{name}.db'}" for name in ("primary", "replica")}
+    engines = {name: create_engine(url, poolclass=NullPool) for name, url in urls.items()}
+    async_engines = {
+        name: create_async_engine(async_database_url(url), poolclass=NullPool) for name, url in urls.items()
+    }
+    for engine in engines.values():
+        Base.metadata.create_all(bind=engine)
+    sessions = {name: sessionmaker(bind=engine, expire_on_commit=False) for name, engine in engines.items()}
+    async_sessions = {
+        name: async_sessionmaker(bind=engine, expire_on_commit=False) for name, engine in async_engines.items()
+    }
+    now = [0.0]
+    router = SessionRouter(
+        sessions["primary"],
+        sessions["replica"],
+        async_sessions["primary"],
+        async_sessions["replica"],
+        sticky_seconds=5,
+        clock=lambda: now[0],
+    )
+
+    def override_get_db():
+        with sessions["primary"]() as db:
+            yield db
+
+    async def override_get_async_db():
+        async with async_sessions["primary"]() as db:
+            yield db
+
+    def replicate():
+        with sqlite3.connect(tmp_path / "primary.db") as source, sqlite3.connect(tmp_path / "replica.db") as target:
+            source.backup(target)
+
+    app.dependency_overrides.update(
+        {get_db: override_get_db, get_async_db: override_get_async_db, get_session_router: lambda: router}
+    )
+    wardrobe_cache.clear()
+    with TestClient(app) as client:
+        yield client, replicate, now
+    app.dependency_overrides.clear()
+    for engine in engines.values():
+        engine.dispose()
+
+
+def test_reads_go_to_replica_except_right_after_a_write(replicated):
+    client, replicate, now = replicated
+    token = register(client).json()["token"]["access_token"]
+    headers = auth_headers(token)
+    client.post("/wardrobe/items", json={"name": "Tee", "category": "top", "color": "white"}, headers=headers)
+    replicate()
+    now[0] += 10
+
+    assert len(client.get("/wardrobe/items", headers=headers).json()) == 1
+
+    # Not replicated yet: the writer still sees it, because their reads stick to the primary.
+    client.post("/wardrobe/items", json={"name": "Jeans", "category": "bottom", "color": "blue"}, headers=headers)
+    assert len(client.get("/wardrobe/items", headers=headers).json()) == 2
+    assert client.get("/me", headers=headers).status_code == 200
+
+    now[0] += 10
+    assert len(client.get("/wardrobe/items", headers=headers).json()) == 1
+
+    replicate()
+    assert len(client.get("/wardrobe/items", headers=headers).json()) == 2
+
+
+def test_new_account_reads_from_primary_before_replication(replicated):
+    client, replicate, now = replicated
+    token = register(client).json()["token"]["access_token"]
+
+    # The replica has no users yet; registration must already have pinned reads to the primary.
+    assert client.get("/me", headers=auth_headers(token)).status_code == 200
+    assert client.get("/wardrobe/items", headers=auth_headers(token)).json() == []
+
+
+def test_failed_write_does_not_pin_reads_to_primary(replicated):
+    client, replicate, now = replicated
+    token = register(client).json()["token"]["access_token"]
+    replicate()
+    now[0] += 10
+
+    missing = client.patch("/wardrobe/items/999", json={"name": "Nope"}, headers=auth_headers(token))
+    assert missing.status_code == 404
+    user_id = client.get("/me", headers=auth_headers(token)).json()["id"]
+    assert not app.dependency_overrides[get_session_router]().reads_from_primary(user_id)
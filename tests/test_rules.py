@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from sqlalchemy import event
+
 from .test_api import auth_headers, register
 
 
@@ -64,3 +66,87 @@ def test_recommendation_can_use_one_piece_without_bottom(client):
     assert one_piece_id in item_ids
     assert footwear_id in item_ids
     assert all(wardrobe[item_id] != "bottom" for item_id in item_ids)
+
+
+def _count_recommendation_statements(client, engine, token):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        rec = client.post("/outfits/recommendation", headers=auth_headers(token))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert rec.status_code == 201
+    return len(statements)
+
+
+def test_recommendation_query_count_is_constant_in_history_length(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+
+    for cat in ["top", "top", "bottom", "bottom", "footwear", "outerwear"]:
+        _add_item(client, token, cat, f"{cat}-color")
+
+    client.post("/outfits/recommendation", headers=auth_headers(token))
+    short_history = _count_recommendation_statements(client, engine, token)
+
+    for _ in range(15):
+        client.post("/outfits/recommendation", headers=auth_headers(token))
+    long_history = _count_recommendation_statements(client, engine, token)
+
+    assert short_history == long_history
+    assert short_history > 0
+    # auth lookup + usage index + pair feedback + last outfit + outfit insert + outfit_items insert
+    # + usage upsert + revision bump + refresh; the wardrobe itself comes from the snapshot cache
+    # after the first call
+    assert long_history <= 9
+
+
+def test_ranked_recommendations_are_distinct_and_not_persisted(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    for cat in ["top", "top", "top", "bottom", "bottom", "footwear", "footwear", "one_piece"]:
+        _add_item(client, token, cat, f"{cat}-color")
+    last = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+
+    resp = client.post("/outfits/recommendations?k=4", headers=auth_headers(token))
+    assert resp.status_code == 200
+    ranked = resp.json()["recommendations"]
+    assert [entry["rank"] for entry in ranked] == [1, 2, 3, 4]
+    item_sets = [frozenset(entry["item_ids"]) for entry in ranked]
+    assert len(set(item_sets)) == 4
+    assert frozenset(last["item_ids"]) not in item_sets
+    assert all(entry["reason"] for entry in ranked)
+
+    history = client.get("/outfits/history", headers=auth_headers(token)).json()
+    assert [outfit["id"] for outfit in history] == [last["id"]]
+
+
+def test_ranked_recommendations_report_missing_categories(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    _add_item(client, token, "top", "navy")
+
+    resp = client.post("/outfits/recommendations?k=3", headers=auth_headers(token))
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "need_more_items"
+    assert set(resp.json()["missing_categories"]) == {"bottom", "footwear", "one_piece"}
+
+
+def test_save_chosen_alternative(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    for cat in ["top", "top", "bottom", "footwear"]:
+        _add_item(client, token, cat, f"{cat}-color")
+    ranked = client.post("/outfits/recommendations?k=2", headers=auth_headers(token)).json()["recommendations"]
+
+    saved = client.post("/outfits", json={"item_ids": ranked[1]["item_ids"]}, headers=auth_headers(token))
+    assert saved.status_code == 201
+    assert saved.json()["item_ids"] == ranked[1]["item_ids"]
+
+    other = register(client, email="other@example.com").json()["token"]["access_token"]
+    rejected = client.post("/outfits", json={"item_ids": ranked[0]["item_ids"]}, headers=auth_headers(other))
+    assert rejected.status_code == 422
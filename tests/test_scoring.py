@@ -0,0 +1,205 @@
+import itertools
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from app.models.enums import ClothingCategory, ColorFamily, Season
+from app.services.compatibility import COLOR_INDEX, DEFAULT_TABLES, tables_for
+from app.services.scoring import (
+    COLOR_FAMILIES,
+    COLOR_HARMONY,
+    COLOR_WEIGHT,
+    SKIPPED,
+    CategoryFeatures,
+    Slot,
+    UsageFeatures,
+    item_scores,
+    pair_penalty,
+    pick_diverse,
+    search_outfits,
+    season_allowed,
+    SEASON_INDEX,
+    season_context,
+    shortlist_ids,
+)
+from app.services.wardrobe_cache import WardrobeEntry
+
+NOW = datetime(2024, 7, 1, tzinfo=timezone.utc)
+CREATED = datetime(2024, 1, 1)
+
+
+def _features(category, *specs):
+    return CategoryFeatures(
+        [WardrobeEntry(item_id, category, color, season, CREATED) for item_id, color, season in specs]
+    )
+
+
+def test_season_context_follows_month():
+    assert season_context(date(2024, 7, 15)) == SEASON_INDEX[Season.WARM]
+    assert season_context(date(2024, 1, 15)) == SEASON_INDEX[Season.COLD]
+    assert season_context(date(2024, 4, 15)) == SEASON_INDEX[Season.ALL_SEASON]
+
+
+def test_item_scores_prefer_unused_liked_and_in_season_items():
+    tops = _features(
+        ClothingCategory.TOP,
+        (1, ColorFamily.BLUE, Season.ALL_SEASON),
+        (2, ColorFamily.BLUE, Season.ALL_SEASON),
+        (3, ColorFamily.BLUE, Season.COLD),
+        (4, ColorFamily.BLUE, Season.ALL_SEASON),
+        (5, ColorFamily.BLUE, Season.ALL_SEASON),
+    )
+    usage = UsageFeatures(
+        {1: NOW - timedelta(hours=1), 2: NOW - timedelta(days=60)},
+        {4: (0, 3)},
+    )
+    scores = item_scores(tops, usage, NOW, season_context(NOW.date()))
+
+    assert scores[1] > scores[0]  # idle for two months beats worn an hour ago
+    assert scores[2] < scores[4]  # cold-weather item in July
+    assert scores[3] < scores[4]  # disliked item
+
+
+def test_search_outfits_orders_by_total_and_penalises_clashes():
+    tops = _features(ClothingCategory.TOP, (1, ColorFamily.RED, Season.ALL_SEASON), (2, ColorFamily.BLUE, Season.ALL_SEASON))
+    bottoms = _features(ClothingCategory.BOTTOM, (3, ColorFamily.GREEN, Season.ALL_SEASON))
+    shoes = _features(ClothingCategory.FOOTWEAR, (4, ColorFamily.BLACK, Season.ALL_SEASON))
+
+    ids, scores = search_outfits(
+        [Slot(tops, np.array([1.0, 0.9])), Slot(bottoms, np.array([1.0])), Slot(shoes, np.array([1.0]))], pool_size=5
+    )
+
+    assert ids.tolist() == [[1, 3, 4], [2, 3, 4]]
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_search_outfits_prefers_harmonious_colors():
+    tops = _features(ClothingCategory.TOP, (1, ColorFamily.RED, Season.ALL_SEASON), (2, ColorFamily.WHITE, Season.ALL_SEASON))
+    bottoms = _features(ClothingCategory.BOTTOM, (3, ColorFamily.GREEN, Season.ALL_SEASON))
+
+    ids, _ = search_outfits([Slot(tops, np.array([1.0, 1.0])), Slot(bottoms, np.array([1.0]))], pool_size=5)
+
+    assert ids[0].tolist() == [2, 3]
+
+
+def test_search_outfits_can_skip_optional_slot():
+    tops = _features(ClothingCategory.TOP, (1, ColorFamily.BLUE, Season.ALL_SEASON))
+    coats = _features(ClothingCategory.OUTERWEAR, (2, ColorFamily.BLUE, Season.COLD))
+
+    ids, _ = search_outfits([Slot(tops, np.array([1.0])), Slot(coats, np.array([-0.5]), optional=True)], pool_size=5)
+
+    assert ids.tolist() == [[1, SKIPPED], [1, 2]]
+
+
+def test_search_outfits_matches_exhaustive_ranking():
+    rng = np.random.default_rng(7)
+    slots = [
+        Slot(
+            _features(
+                category,
+                *[(offset + idx, COLOR_FAMILIES[int(rng.integers(len(COLOR_FAMILIES)))], Season.ALL_SEASON) for idx in range(6)],
+            ),
+            rng.normal(size=6),
+        )
+        for offset, category in ((100, ClothingCategory.TOP), (200, ClothingCategory.BOTTOM), (300, ClothingCategory.FOOTWEAR))
+    ]
+    ids, scores = search_outfits(slots, pool_size=10)
+
+    exhaustive = []
+    for combo in itertools.product(range(6), repeat=3):
+        total = sum(slot.scores[idx] for slot, idx in zip(slots, combo))
+        for i, j in itertools.combinations(range(3), 2):
+            total += COLOR_WEIGHT * COLOR_HARMONY[slots[i].features.colors[combo[i]], slots[j].features.colors[combo[j]]]
+        exhaustive.append(total)
+
+    assert np.allclose(scores, sorted(exhaustive, reverse=True)[:10])
+
+
+def test_pick_diverse_skips_last_outfit_and_spreads_items():
+    ids = np.array([[1, 3, 5], [1, 3, 6], [2, 4, 6], [1, 4, 5]])
+    scores = np.array([3.0, 2.9, 2.6, 2.4])
+
+    assert pick_diverse(ids, scores, k=2) == [0, 2]
+    assert pick_diverse(ids, scores, k=1, avoid=[[5, 3, 1]]) == [1]
+    assert pick_diverse(ids[:1], scores[:1], k=1, avoid=[[1, 3, 5]]) == [0]
+    assert pick_diverse(ids, scores, k=1, avoid=[[1, 3, 5], [1, 3, 6]]) == [2]
+
+
+def test_usage_mark_used_updates_known_and_new_items():
+    usage = UsageFeatures({1: NOW - timedelta(days=30), 5: NOW - timedelta(days=30)}, {5: (2, 0)})
+    updated = usage.mark_used([3, 5], NOW)
+
+    last_used, likes, _ = updated.gather(np.array([1, 3, 5, 7]))
+    assert last_used[1] == last_used[2] == NOW.timestamp()
+    assert last_used[0] < NOW.timestamp()
+    assert np.isnan(last_used[3])
+    assert likes.tolist() == [0.0, 0.0, 2.0, 0.0]
+    assert np.isnan(usage.gather(np.array([3]))[0][0])
+
+
+def test_search_outfits_applies_pair_penalties():
+    tops = _features(ClothingCategory.TOP, (1, ColorFamily.BLACK, Season.ALL_SEASON), (2, ColorFamily.BLACK, Season.ALL_SEASON))
+    bottoms = _features(ClothingCategory.BOTTOM, (3, ColorFamily.BLACK, Season.ALL_SEASON))
+    shoes = _features(ClothingCategory.FOOTWEAR, (4, ColorFamily.BLACK, Season.ALL_SEASON))
+    slots = [Slot(tops, np.array([1.0, 0.9])), Slot(bottoms, np.array([1.0])), Slot(shoes, np.array([1.0]))]
+
+    ids, scores = search_outfits(slots, pool_size=2, pair_penalties={(1, 3): pair_penalty(0, 2, 0, 1)})
+
+    assert ids.tolist() == [[2, 3, 4], [1, 3, 4]]
+    assert scores[1] == 3.0 - pair_penalty(0, 2, 0, 1)
+    assert pair_penalty(3, 0, 0, 0) == 0.0
+
+
+def test_shortlist_ids_cover_what_search_outfits_can_pick():
+    tops = _features(
+        ClothingCategory.TOP,
+        (1, ColorFamily.BLACK, Season.ALL_SEASON),
+        (2, ColorFamily.BLACK, Season.ALL_SEASON),
+        (3, ColorFamily.BLACK, Season.ALL_SEASON),
+    )
+    coats = _features(ClothingCategory.OUTERWEAR, (4, ColorFamily.BLACK, Season.ALL_SEASON))
+    slots = [Slot(tops, np.array([0.1, 0.9, 0.5])), Slot(coats, np.array([1.0]), optional=True)]
+
+    # Item 1 falls outside the shortlist, and the empty optional slot is not an item.
+    assert shortlist_ids(slots, shortlist_size=2) == {2, 3, 4}
+
+
+def test_preference_overrides_build_cached_tables():
+    preferences = {
+        "color_overrides": [{"colors": ["Red", "Green"], "score": None}, {"colors": ["Blue", "Brown"], "score": 0.5}],
+        "season_overrides": [{"item": "Cold", "context": "Warm", "score": 0.0}],
+    }
+    tables = tables_for(preferences)
+    red, green = COLOR_INDEX[ColorFamily.RED], COLOR_INDEX[ColorFamily.GREEN]
+    blue, brown = COLOR_INDEX[ColorFamily.BLUE], COLOR_INDEX[ColorFamily.BROWN]
+    cold, warm = SEASON_INDEX[Season.COLD], SEASON_INDEX[Season.WARM]
+
+    assert tables is tables_for(dict(preferences))
+    assert tables_for({"goal": "daily"}) is DEFAULT_TABLES
+    assert tables.color_blocked[red, green] and tables.color_blocked[green, red]
+    assert tables.color_harmony[blue, brown] == tables.color_harmony[brown, blue] == 0.5
+    assert DEFAULT_TABLES.season_blocked[cold, warm]
+    assert not tables.season_blocked[cold, warm]
+    assert tables.season_fit[cold, warm] == 0.0
+
+
+def test_search_outfits_leaves_out_blocked_colors_and_seasons():
+    tops = _features(ClothingCategory.TOP, (1, ColorFamily.RED, Season.ALL_SEASON), (2, ColorFamily.BLUE, Season.ALL_SEASON))
+    bottoms = _features(ClothingCategory.BOTTOM, (3, ColorFamily.GREEN, Season.ALL_SEASON))
+    shoes = _features(ClothingCategory.FOOTWEAR, (4, ColorFamily.BLACK, Season.ALL_SEASON))
+    coats = _features(ClothingCategory.OUTERWEAR, (5, ColorFamily.BLACK, Season.COLD))
+    tables = tables_for({"color_overrides": [{"colors": ["Red", "Green"], "score": None}]})
+    warm = SEASON_INDEX[Season.WARM]
+
+    ids, _ = search_outfits(
+        [
+            Slot(tops, np.array([2.0, 0.5])),
+            Slot(bottoms, np.array([1.0])),
+            Slot(shoes, np.array([1.0])),
+            Slot(coats, np.array([5.0]), optional=True, allowed=season_allowed(coats, warm, tables)),
+        ],
+        pool_size=1,
+        tables=tables,
+    )
+
+    assert ids.tolist() == [[2, 3, 4, SKIPPED]]
@@ -0,0 +1,70 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import Settings
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.session import async_database_url, configure_sqlite, engine_options
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_profile_is_applied_to_new_connections(temp_db):
+    engine = create_engine(temp_db)
+    configure_sqlite(engine, Settings(database_url=temp_db))
+
+    with engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "busy_timeout") == 5000
+        assert _pragma(conn, "foreign_keys") == 0
+        assert _pragma(conn, "cache_size") == -64 * 1024
+    engine.dispose()
+
+
+def test_sqlite_profile_follows_settings(temp_db):
+    engine = create_engine(temp_db)
+    settings = Settings(
+        database_url=temp_db,
+        sqlite_journal_mode="DELETE",
+        sqlite_synchronous="FULL",
+        sqlite_mmap_size=0,
+        sqlite_busy_timeout_ms=250,
+        sqlite_foreign_keys=True,
+    )
+    configure_sqlite(engine, settings)
+
+    with engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "delete"
+        assert _pragma(conn, "synchronous") == 2  # FULL
+        assert _pragma(conn, "mmap_size") == 0
+        assert _pragma(conn, "busy_timeout") == 250
+        assert _pragma(conn, "foreign_keys") == 1
+    engine.dispose()
+
+
+def test_async_url_uses_asyncio_drivers():
+    assert async_database_url("sqlite:///./outfitguru.db").drivername == "sqlite+aiosqlite"
+    assert async_database_url("postgresql://u:p@db/app").drivername == "postgresql+psycopg"
+    assert async_database_url("postgresql+psycopg2://u:p@db/app").drivername == "postgresql+psycopg"
+    assert str(async_database_url("sqlite:///x.db", "sqlite+aiosqlite:///y.db")) == "sqlite+aiosqlite:///y.db"
+
+
+def test_async_engine_gets_sqlite_profile_and_pool(temp_db):
+    settings = Settings(database_url=temp_db, db_pool_size=2)
+    engine = create_async_engine(
+        async_database_url(temp_db), **engine_options(settings, poolclass=InstrumentedAsyncQueuePool)
+    )
+    configure_sqlite(engine.sync_engine, settings)
+
+    async def read_profile():
+        async with engine.connect() as conn:
+            profile = [(await conn.execute(text(f"PRAGMA {name}"))).scalar() for name in ("journal_mode", "busy_timeout")]
+        await engine.dispose()
+        return profile
+
+    assert asyncio.run(read_profile()) == ["wal", 5000]
+    assert engine.pool.size() == 2
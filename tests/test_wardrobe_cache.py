@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.models.enums import ClothingCategory, ColorFamily, Season
+from app.services.wardrobe_cache import WardrobeCache, WardrobeEntry, WardrobeSnapshot, wardrobe_cache
+
+from .test_api import auth_headers, register
+
+
+def _add_item(client, token, category, color):
+    resp = client.post(
+        "/wardrobe/items",
+        json={"name": f"{category} item", "category": category, "color": color},
+        headers=auth_headers(token),
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _snapshot(user_id: int) -> WardrobeSnapshot:
+    entry = WardrobeEntry(user_id, ClothingCategory.TOP, ColorFamily.BLUE, Season.ALL_SEASON, datetime(2024, 1, 1))
+    return WardrobeSnapshot(user_id, {ClothingCategory.TOP: (entry,)})
+
+
+def test_cache_evicts_least_recently_used_user():
+    cache = WardrobeCache(max_users=2)
+    for user_id in (1, 2):
+        cache.put(_snapshot(user_id))
+    assert cache.get(1) is not None  # 2 is now least recently used
+    cache.put(_snapshot(3))
+
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+
+def test_invalidating_one_user_keeps_the_others():
+    cache = WardrobeCache(max_users=4)
+    for user_id in (1, 2):
+        cache.put(_snapshot(user_id))
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+
+def test_wardrobe_writes_invalidate_snapshot(client):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    for cat in ["top", "bottom", "footwear"]:
+        _add_item(client, token, cat, f"{cat}-color")
+
+    client.post("/outfits/recommendation", headers=auth_headers(token))
+    client.post("/outfits/recommendation", headers=auth_headers(token))
+    assert wardrobe_cache.stats()["hits"] >= 1
+
+    new_top = _add_item(client, token, "top", "red")
+    rec = client.post("/outfits/recommendation", headers=auth_headers(token))
+    assert new_top in rec.json()["item_ids"]
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.json()["wardrobe_cache"]["misses"] >= 2
+
+
+def test_snapshot_follows_wardrobe_changes_made_by_another_worker(client, engine):
+    reg = register(client)
+    token = reg.json()["token"]["access_token"]
+    tops = [_add_item(client, token, "top", "navy") for _ in range(2)]
+    for cat in ["bottom", "footwear"]:
+        _add_item(client, token, cat, "black")
+    first = client.post("/outfits/recommendation", headers=auth_headers(token)).json()
+    unused_top = next(top for top in tops if top not in first["item_ids"])
+
+    # Deleted through another worker: this process still caches the snapshot with it.
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM clothing_items WHERE id = :id"), {"id": unused_top})
+        conn.execute(text("UPDATE users SET wardrobe_revision = wardrobe_revision + 1"))
+    rec = client.post("/outfits/recommendation", headers=auth_headers(token))
+    assert rec.status_code == 201
+    assert unused_top not in rec.json()["item_ids"]
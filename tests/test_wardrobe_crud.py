@@ -91,3 +91,68 @@ def test_delete_blocked_when_used_in_outfit(client):
 
   delete_attempt = client.delete(f"/wardrobe/items/{top}", headers=auth_headers(token))
   assert delete_attempt.status_code == 409
+
+
+def test_list_pages_with_cursor(client):
+  reg = register(client)
+  token = reg.json()["token"]["access_token"]
+  created = [
+      client.post(
+          "/wardrobe/items",
+          json={"name": f"Tee {idx}", "category": "top", "color": "white"},
+          headers=auth_headers(token),
+      ).json()["id"]
+      for idx in range(5)
+  ]
+
+  first = client.get("/wardrobe/items?limit=3", headers=auth_headers(token))
+  cursor = first.headers["X-Next-Cursor"]
+  second = client.get(f"/wardrobe/items?limit=3&cursor={cursor}", headers=auth_headers(token))
+  assert "X-Next-Cursor" not in second.headers
+  assert [item["id"] for item in first.json() + second.json()] == sorted(created, reverse=True)
+
+  legacy = client.get("/wardrobe/items?limit=3&offset=3", headers=auth_headers(token))
+  assert [item["id"] for item in legacy.json()] == [item["id"] for item in second.json()]
+
+  both = client.get(f"/wardrobe/items?offset=1&cursor={cursor}", headers=auth_headers(token))
+  assert both.status_code == 400
+
+
+def test_search_matches_prefixes_and_ranks_by_relevance(client):
+  reg = register(client)
+  token = reg.json()["token"]["access_token"]
+
+  def add(name, category, color, notes=None):
+    resp = client.post(
+        "/wardrobe/items",
+        json={"name": name, "category": category, "color": color, "notes": notes},
+        headers=auth_headers(token),
+    )
+    return resp.json()["id"]
+
+  shirt = add("Blue oxford shirt", "top", "blue", notes="blue stripes, blue buttons")
+  jeans = add("Slim jeans", "bottom", "blue")
+  boots = add("Chelsea boots", "footwear", "brown", notes="resoled 2023")
+
+  def search(q):
+    resp = client.get("/wardrobe/items", params={"q": q}, headers=auth_headers(token))
+    assert resp.status_code == 200
+    return [item["id"] for item in resp.json()]
+
+  assert search("blu") == [shirt, jeans]
+  assert search("chel") == [boots]
+  assert search("resol") == [boots]
+  assert search("footwear") == [boots]
+  assert search("blue jea") == [jeans]
+  assert search("???") == []
+
+  client.patch(f"/wardrobe/items/{jeans}", json={"name": "Slim chinos", "color": "khaki"}, headers=auth_headers(token))
+  assert search("jeans") == []
+  assert search("chino") == [jeans]
+
+  client.delete(f"/wardrobe/items/{boots}", headers=auth_headers(token))
+  assert search("chelsea") == []
+
+  other = register(client, email="other@example.com").json()["token"]["access_token"]
+  resp = client.get("/wardrobe/items", params={"q": "blue"}, headers=auth_headers(other))
+  assert resp.json() == []
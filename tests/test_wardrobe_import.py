@@ -0,0 +1,87 @@
+import json
+
+from .test_api import auth_headers, register
+
+
+def _token(client):
+    return register(client).json()["token"]["access_token"]
+
+
+def _chunked(payload: str, size: int = 7):
+    data = payload.encode()
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def test_csv_import_streams_rows_and_reports_bad_ones(client):
+    token = _token(client)
+    upload = (
+        "name,category,subtype,color,color_family,season,notes\r\n"
+        'Oxford shirt,top,Shirt,white,White,,"crisp, pressed\nfor work"\r\n'
+        "Jeans,bottom,,indigo,Blue,All-season,\r\n"
+        "Mystery,hat,,red,,,\r\n"
+        "Boots,footwear,Heels,black,Black,Cold,\r\n"
+        "Too,many,columns,here,x,y,z,extra\r\n"
+        "Café loafers,footwear,Flats,brown,Brown,,\n"
+    )
+    resp = client.post(
+        "/wardrobe/items/import",
+        content=_chunked(upload),
+        headers={**auth_headers(token), "Content-Type": "text/csv; charset=utf-8"},
+    )
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["imported"] == 3
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [5, 6, 7]
+    assert result["errors"][0]["detail"].startswith("category:")
+    assert result["errors"][1]["detail"] == "Invalid subtype for this category."
+    assert result["errors"][2]["detail"] == "Expected 7 columns, got 8."
+
+    items = {item["name"]: item for item in client.get("/wardrobe/items", headers=auth_headers(token)).json()}
+    assert set(items) == {"Oxford shirt", "Jeans", "Café loafers"}
+    assert items["Oxford shirt"]["notes"] == "crisp, pressed\nfor work"
+    assert items["Oxford shirt"]["season"] == "All-season"
+    assert items["Jeans"]["subtype"] == "General"
+
+    found = client.get("/wardrobe/items", params={"q": "pressed"}, headers=auth_headers(token)).json()
+    assert [item["name"] for item in found] == ["Oxford shirt"]
+
+
+def test_jsonl_import(client):
+    token = _token(client)
+    lines = [
+        json.dumps({"name": "Rain jacket", "category": "outerwear", "subtype": "Jacket", "color": "yellow"}),
+        "",
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"name": "Sundress", "category": "one_piece", "subtype": "Dress", "color": "red", "season": "Warm"}),
+    ]
+    resp = client.post(
+        "/wardrobe/items/import",
+        content="\n".join(lines),
+        headers={**auth_headers(token), "Content-Type": "application/x-ndjson"},
+    )
+    assert resp.json() == {
+        "imported": 2,
+        "failed": 2,
+        "errors": [{"line": 3, "detail": "Invalid JSON."}, {"line": 4, "detail": "Expected a JSON object."}],
+    }
+    assert len(client.get("/wardrobe/items", headers=auth_headers(token)).json()) == 2
+
+
+def test_import_rejects_unknown_formats_and_headers(client):
+    token = _token(client)
+    wrong_type = client.post(
+        "/wardrobe/items/import", content="name\n", headers={**auth_headers(token), "Content-Type": "text/plain"}
+    )
+    assert wrong_type.status_code == 415
+
+    no_color = client.post(
+        "/wardrobe/items/import",
+        content="name,category\nTee,top\n",
+        headers={**auth_headers(token), "Content-Type": "text/csv"},
+    )
+    assert no_color.status_code == 400
+    assert no_color.json()["detail"] == "CSV header is missing: color."
+    assert client.get("/wardrobe/items", headers=auth_headers(token)).json() == []